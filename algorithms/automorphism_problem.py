@@ -1,51 +1,91 @@
-from supporting_components.basicpermutationgroup import FindNonTrivialOrbit, Stabilizer, Orbit
 from supporting_components.permv2 import permutation
-from supporting_components.graph import Graph, Vertex
-from algorithms.decide_gi import is_balanced_or_bijected
+from supporting_components.schreier_sims import StabilizerChain
+from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from algorithms.decide_gi import is_balanced_or_bijected, is_balanced_or_bijected_since
 from typing import List, Callable
 from math import inf
+from time import time
 
 
-def count_automorphisms(G: "Graph", color_refinement_method: Callable[[Graph], None]):
+def count_automorphisms(G: "Graph", color_refinement_method: Callable[[Graph], None],
+                        statistics: "SearchStatistics" = None, generators: List[List[int]] = None):
     """
     This method counts the amount of automorphisms of a Graph using the branching technique that uses the
-    permutations to calculate the amount of automorphisms.
+    permutations to calculate the amount of automorphisms. Every automorphism that the branching finds is added to a
+    stabilizer chain right away, which the branching uses to skip branches of which the automorphisms are already known,
+    and the order of the chain is the amount of automorphisms.
     :param G: The graph (disjoint union of two of the same graphs) of which the amount of automorphisms need
-    to be counted.
+    to be counted. A `Graph` is converted to a `CompactGraph` once, after which the branching is done on the compact
+    graph.
     :param color_refinement_method: The color refinement method that is used in the branching
+    :param statistics: Optional, the collector that the nodes of the search tree and the work of color refinement are
+    counted in
+    :param generators: Optional, the list that the automorphisms that generate the automorphism group are added to, as
+    mappings of the vertices of one of the two graphs
     :return: The amount of automorphisms of graph G
     """
-    # The branching method returns a list of different mappings of the graph
-    permutation_mappings = branching(G, color_refinement_method, trivial_node=True)
-    # These mappings are converted to permutation objects
-    permutations = mappings_to_permutations(int(len(G.vertices) / 2), permutation_mappings)
-    # The order computation calculates the amount of automorphisms there are in total, given these permutations
-    return order_computation(permutations)
-
-
-def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], trivial_node=False):
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+
+    # The branching method returns a list of different mappings of the graph, which generate the automorphism group
+    # in the chain
+    start = time()
+    chain = StabilizerChain(int(len(G) / 2))
+    permutation_mappings = branching(G, color_refinement_method, trivial_node=True, statistics=statistics, chain=chain)
+    if generators is not None:
+        generators.extend(list(mapping) for mapping in permutation_mappings)
+    if statistics is not None:
+        statistics.add_time('branching', time() - start)
+    return chain.order()
+
+
+def branching(G: 'CompactGraph', color_refinement_method: Callable[[Graph], None], trivial_node=False,
+              splitters: List[int] = None, statistics: "SearchStatistics" = None, chain: "StabilizerChain" = None):
     """
     It returns all possible mappings within graph G (which is a disjoint union of two of the same graphs).
-    :param G: The graph (disjoint union of two of the same graphs)
+    If a stabilizer chain is given, every mapping is added to it when it is found. The trivial nodes form one path, of
+    which the mapped vertices become the base of the chain. In a trivial node, a branch that maps the vertex to a vertex
+    in its basic orbit is skipped: an automorphism that is already known maps the vertex there, so the automorphisms of
+    that branch are already generated by it and the automorphisms of the trivial branch.
+    :param G: The compact graph (disjoint union of two of the same graphs)
     :param color_refinement_method: The color refinement method to use within branching.
     :param trivial_node: If set to True, the current node of the branch is a trivial node, meaning that the mappings
     that have been done are mappings from vertices to itself. This flag makes sure that branching takes place
     at least two times when a node is a trivial node.
+    :param splitters: Optional, the colors of the vertices that were mapped in the previous node. If given, the rest
+    of the coloring is already equitable and balanced, so only the changes are refined and checked.
+    :param statistics: Optional, the collector that the nodes of the search tree and the work of color refinement are
+    counted in
+    :param chain: Optional, the stabilizer chain of the automorphisms found so far
     :return: A list of valid mappings within G.
     """
-    # Do color refinement on the graph
-    color_refinement_method(G)
-
-    # Check if the current coloring of the graph is balanced or bijected
-    is_balanced, is_bijected = is_balanced_or_bijected(G)
+    if statistics is not None:
+        statistics.node()
+    if splitters is None:
+        # Do color refinement on the graph and check if the coloring of the graph is balanced or bijected
+        color_refinement_method(G, None, statistics)
+        is_balanced, is_bijected = is_balanced_or_bijected(G)
+    else:
+        # Only refine with the colors of the mapped vertices and check the vertices that changed color while doing so
+        checkpoint = G.checkpoint()
+        color_refinement_method(G, splitters, statistics)
+        is_balanced, is_bijected = is_balanced_or_bijected_since(G, checkpoint)
     if not is_balanced:
         # If the graph is unbalanced, the current mapping is not going to result in an bijection. Return to the
         # previous node in the branching to continue with another mapping by returning an empty mapping.
+        if statistics is not None:
+            statistics.dead_ends += 1
         return []
     if is_bijected:
         # If the graph is balanced and bijected, this is a particular mapping of the graph to itself. Return the
         # current mapping.
+        if statistics is not None:
+            statistics.leaves += 1
         mapping = mapping_of_bijection(G)
+        if chain is not None:
+            chain.add_generator(permutation(len(mapping), mapping=mapping))
         return [mapping]
 
     # If the current coloring is balanced, but not bijected, there is still some refining to do.
@@ -61,9 +101,9 @@ def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], triv
     v_graph1_colorC = []
     v_graph2_colorC = []
     for v in G.colors[C]:
-        if v.graph_label == 1:
+        if G.graph_label[v] == 1:
             v_graph1_colorC.append(v)
-        if v.graph_label == 2:
+        if G.graph_label[v] == 2:
             v_graph2_colorC.append(v)
 
     # First try to find a pair of vertices with the same label, which means there are the same vertex
@@ -71,7 +111,7 @@ def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], triv
     v1_mapped = None
     for v1 in v_graph1_colorC:
         for v2 in v_graph2_colorC:
-            if v1.coupling_label == v2.coupling_label:
+            if G.coupling_label[v1] == G.coupling_label[v2]:
                 # If such a pair is found the vertex to be colored in the first graph is set to d_mapping and the
                 # corresponding vertex of graph 2 is put in front of the list of vertices of graph 2 with color C
                 v1_mapped = v1
@@ -90,6 +130,11 @@ def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], triv
         v_graph2_colorC = [None] + v_graph2_colorC
         v1_mapped = v_graph1_colorC[0]
 
+    # The level of the mapped vertex in the base of the chain, if the trivial branch is searched first
+    level = None
+    if chain is not None and trivial_node and v_graph2_colorC[0] is not None:
+        level = chain.extend_base(G.coupling_label[v1_mapped])
+
     # Create an empty list to store the mappings in that are returned from lower nodes in the branching.
     current_node_mappings = []
 
@@ -102,13 +147,18 @@ def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], triv
         # this loop can be skipped
         if v2 is None:
             continue
+        if level is not None and i > 0 and chain.in_basic_orbit(level, G.coupling_label[v2]):
+            if statistics is not None:
+                statistics.pruned += 1
+            continue
 
         # With the current mapping (d_mapping from graph 1 to v2 of graph 2) the permutations following that mapping
         # are retrieved using the following method. To remember if the next branching node is still trivial, the
         # current node must be trivial and the mapping must be from a pair of vertices with the same label. This is
         # only true if i is zero, because if there is a pair, the vertex of graph 2 is in front of the loop.
         still_trivial = trivial_node and i == 0
-        next_node_mappings = permutations_of_mapping(G, C, v1_mapped, v2, color_refinement_method, still_trivial)
+        next_node_mappings = permutations_of_mapping(G, C, v1_mapped, v2, color_refinement_method, still_trivial,
+                                                     statistics, chain)
 
         # If there is at least one valid mapping returned from the node, the mappings are added to the mapping of the
         # current node. The next_node_mappings could be an empty list when a branch of the branching tree did not result
@@ -118,66 +168,71 @@ def branching(G: 'Graph', color_refinement_method: Callable[[Graph], None], triv
             # If the current node is not a trivial node, the mappings can be returned and further branching can be
             # skipped
             if not trivial_node:
+                if statistics is not None:
+                    # The other mappings of this node are not tried
+                    statistics.pruned += len(v_graph2_colorC) - i - 1
                 return current_node_mappings
 
     # At the end you will be back in the root (which is a trivial node) and the result can be returned
     return current_node_mappings
 
 
-def permutations_of_mapping(G: "Graph", C: int, v1: "Vertex", v2: "Vertex", color_refinement_method: Callable[[Graph], None], trivial_node):
+def permutations_of_mapping(G: "CompactGraph", C: int, v1: int, v2: int, color_refinement_method: Callable[[Graph], None], trivial_node,
+                            statistics: "SearchStatistics" = None, chain: "StabilizerChain" = None):
     """
     In this method, a certain mapping from a vertex in graph 1 (v1) to a vertex in graph 2 (v2) is taking place
-    After that, further branching takes place. In this method, a backup of the coloring before the mapping is
-    remembered for further branching.
+    After that, further branching takes place. In this method, a checkpoint of the coloring before the mapping is
+    remembered, so that the changes made in the further branching can be undone.
     :param G: The graph vertices are being mapped within
     :param C: The current colorclass that is being refined
     :param v1, v2: The vertex of graph 1 (v1) and graph (v2) that need to be mapped to each other
     :param color_refinement_method: The color refinement method that needs to be applied in branching
     :param trivial_node: If the node after this mapping is still a trivial node (meaning only vertices with the same
         label are mapped to each other)
+    :param statistics: Optional, the collector of the statistics of the search
+    :param chain: Optional, the stabilizer chain of the automorphisms found so far
     :return: The bijected mappings that follow if this particular mapping from v1 to v2 has been done
     """
-    # Make a backup of the current state of the graph coloring
-    max_colornum_backup, colors_backup = G.backup()
+    # Remember the current state of the graph coloring
+    checkpoint = G.checkpoint()
 
-    # Color the vertex in the first graph
-    G.max_colornum += 1
-    v1.colornum = G.max_colornum
-    G.colors[C].remove(v1)
-    G.colors.setdefault(G.max_colornum, []).append(v1)
+    # Color the vertex in the first graph with a new color
+    new_color = G.split(C, [v1])
 
-    # Color the vertex in the second graph
-    v2.colornum = G.max_colornum
-    G.colors[C].remove(v2)
-    G.colors[G.max_colornum].append(v2)
+    # Color the vertex in the second graph with the same color
+    G.split(C, [v2], new_color)
 
     # Apply further branching using this new mapping and retrieve the possible mappings from this new coloring
-    node_mappings = branching(G, color_refinement_method, trivial_node)
+    if statistics is not None:
+        statistics.depth += 1
+    node_mappings = branching(G, color_refinement_method, trivial_node, [new_color], statistics, chain)
+    if statistics is not None:
+        statistics.depth -= 1
 
-    # Apply backup coloring to graph G such that the mapping done in this method is undone.
-    G.revert(max_colornum_backup, colors_backup)
+    # Undo the changes to the coloring of graph G such that the mapping done in this method is undone.
+    G.undo(checkpoint)
 
     return node_mappings
 
 
-def mapping_of_bijection(G: "Graph"):
+def mapping_of_bijection(G: "CompactGraph"):
     """
     If a bijection is found. Make a mapping from each vertex in graph 1 to the vertex in graph 2
     :param G: Graph with a discrete coloring
     :return: Mapping of the coloring in G
     """
     # Create an empty mapping with -1 as a stubbed temporary value
-    mapping = [-1 for _ in range(int(len(G.vertices)/2))]
+    mapping = [-1 for _ in range(int(len(G)/2))]
     # For each color in G, there should be only 2 vertices in the colors dictionary. One for graph 1 and one for
     # graph 2. On the location of the label of the vertex of graph 1 put the label of the corresponding label of the
     # vertex of graph 2
     for color in G.colors:
         vi = G.colors[color][0]
         vj = G.colors[color][1]
-        if vi.graph_label == 1:
-            mapping[vi.coupling_label] = vj.coupling_label
+        if G.graph_label[vi] == 1:
+            mapping[G.coupling_label[vi]] = G.coupling_label[vj]
         else:
-            mapping[vj.coupling_label] = vi.coupling_label
+            mapping[G.coupling_label[vj]] = G.coupling_label[vi]
 
     return mapping
 
@@ -197,34 +252,22 @@ def mappings_to_permutations(n, mappings):
     return permutation_objects
 
 
-def order_computation(H: 'List[permutation]'):
+def order_computation(H: 'List[permutation]', n: int = None):
     """
-    Recursively computes the order of a list of permutations.
-    Based on slide 21 of lecture 4 and notes.
+    Computes the order of the group generated by a list of permutations.
+    The permutations are added one by one to a stabilizer chain (Schreier-Sims), of which the order is the product of
+    the lengths of the basic orbits. Permutations that are already in the group are filtered out by sifting.
     :param H: Permutation group
+    :param n: Optional, the amount of elements the permutations act on, needed if H is empty
     :return: int with the order of the list of permutations
     """
-    # If H has only one element and it is the unity permutation. The length of the orbit is 1.
-    # Because whatever 'a' you choose, it can only map to itself.
-    if len(H) == 1 and H[0].istrivial():
-        return 1
-
-    # And because the method Stabilizer does not return the unity permutation as part of the stabilizer,
-    # if further down in the recursion the length of H is zero, this actually means that only the unity
-    # permutation is left, because that one must always be in the stabilizer. So in this case, the length
-    # of the orbit is also 1.
-    if len(H) == 0:
-        return 1
-
-    # In any other case, the theorem holds that the order of H is the order of the stabilizer multiplied by the
-    # length of the orbit ( |H| = |H0| * |0_H| ). For this theorem the theory of slide 21 of the lecture slides
-    # of lecture L4 are used.
-
-    # Choose a with nontrivial orbit
-    a = FindNonTrivialOrbit(H)
-    # Determine orbit of a (list of vertices to which 'a' can be mapped)
-    O_H = Orbit(H, a)
-    # Determine stabilizer of a (list of permutations that leave 'a' untouched)
-    H_0 = Stabilizer(H, a)
-
-    return order_computation(H_0) * len(O_H)
\ No newline at end of file
+    if n is None:
+        if len(H) == 0:
+            # Only the unity permutation is in the group
+            return 1
+        n = H[0].n
+
+    chain = StabilizerChain(n)
+    for P in H:
+        chain.add_generator(P)
+    return chain.order()
@@ -1,92 +1,393 @@
 from supporting_components.graph import Graph
-from algorithms.decide_gi import is_balanced_or_bijected
-from typing import Callable
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from algorithms.decide_gi import is_balanced_or_bijected, is_balanced_or_bijected_since
+from typing import Callable, List, Tuple
+from multiprocessing import Pool, current_process
 from math import inf
+from time import time
 
 
-def count_isomorphisms(G: 'Graph', count_flag: 'Bool', color_refinement_method: Callable[[Graph], None]):
+def count_isomorphisms(G: 'Graph', count_flag: 'Bool', color_refinement_method: Callable[[Graph], None],
+                       workers: int = 1, depth: int = 1, statistics: 'SearchStatistics' = None):
     """
     It counts the number of isomorphisms of the graph (disjoint union of two graphs) if 'count_flag' is True.
     It checks if the graph (disjoint union of two graphs) has at least one isomorphism if 'count_flag' is False.
-    :param G: The graph (disjoint union of two graphs) to check for isomorphisms
+    While counting, automorphisms of the second graph are found by comparing isomorphisms. Branches that are mapped to
+    an already counted branch by such an automorphism have the same amount of isomorphisms and are not searched again.
+    :param G: The graph (disjoint union of two graphs) to check for isomorphisms. A `Graph` is converted to a
+    `CompactGraph` once, after which the branching is done on the compact graph.
     :param count_flag: Whether or not the amount of isomorphisms should be returned or whether or not the graph has an
     isomorphism
+    :param color_refinement_method: The color refinement method that is used in the branching
+    :param workers: Optional, the amount of processes that search the subtrees of the first branching levels. The
+    subtrees are searched in this process if it is 1, or if this process is a worker process itself.
+    :param depth: Optional, the amount of branching levels that is split into subtrees if more than one worker is used
+    :param statistics: Optional, the collector that the nodes of the search tree and the work of color refinement are
+    counted in
     :return: The number of isomorphisms if 'count_flag' is True or whether or not the graph has at least one
     isomorphism if 'count_flag' is False
     """
-    # Do color refinement on the graph
-    color_refinement_method(G)
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+
+    start = time()
+    if workers > 1 and not current_process().daemon:
+        num_isomorphisms = __parallel_search(G, count_flag, color_refinement_method, workers, depth, statistics)
+    else:
+        num_isomorphisms, _ = __search(G, count_flag, color_refinement_method, None, [], [], statistics)
+    if statistics is not None:
+        statistics.add_time('search', time() - start)
+    if not count_flag:
+        return num_isomorphisms > 0
+    return num_isomorphisms
+
+
+def __search(G: 'CompactGraph', count_flag: 'Bool', color_refinement_method: Callable[[Graph], None],
+             splitters: List[int], automorphisms: List[List[int]], fixed: List[int], statistics: 'SearchStatistics'):
+    """
+    Refines the coloring of the graph and branches on it if it is balanced, but not bijected.
+    :param G: The compact graph (disjoint union of two graphs) to check for isomorphisms
+    :param count_flag: Whether or not all isomorphisms should be counted or the search can stop at the first one
+    :param color_refinement_method: The color refinement method that is used in the branching
+    :param splitters: The colors of the vertices that were individualized in the previous node. If given, the rest of
+    the coloring is already equitable and balanced, so only the changes are refined and checked.
+    :param automorphisms: The automorphisms of the second graph that have been found so far
+    :param fixed: The vertices of the second graph that have been fixed in the previous nodes
+    :param statistics: The collector of the statistics of the search, or None
+    :return: The number of isomorphisms (at most 1 if 'count_flag' is False) and one of these isomorphisms, which maps
+    every vertex to the vertex with the same color in the other graph (None if there is no isomorphism)
+    """
+    if statistics is not None:
+        statistics.node()
+    if splitters is None:
+        # Do color refinement on the graph
+        color_refinement_method(G, None, statistics)
+        is_balanced, is_bijected = is_balanced_or_bijected(G)
+    else:
+        # Only refine with the individualized colors and check the vertices that changed color while doing so
+        checkpoint = G.checkpoint()
+        color_refinement_method(G, splitters, statistics)
+        is_balanced, is_bijected = is_balanced_or_bijected_since(G, checkpoint)
 
-    is_balanced, is_bijected = is_balanced_or_bijected(G)
     if not is_balanced:
         # If the graph is unbalanced, the graph has no isomorphism
-        if not count_flag:
-            return False
-        return 0
+        if statistics is not None:
+            statistics.dead_ends += 1
+        return 0, None
     if is_bijected:
         # If the graph is balanced and bijected, the graph has exactly one isomorphism
-        if not count_flag:
-            return True
-        return 1
-
-    # Choose the color class C with at least 4 vertices of that color in the graph
-    # Choose color class with smallest amount of vertices
-    C_len = inf
-    for key in G.colors:
-        if len(G.colors[key]) >= 4 and len(G.colors[key]) < C_len:
-            C = key
-            C_len = len(G.colors[key])
+        if statistics is not None:
+            statistics.leaves += 1
+        return 1, __isomorphism_of_bijection(G)
 
-    # Choose the first occurring vertex with color C in the list of vertices of the first graph
-    for v in G.colors[C]:
-        if v.graph_label == 1:
-            x = v
-            break
-
-    # Change the color of this vertex to a new color and append it to the list of fixed vertices for the first graph
-    x.colornum = G.max_colornum + 1
-    # Update colors of graph
-    G.colors[C].remove(x)
-    G.colors.setdefault(G.max_colornum + 1, list()).append(x)
+    C, x = __choose_individualization(G)
+    # Change the color of this vertex to a new color
+    x_color = G.split(C, [x])
     # Create branches for all the possible fixed pairs of vertices for the chosen color
-    return __branching(G, C, count_flag, color_refinement_method)
+    return __branching(G, C, x_color, count_flag, color_refinement_method, automorphisms, fixed, statistics)
 
 
-def __branching(G: 'Graph', C: 'Int', count_flag: 'Bool', color_refinement_method: Callable[[Graph], None]):
+def __branching(G: 'CompactGraph', C: 'Int', x_color: 'Int', count_flag: 'Bool',
+                color_refinement_method: Callable[[Graph], None], automorphisms: List[List[int]], fixed: List[int],
+                statistics: 'SearchStatistics'):
     """
     Creates branches of the graph (disjoint union of two graphs) and counts the amount of isomorphisms for those graphs.
     In one graph, one vertex of the color group is fixed. For each of the vertices in the other graph, a branch is
     created fixing that vertex.
+    Only the first branch with an isomorphism (y1) is counted completely. If another branch (y) has an isomorphism,
+    combining it with the isomorphism of y1 gives an automorphism that maps y1 to y and fixes all vertices that were
+    fixed before, so the branch of y has as many isomorphisms as the branch of y1. Therefore it is enough to find one
+    isomorphism in the other branches, and branches of vertices in the orbit of y1 under the automorphisms found so far
+    do not have to be searched at all. In the same way, branches of vertices in the orbit of a branch without
+    isomorphisms do not have any isomorphisms either. Only the automorphisms that fix all fixed vertices are used.
     :param G: The graph (disjoint union of two graphs) to branch
-    :param colors: The colors present in the graph (disjoint union of two graphs) and its corresponding list of vertices
     :param C: The chosen color group to create branches for
+    :param x_color: The new color of the fixed vertex of the first graph
     :param count_flag: Whether or not the amount of isomorphisms should be returned or whether or not the graph has an
     isomorphism
-    :return: The number of isomorphisms if 'count_flag' is True or whether or not the graph has at least one
-    isomorphism if 'count_flag' is False
+    :param color_refinement_method: The color refinement method that is used in the branching
+    :param automorphisms: The automorphisms of the second graph that have been found so far. New automorphisms are
+    added to this list.
+    :param fixed: The vertices of the second graph that have been fixed in the previous nodes
+    :param statistics: The collector of the statistics of the search, or None
+    :return: The number of isomorphisms (at most 1 if 'count_flag' is False) and one of these isomorphisms
     """
     # Create the list of vertices in the other graph with color C
     g1 = []
     for v in G.colors[C]:
-        if v.graph_label == 2:
+        if G.graph_label[v] == 2:
             g1.append(v)
 
     # For each of the vertices in the list of vertices with color C, fix the vertex and change its color to the new
     # color and determine the amount of isomorphisms for the resulting graph
     num_isomorphisms = 0
+    first_isomorphism = None
+    first_num_isomorphisms = 0
+    orbit = set()
+    first_y = None
+    failed = []
+    failed_orbits = set()
+    # The automorphisms that fix all fixed vertices, of the first 'checked' automorphisms that were found
+    stabilizer = []
+    checked = 0
     for y in g1:
-        # Make a copy of everything before creating a new branch
-        max_colornum_backup, colors_backup = G.backup()
-        G.max_colornum += 1
-        y.colornum = G.max_colornum
-        # Update colors of graph
-        G.colors[C].remove(y)
-        G.colors.setdefault(G.max_colornum, list()).append(y)
-        num_isomorphisms += count_isomorphisms(G, count_flag, color_refinement_method)
-        if not count_flag and num_isomorphisms > 0:
-            return True
-        G.revert(max_colornum_backup, colors_backup)
-    if not count_flag:
-        return num_isomorphisms > 0
-    else:
+        if y in orbit:
+            # An automorphism maps y1 to y, so this branch has as many isomorphisms as the branch of y1
+            num_isomorphisms += first_num_isomorphisms
+            if statistics is not None:
+                statistics.pruned += 1
+            continue
+        if y in failed_orbits:
+            # An automorphism maps a branch without isomorphisms to this branch
+            if statistics is not None:
+                statistics.pruned += 1
+            continue
+
+        # Remember the state of the coloring before creating a new branch
+        checkpoint = G.checkpoint()
+        # Give the vertex the same color as the fixed vertex of the first graph
+        G.split(C, [y], x_color)
+        fixed.append(y)
+        if statistics is not None:
+            statistics.depth += 1
+        if first_isomorphism is None:
+            branch_isomorphisms, isomorphism = __search(G, count_flag, color_refinement_method, [x_color],
+                                                        automorphisms, fixed, statistics)
+        else:
+            # Only one isomorphism is needed to know the amount of isomorphisms of this branch
+            branch_isomorphisms, isomorphism = __search(G, False, color_refinement_method, [x_color], automorphisms,
+                                                        fixed, statistics)
+        if statistics is not None:
+            statistics.depth -= 1
+        fixed.pop()
+        # Undo the changes to the coloring made in this branch
+        G.undo(checkpoint)
+
+        if isomorphism is not None and not count_flag:
+            return 1, isomorphism
+
+        stabilizer_size = len(stabilizer)
+        if isomorphism is None:
+            failed.append(y)
+        elif first_isomorphism is None:
+            first_isomorphism = isomorphism
+            first_num_isomorphisms = branch_isomorphisms
+            first_y = y
+            num_isomorphisms += branch_isomorphisms
+        else:
+            automorphisms.append(__automorphism(G, first_isomorphism, isomorphism))
+            num_isomorphisms += first_num_isomorphisms
+
+        # Use the automorphisms that were found in the last branch if they fix all fixed vertices
+        for automorphism in automorphisms[checked:]:
+            if all(automorphism[v] == v for v in fixed):
+                stabilizer.append(automorphism)
+        checked = len(automorphisms)
+
+        if len(stabilizer) > stabilizer_size:
+            # The orbits can have grown, so they are computed again
+            failed_orbits = set()
+            for v in failed:
+                failed_orbits |= __orbit(v, stabilizer)
+        elif isomorphism is None:
+            failed_orbits |= __orbit(y, stabilizer)
+        if first_isomorphism is not None and (len(stabilizer) > stabilizer_size or not orbit):
+            orbit = __orbit(first_y, stabilizer)
+
+    return num_isomorphisms, first_isomorphism
+
+
+def __choose_individualization(G: 'CompactGraph'):
+    """
+    Chooses the color class to branch on, the color class with the smallest amount of vertices of at least 4 vertices,
+    and the first occurring vertex with that color in the first graph.
+    :param G: The compact graph (disjoint union of two graphs) with a balanced, but not bijected coloring
+    :return: The color class and the vertex of the first graph
+    """
+    C_len = inf
+    for key in G.colors:
+        if len(G.colors[key]) >= 4 and len(G.colors[key]) < C_len:
+            C = key
+            C_len = len(G.colors[key])
+
+    for v in G.colors[C]:
+        if G.graph_label[v] == 1:
+            return C, v
+
+
+def __parallel_search(G: 'CompactGraph', count_flag: 'Bool', color_refinement_method: Callable[[Graph], None],
+                      workers: int, depth: int, statistics: 'SearchStatistics'):
+    """
+    Refines the coloring of the graph and splits the first 'depth' branching levels into subtrees, which are searched
+    by a pool of worker processes. Every worker gets the refined graph once and creates its own coloring of a subtree
+    from the pairs of vertices that are fixed in it. Because the subtrees are independent, the automorphisms of the
+    subtrees are not used to skip other subtrees, and every subtree is counted completely.
+    :param G: The compact graph (disjoint union of two graphs) to check for isomorphisms
+    :param count_flag: Whether or not all isomorphisms should be counted or the search can stop at the first one
+    :param color_refinement_method: The color refinement method that is used in the branching
+    :param workers: The amount of worker processes
+    :param depth: The amount of branching levels that is split into subtrees
+    :param statistics: The collector of the statistics of the search, or None. The statistics of the subtrees are
+    collected in the worker processes and added to it.
+    :return: The number of isomorphisms (at least 1 if there is an isomorphism if 'count_flag' is False)
+    """
+    if statistics is not None:
+        statistics.node()
+    color_refinement_method(G, None, statistics)
+    is_balanced, is_bijected = is_balanced_or_bijected(G)
+    if not is_balanced:
+        return 0
+    if is_bijected:
+        return 1
+
+    subtrees = []
+    num_isomorphisms = __subtrees(G, color_refinement_method, depth, [], subtrees, statistics)
+    if (num_isomorphisms > 0 and not count_flag) or not subtrees:
         return num_isomorphisms
+
+    with Pool(workers, initializer=__init_subtree_worker, initargs=(G, color_refinement_method)) as pool:
+        tasks = [(subtree, count_flag, statistics is not None) for subtree in subtrees]
+        for branch_isomorphisms, branch_statistics in pool.imap_unordered(__subtree_search, tasks):
+            num_isomorphisms += branch_isomorphisms
+            if statistics is not None:
+                statistics.merge(branch_statistics)
+            if num_isomorphisms > 0 and not count_flag:
+                # Leaving the pool terminates the workers that are still searching other subtrees
+                break
+    return num_isomorphisms
+
+
+def __subtrees(G: 'CompactGraph', color_refinement_method: Callable[[Graph], None], depth: int,
+               fixed_pairs: List[Tuple[int, int]], subtrees: List[List[Tuple[int, int]]],
+               statistics: 'SearchStatistics'):
+    """
+    Creates the branches of the next 'depth' branching levels of the graph. The branches of the last level are added
+    to 'subtrees' as the list of pairs of vertices that are fixed in them, in the same order as they are fixed.
+    Branches of earlier levels that turn out to be unbalanced or bijected are not added.
+    :param G: The compact graph with a balanced, but not bijected coloring, which is restored afterwards
+    :param color_refinement_method: The color refinement method that is used in the branching
+    :param depth: The amount of branching levels that is left
+    :param fixed_pairs: The pairs of vertices that have been fixed in the previous levels
+    :param subtrees: The list the subtrees are added to
+    :param statistics: The collector of the statistics of the search, or None
+    :return: The number of isomorphisms of the bijected branches
+    """
+    num_isomorphisms = 0
+    checkpoint = G.checkpoint()
+    C, x = __choose_individualization(G)
+    g1 = [v for v in G.colors[C] if G.graph_label[v] == 2]
+    x_color = G.split(C, [x])
+
+    for y in g1:
+        branch = fixed_pairs + [(x, y)]
+        if depth == 1:
+            subtrees.append(branch)
+            continue
+
+        if statistics is not None:
+            statistics.depth += 1
+            statistics.node()
+        branch_checkpoint = G.checkpoint()
+        G.split(C, [y], x_color)
+        refinement_checkpoint = G.checkpoint()
+        color_refinement_method(G, [x_color], statistics)
+        is_balanced, is_bijected = is_balanced_or_bijected_since(G, refinement_checkpoint)
+        if is_bijected:
+            num_isomorphisms += 1
+        elif is_balanced:
+            num_isomorphisms += __subtrees(G, color_refinement_method, depth - 1, branch, subtrees, statistics)
+        G.undo(branch_checkpoint)
+        if statistics is not None:
+            statistics.depth -= 1
+
+    G.undo(checkpoint)
+    return num_isomorphisms
+
+
+# The refined graph and the color refinement method of the worker process that searches subtrees
+__subtree_graph = None
+__subtree_refinement_method = None
+
+
+def __init_subtree_worker(G: 'CompactGraph', color_refinement_method: Callable[[Graph], None]):
+    """
+    Stores the refined graph and the color refinement method in the worker process.
+    """
+    global __subtree_graph, __subtree_refinement_method
+    __subtree_graph = G
+    __subtree_refinement_method = color_refinement_method
+
+
+def __subtree_search(task):
+    """
+    Fixes the pairs of vertices of a subtree in the refined graph of the worker process, in the same way as in the
+    branching, and counts the isomorphisms of the subtree.
+    :param task: The pairs of vertices that are fixed in the subtree, the count flag and whether statistics are
+    collected
+    :return: The number of isomorphisms of the subtree (at most 1 if the count flag is False) and the statistics of
+    the search of the subtree, or None
+    """
+    fixed_pairs, count_flag, collect_statistics = task
+    statistics = SearchStatistics(len(fixed_pairs)) if collect_statistics else None
+    G = __subtree_graph
+    checkpoint = G.checkpoint()
+    for i, (x, y) in enumerate(fixed_pairs):
+        C = G.colornum[x]
+        x_color = G.split(C, [x])
+        G.split(C, [y], x_color)
+        if i < len(fixed_pairs) - 1:
+            # The earlier levels were balanced and not bijected when the subtrees were created
+            __subtree_refinement_method(G, [x_color])
+
+    num_isomorphisms, _ = __search(G, count_flag, __subtree_refinement_method, [x_color], [],
+                                   [y for _, y in fixed_pairs], statistics)
+    G.undo(checkpoint)
+    return num_isomorphisms, statistics
+
+
+def __isomorphism_of_bijection(G: 'CompactGraph'):
+    """
+    If a bijection is found, make the isomorphism that maps each vertex to the other vertex with the same color.
+    :param G: Graph with a discrete coloring
+    :return: The list with for every vertex the vertex it is mapped to
+    """
+    isomorphism = [None] * len(G)
+    for v, w in G.colors.values():
+        isomorphism[v] = w
+        isomorphism[w] = v
+    return isomorphism
+
+
+def __automorphism(G: 'CompactGraph', isomorphism: List[int], other_isomorphism: List[int]):
+    """
+    Combines two isomorphisms from the first to the second graph into an automorphism of the second graph, which maps
+    the image of a vertex under 'isomorphism' to the image of the vertex under 'other_isomorphism'.
+    :param G: The compact graph (disjoint union of two graphs)
+    :param isomorphism: The isomorphism that is inverted
+    :param other_isomorphism: The other isomorphism
+    :return: The list with for every vertex of the second graph the vertex it is mapped to
+    """
+    automorphism = [None] * len(G)
+    for v in G.vertices:
+        if G.graph_label[v] == 2:
+            automorphism[v] = other_isomorphism[isomorphism[v]]
+    return automorphism
+
+
+def __orbit(v: int, automorphisms: List[List[int]]):
+    """
+    :param v: A vertex of the second graph
+    :param automorphisms: Automorphisms of the second graph
+    :return: The set of vertices that v is mapped to by the group generated by the automorphisms
+    """
+    orbit = {v}
+    queue = [v]
+    while queue:
+        w = queue.pop()
+        for automorphism in automorphisms:
+            image = automorphism[w]
+            if image not in orbit:
+                orbit.add(image)
+                queue.append(image)
+    return orbit
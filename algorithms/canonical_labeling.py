@@ -0,0 +1,210 @@
+from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from supporting_components.union_find import UnionFind
+from algorithms.color_refinement import fast_color_refinement
+from typing import List, Optional, Tuple
+from math import inf
+from time import time
+
+"""
+Canonical labeling with individualization-refinement: every graph gets a labeling of its vertices such that isomorphic
+graphs have the same graph after relabeling. This relabeled graph is the certificate of the graph, so two graphs are
+isomorphic if and only if their certificates are equal, and graphs can be classified with a dictionary.
+Every step of the search does not depend on the numbering of the vertices: the initial colors are ranks of the vertex
+properties, fast color refinement splits color groups in an order that only depends on the colors, and the color
+group to branch on is chosen by its size and color. Therefore the leaves of the search tree (discrete colorings) of
+isomorphic graphs are the same up to the isomorphism, and the largest leaf is canonical.
+The leaves are ordered by the trace of their path, the invariants of the colorings of the nodes of the path, and then
+by their certificate. A node of which the trace is smaller than the trace of the best leaf up to the same depth only has
+smaller leaves, so its branch is not searched.
+"""
+
+
+def canonical_labeling(G: 'Graph', statistics: 'SearchStatistics' = None,
+                       max_nodes: int = None) -> Optional[Tuple[List[int], Tuple]]:
+    """
+    Computes the canonical labeling of a graph and its certificate.
+    Vertices are only mapped to vertices with the same degree_fixed (the degree if it is not set), n_twins and
+    pendant_trees, so these properties of preprocessed graphs are part of the certificate.
+    Automorphisms are found when two leaves have the same certificate. They are used to skip branches that are mapped
+    to a branch that has been searched already, and to go back to the node where the paths to the two leaves split.
+    :param G: The graph (or compact graph), of which the coloring is not changed
+    :param statistics: Optional, the collector that the nodes of the search tree and the work of color refinement are
+    counted in
+    :param max_nodes: Optional, the maximal amount of nodes of the search tree, the search is stopped when there are
+    more nodes
+    :return: The canonical labeling, the canonical label of every vertex (its index in the vertices of the graph), and
+    the certificate, which is hashable. Or None if the search was stopped.
+    """
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+    else:
+        G = G.copy()
+
+    start = time()
+    keys = [(G.degree_fixed[v] if G.degree_fixed[v] is not None else G.degree(v), G.n_twins[v], G.pendant_trees[v])
+            for v in G.vertices]
+    ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+    G.set_coloring(ranks[key] for key in keys)
+
+    # The first leaf and the largest leaf, as (trace, certificate, labeling, path), and the amount of nodes left
+    search = {'first': None, 'best': None, 'nodes': max_nodes if max_nodes is not None else inf}
+    automorphisms = []
+    __search(G, keys, G.edges, None, [], [], search, automorphisms, statistics)
+
+    if statistics is not None:
+        statistics.add_time('canonical labeling', time() - start)
+    if search['nodes'] < 0:
+        return None
+    _, certificate, labeling, _ = search['best']
+    return labeling, certificate
+
+
+def certificate(G: 'Graph', statistics: 'SearchStatistics' = None, max_nodes: int = None) -> Optional[Tuple]:
+    """
+    :param G: The graph (or compact graph)
+    :param statistics: Optional, the collector of the statistics of the search
+    :param max_nodes: Optional, the maximal amount of nodes of the search tree
+    :return: The certificate of the graph, which is equal for two graphs if and only if they are isomorphic. Or None if
+    the search tree has more than max_nodes nodes.
+    """
+    result = canonical_labeling(G, statistics, max_nodes)
+    return result[1] if result is not None else None
+
+
+def __search(G: 'CompactGraph', keys: List[Tuple], edges: List[Tuple[int, int]], splitters: List[int],
+             path: List[int], trace: List[Tuple], search: dict, automorphisms: List[List[int]],
+             statistics: 'SearchStatistics'):
+    """
+    Refines the coloring and branches on it until it is discrete.
+    :param G: The compact graph with the coloring of this node
+    :param keys: The properties of every vertex that are part of the certificate
+    :param edges: The edges of the graph
+    :param splitters: The color of the vertex that was individualized in the previous node, or None in the root
+    :param path: The vertices that were individualized to get to this node
+    :param trace: The invariants of the colorings of the nodes of the path before this node
+    :param search: The first leaf, the best leaf so far and the amount of nodes left, which are updated
+    :param automorphisms: The automorphisms that were found so far, new automorphisms are added
+    :param statistics: The collector of the statistics of the search, or None
+    :return: The depth of the node the search should go back to, inf if it should continue normally and -1 if the
+    search should be stopped
+    """
+    search['nodes'] -= 1
+    if search['nodes'] < 0:
+        return -1
+    if statistics is not None:
+        statistics.node()
+    fast_color_refinement(G, splitters, statistics)
+
+    trace.append(__invariant(G, splitters[0] if splitters is not None else 0))
+    if search['best'] is not None and trace < search['best'][0][:len(trace)]:
+        # All leaves of this node are smaller than the best leaf
+        trace.pop()
+        if statistics is not None:
+            statistics.pruned += 1
+        return inf
+
+    if len(G.colors) == len(G):
+        if statistics is not None:
+            statistics.leaves += 1
+        back = __leaf(G, keys, edges, path, trace, search, automorphisms)
+        trace.pop()
+        return back
+
+    # The smallest color group with more than one vertex, the one with the lowest color if there are more
+    C = min((len(vertices), color) for color, vertices in G.colors.items() if len(vertices) > 1)[1]
+
+    # The orbits in color group C of the first 'checked' automorphisms that fix all vertices of the path. These
+    # automorphisms keep the coloring of this node, so they map C to itself.
+    cell = sorted(G.colors[C])
+    index = {v: i for i, v in enumerate(cell)}
+    orbits = UnionFind(len(cell))
+    checked = 0
+    searched = []
+    back = inf
+    for y in cell:
+        for automorphism in automorphisms[checked:]:
+            if all(automorphism[v] == v for v in path):
+                for v in cell:
+                    orbits.union(index[v], index[automorphism[v]])
+        checked = len(automorphisms)
+        if any(orbits.find(index[y]) == orbits.find(index[x]) for x in searched):
+            # An automorphism maps a branch that was searched already to this branch
+            if statistics is not None:
+                statistics.pruned += 1
+            continue
+
+        checkpoint = G.checkpoint()
+        y_color = G.split(C, [y])
+        path.append(y)
+        if statistics is not None:
+            statistics.depth += 1
+        back = __search(G, keys, edges, [y_color], path, trace, search, automorphisms, statistics)
+        if statistics is not None:
+            statistics.depth -= 1
+        path.pop()
+        G.undo(checkpoint)
+        searched.append(y)
+
+        if back < len(path):
+            break
+
+    trace.pop()
+    return back if back < len(path) else inf
+
+
+def __invariant(G: 'CompactGraph', first_color: int) -> Tuple:
+    """
+    :param first_color: The first color that was created in this node
+    :return: For every color group that was created in this node, its color, its size and the amount of neighbours in
+    every color of its vertices, which is the same for all vertices of the group because the coloring is stable. The
+    color groups that were created before only changed by splits of their neighbours, so together with the invariants
+    of the nodes of the path this describes the whole coloring.
+    """
+    invariant = []
+    for color in range(first_color, G.max_colornum + 1):
+        vertices = G.colors.get(color)
+        if vertices:
+            neighbour_colors = {}
+            for w in G.neighbours(vertices[0]):
+                neighbour_colors[G.colornum[w]] = neighbour_colors.get(G.colornum[w], 0) + 1
+            invariant.append((color, len(vertices), tuple(sorted(neighbour_colors.items()))))
+    return tuple(invariant)
+
+
+def __leaf(G: 'CompactGraph', keys: List[Tuple], edges: List[Tuple[int, int]], path: List[int], trace: List[Tuple],
+           search: dict, automorphisms: List[List[int]]):
+    """
+    Computes the labeling and certificate of a discrete coloring and compares it with the first and the best leaf.
+    If it has the same certificate as one of them, the automorphism that maps that leaf to this leaf fixes the
+    vertices of the paths to both leaves until they split, and maps the rest of the branch of that leaf to the branch
+    of this leaf. So the rest of the branch of this leaf does not have to be searched.
+    :return: The depth of the node the search should go back to, inf if it should continue normally
+    """
+    vertices = sorted(G.vertices, key=lambda v: G.colornum[v])
+    labeling = [0] * len(G)
+    for label, v in enumerate(vertices):
+        labeling[v] = label
+    leaf_certificate = (tuple(keys[v] for v in vertices),
+                        tuple(sorted((min(labeling[u], labeling[w]), max(labeling[u], labeling[w])) for u, w in edges)))
+    leaf = (list(trace), leaf_certificate, labeling, list(path))
+
+    if search['first'] is None:
+        search['first'] = search['best'] = leaf
+        return inf
+
+    for other in (search['first'], search['best']):
+        other_trace, other_certificate, other_labeling, other_path = other
+        if other_certificate == leaf_certificate:
+            # The automorphism maps every vertex to the vertex with the same label in this leaf
+            automorphisms.append([vertices[other_labeling[v]] for v in G.vertices])
+            # The depth at which the paths split
+            depth = 0
+            while depth < min(len(path), len(other_path)) and other_path[depth] == path[depth]:
+                depth += 1
+            return depth
+
+    if leaf[:2] > search['best'][:2]:
+        search['best'] = leaf
+    return inf
@@ -1,18 +1,45 @@
+from supporting_components.compact_graph import CompactGraph
+
+
 def degree_color_initialization(G: "Graph"):
     """
     Initializes the colornum properties of all vertices in graph G based on the degree of the vertices.
+    If twins or trees were removed from the graph (see remove_twins and remove_pendant_trees), vertices with the same
+    degree but another amount of twins or other trees get different colors.
     Initializes the max_colornum property of the graph as well.
     Initializes colors, the map with vertices grouped by color, as well.
-    :param G: The graph to be initialized
+    :param G: The graph (or compact graph) to be initialized
     :return The graph with the initial coloring
     """
+    if isinstance(G, CompactGraph):
+        G.set_coloring(__colornums(G.degree_fixed, G.n_twins, G.pendant_trees))
+        return G
+
+    vertices = G.vertices
+    colornums = __colornums([v.degree_fixed for v in vertices], [v.n_twins for v in vertices],
+                            [v.pendant_trees for v in vertices])
     max_colornum = 0
     G.colors = {}
-    for v in G.vertices:
-        v.colornum = v.degree_fixed
+    for v, colornum in zip(vertices, colornums):
+        v.colornum = colornum
         G.colors.setdefault(v.colornum, list()).append(v)
         if v.colornum > max_colornum:
             max_colornum = v.colornum
     G.max_colornum = max_colornum
 
-    return G
\ No newline at end of file
+    return G
+
+
+def __colornums(degrees: "List[int]", n_twins: "List[int]", pendant_trees: "List[Tuple]"):
+    """
+    :param degrees: The degree_fixed of every vertex
+    :param n_twins: The amount of twins of every vertex
+    :param pendant_trees: The removed trees of every vertex
+    :return: The degree of every vertex. If any twins or trees were removed, the rank of the degree, twins and trees of
+    every vertex instead, so that the colors stay small numbers.
+    """
+    if all(n == 1 for n in n_twins) and not any(pendant_trees):
+        return list(degrees)
+    keys = list(zip(degrees, n_twins, pendant_trees))
+    ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+    return [ranks[key] for key in keys]
@@ -1,158 +1,273 @@
-from supporting_components.graph import Graph, Vertex
+from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from collections import deque
 from typing import List
+from time import time
 
 
-def color_refinement(G: "Graph"):
+def color_refinement(G: "Graph", splitters: List[int] = None, statistics: "SearchStatistics" = None):
     """
     Given graph G, this method changes the colornum property of the vertices in the graph, so that all vertices with
     the same colornum could be mapped to each other while structurally remaining the same graph
-    :param G: Graph to be colored
+    :param G: Graph (or compact graph) to be colored
+    :param splitters: Not used, the whole coloring is refined
+    :param statistics: Optional, the collector that the rounds and the split color groups are counted in
     :return: Finished colored graph
     """
+    if not isinstance(G, CompactGraph):
+        # Refine a compact copy of the graph and copy the resulting coloring back
+        G_compact = CompactGraph.from_graph(G)
+        color_refinement(G_compact, splitters, statistics)
+        G_compact.write_coloring(G)
+        return G
 
+    start = time()
     has_changed = True
     while has_changed:
         has_changed = False
+        if statistics is not None:
+            statistics.refinement_rounds += 1
         for colornum, vertices in G.colors.copy().items():
             if len(vertices) == 1:
                 continue
 
-            G.max_colornum += 1
-            has_changed = __colorgroup_refinement(G, colornum, vertices, G.max_colornum) or has_changed
+            if __colorgroup_refinement(G, colornum, vertices):
+                has_changed = True
+                if statistics is not None:
+                    statistics.cells_split += 1
+
+    if statistics is not None:
+        statistics.refinements += 1
+        statistics.add_time('refinement', time() - start)
     return G
 
 
-def fast_color_refinement(G: "Graph"):
+def fast_color_refinement(G: "Graph", splitters: List[int] = None, statistics: "SearchStatistics" = None):
     """
-    Performs fast color refinement on the graph.
-    It creates a queue of color groups to check for the initially colored graph.
-    For each color group in the queue, it splits the other color groups based on whether or not the vertices are
-    neighbours of one of the vertices in the color group.
-    If the result is the same for all vertices in a group, the group is left unchanged.
-    The newly created group is added to the queue if the original group is in the queue.
-    If the original group is not in the queue, the largest of the original and the new group is added to the queue.
-    The algorithm terminates if the queue is empty.
-    :param G: The graph to perform color refinement on
+    Performs fast color refinement on the graph (Hopcroft's partition refinement).
+    All color groups of the initially colored graph are put in a queue. Each color group that is taken from the queue
+    is used as a splitter: for every vertex the amount of neighbours in the splitter is counted, and every color group
+    is split into groups of vertices with the same count.
+    The largest of these groups keeps the original color, the others get a new color and are added to the queue. This
+    is enough, because a split of a color group that was already used as splitter is implied by the other groups.
+    The algorithm terminates if the queue is empty, the coloring is then the coarsest equitable refinement of the
+    initial coloring. Because every vertex is in a splitter at most O(log n) times, this takes O((n+m) log n) time.
+    After individualization in branching, the coloring is already equitable apart from the individualized color
+    groups. If these are given as splitters, only they are put in the queue, so the work is proportional to what
+    actually changes instead of to the size of the graph.
+    :param G: The graph (or compact graph) to perform color refinement on
+    :param splitters: Optional, the only colors that are put in the queue. The coloring must be equitable with respect
+    to all other colors, and to the union of each splitter with the color group it was split from.
+    :param statistics: Optional, the collector that the splitters, the split color groups and the colors that are put
+    in the queue are counted in
     :return: The colored graph
     """
+    if not isinstance(G, CompactGraph):
+        # Refine a compact copy of the graph and copy the resulting coloring back
+        G_compact = CompactGraph.from_graph(G)
+        fast_color_refinement(G_compact, splitters, statistics)
+        G_compact.write_coloring(G)
+        return G
+
+    start = time()
+    if splitters is None:
+        # The initial coloring is not guaranteed to be stable with respect to any color group (for example,
+        # degree_fixed is fixed before twins are removed), so all color groups are used as splitter
+        splitters = sorted(G.colors)
+    __refine(G, splitters, statistics)
+
+    if statistics is not None:
+        statistics.refinements += 1
+        statistics.add_time('refinement', time() - start)
+    return G
+
+
+def __refine(G: "CompactGraph", splitters: List[int], statistics: "SearchStatistics"):
+    """
+    Refines the coloring of G until it is stable, starting with the given colors in the queue.
+    The coloring must already be stable with respect to every color group that is not in the queue.
+    Touched color groups are split in order of color and the new groups in order of count, so the resulting colors do
+    not depend on the numbering of the vertices.
+    :param G: The compact graph to refine
+    :param splitters: The colors to put in the queue
+    :param statistics: The collector of the statistics of the search, or None
+    """
+    offsets = G.offsets
+    adjacency = G.adjacency
+    colornum = G.colornum
+    colors = G.colors
+
+    queue = deque(splitters)
+    # Every split creates a new color, and there are at most n splits
+    in_queue = bytearray(G.max_colornum + len(G) + 1)
+    for color in queue:
+        in_queue[color] = 1
+    count = [0] * len(G)
+    if statistics is not None:
+        statistics.queue_pushes += len(queue)
 
-    queue = __initialize_queue(G)
     while queue:
         # Get first color and remove that from the queue
-        color = queue.pop(0)
-        vertices_in_color_group = G.colors[color]
-        # Get the neighbours of the color group grouped by color
-        neighbours_of_color_group = __get_color_groups_with_neighbours_in_color_group(vertices_in_color_group)
-        for c, color_group in neighbours_of_color_group.items():
-            # Do nothing if the size of the set in neighbours_of_color_group is zero or if the size is the same as the size of the list in colors
-            if len(color_group) == 0 or len(color_group) == len(G.colors[c]):
+        color = queue.popleft()
+        in_queue[color] = 0
+
+        # Count for every vertex the amount of neighbours in the splitter
+        touched = []
+        for v in colors[color]:
+            for i in range(offsets[v], offsets[v + 1]):
+                w = adjacency[i]
+                if count[w] == 0:
+                    touched.append(w)
+                count[w] += 1
+
+        # Group the counted vertices by their color
+        touched_colors = {}
+        for w in touched:
+            touched_colors.setdefault(colornum[w], []).append(w)
+
+        for c in sorted(touched_colors):
+            # Group the vertices of the color group by count
+            groups = {}
+            for w in touched_colors[c]:
+                groups.setdefault(count[w], []).append(w)
+            # The vertices without neighbours in the splitter are not counted, they keep color c
+            untouched = len(colors[c]) - len(touched_colors[c])
+            if untouched == 0 and len(groups) == 1:
                 continue
-            # Change the color of the vertices in neighbours_of_color_group
-            G.max_colornum += 1
-            for vertex in color_group:
-                vertex.colornum = G.max_colornum
-                # Update colors of graph
-                G.colors[c].remove(vertex)
-                G.colors.setdefault(G.max_colornum, list()).append(vertex)
-            # Add the correct color to the queue
-            if c in queue:
-                queue.append(G.max_colornum)
-            else:
-                # Append the current color to the queue if the amount of vertices that did not change color is larger
-                # than the amount of vertices that did change color
-                if 2 * len(color_group) < len(G.colors[c]):
-                    queue.append(c)
-                else:
-                    queue.append(G.max_colornum)
+
+            counts = sorted(groups)
+            if untouched == 0:
+                # The largest group keeps color c (the group with the lowest count if sizes are equal)
+                counts.remove(max(counts, key=lambda k: len(groups[k])))
+
+            # All other groups get a new color
+            new_colors = []
+            for k in counts:
+                new_colors.append(G.split(c, groups[k]))
+
+            if not in_queue[c]:
+                # If color c is not in the queue, the largest of all groups does not have to be added to the queue
+                largest = max(new_colors, key=lambda new_color: len(colors[new_color]))
+                if len(colors[largest]) > len(colors[c]):
+                    new_colors.remove(largest)
+                    new_colors.append(c)
+            for new_color in new_colors:
+                queue.append(new_color)
+                in_queue[new_color] = 1
+            if statistics is not None:
+                statistics.cells_split += len(counts)
+                statistics.queue_pushes += len(new_colors)
+
+        for w in touched:
+            count[w] = 0
+        if statistics is not None:
+            statistics.refinement_rounds += 1
+
+
+def signature_color_refinement(G: "Graph", splitters: List[int] = None, statistics: "SearchStatistics" = None):
+    """
+    Performs color refinement in rounds, in which the signatures of all vertices are computed in bulk from the
+    adjacency arrays of the compact graph. The signature of a vertex is the sorted tuple of the colors of its
+    neighbours. Every color group is then split into groups of vertices with the same signature, in order of signature,
+    of which the largest group keeps the original color. The algorithm terminates if a round does not split any color
+    group. This is useful for dense graphs, in which many rounds happen anyway.
+    :param G: The graph (or compact graph) to perform color refinement on
+    :param splitters: Not used, the whole coloring is refined
+    :param statistics: Optional, the collector that the rounds and the split color groups are counted in
+    :return: The colored graph
+    """
+    if not isinstance(G, CompactGraph):
+        # Refine a compact copy of the graph and copy the resulting coloring back
+        G_compact = CompactGraph.from_graph(G)
+        signature_color_refinement(G_compact, splitters, statistics)
+        G_compact.write_coloring(G)
+        return G
+
+    start = time()
+    offsets = G.offsets
+    adjacency = G.adjacency
+    colornum = G.colornum
+
+    has_changed = True
+    while has_changed:
+        has_changed = False
+        if statistics is not None:
+            statistics.refinement_rounds += 1
+        # Compute the signatures of all vertices using the colors of the previous round
+        neighbour_colors = [colornum[w] for w in adjacency]
+        signatures = [tuple(sorted(neighbour_colors[offsets[v]:offsets[v + 1]])) for v in G.vertices]
+
+        for color, vertices in list(G.colors.items()):
+            if len(vertices) == 1:
+                continue
+            groups = {}
+            for v in vertices:
+                groups.setdefault(signatures[v], []).append(v)
+            if len(groups) == 1:
+                continue
+
+            # The largest group keeps the color (the group with the lowest signature if sizes are equal)
+            unique_signatures = sorted(groups)
+            unique_signatures.remove(max(unique_signatures, key=lambda signature: len(groups[signature])))
+            for signature in unique_signatures:
+                G.split(color, groups[signature])
+            has_changed = True
+            if statistics is not None:
+                statistics.cells_split += len(unique_signatures)
+
+    if statistics is not None:
+        statistics.refinements += 1
+        statistics.add_time('refinement', time() - start)
     return G
 
 
-def __colorgroup_refinement(G, colornum, vertices: List["Vertex"], next_colornum):
+def __colorgroup_refinement(G: "CompactGraph", colornum, vertices: List[int]):
     """
     For vertices with property colornum = 'colornum', define which vertices have equal neighbours and which do not
     If a vertex within this group does not have the same neighbours as the first vertex in this group, these vertices
-    will be given a new colornum 'next_colornum' and are moved from key colornum to next_colornum in the dictionary
+    will be given a new colornum and are moved from key colornum to the new colornum in the dictionary
     :param G: The graph currently evaluated
     :param colornum: Current colornum to be evaluated
     :param vertices: Vertices of that colornum to be evaluated
-    :param next_colornum: The next colornum that was not in colors as a key before this colorgroup refinement
     :return has_changed: Returns if the colorgroup refinement has changed some colornum values for vertices
     """
 
     # Creates a list of all colornums of the neighbours of the first vertex in 'vertices'
     v0 = vertices[0]
     v0_colors = []
-    for v in v0.neighbours:
-        v0_colors.append(v.colornum)
+    for v in G.neighbours(v0):
+        v0_colors.append(G.colornum[v])
 
     # Compare each vertex other than the first vertex in 'vertices' with the first vertex in 'vertices'
     # If the vertex is different, remember it in different_vertices
     has_changed = False
     different_vertices = []
     for v in vertices[1:]:
-        if not __neighbours_equal(v0_colors, v):
+        if not __neighbours_equal(G, v0_colors, v):
             different_vertices.append(v)
 
     # After all vertices have been compared, change the colornum of all different vertices
-    for v in different_vertices:
-        v.colornum = next_colornum
-        G.colors.setdefault(next_colornum, []).append(v)
-        G.colors[colornum].remove(v)
+    if different_vertices:
+        G.split(colornum, different_vertices)
         has_changed = True
 
     return has_changed
 
 
-def __neighbours_equal(v0: List[int], v: Vertex):
+def __neighbours_equal(G: "CompactGraph", v0: List[int], v: int):
     """
     Determines if the colornum properties of the neighbours of vertex 'v' matches with the list of colornum properties in
     the list v0_colors
+    :param G: The graph currently evaluated
     :param v0_colors: List of colornum properties of the neighbours of the vertex to be compared with
     :param v: The vertex that needs to be compared with vertex v0
     :return: Boolean if neighbours of vertex v0 and v are equal
     """
     v0_colors = v0.copy()
-    for n in v.neighbours:
-        if n.colornum in v0_colors:
-            v0_colors.remove(n.colornum)
+    for n in G.neighbours(v):
+        if G.colornum[n] in v0_colors:
+            v0_colors.remove(G.colornum[n])
         else:
             return False
     return True
-
-
-def __initialize_queue(G: "Graph"):
-    """
-    Initializes the queue of the graph for the fast color refinement using the initial coloring.
-    Puts all color groups in the queue except the largest color group.
-    :param G: The graph to construct the queue for
-    :return: The queue of the graph
-    """
-    queue = list(G.colors.keys())
-    largest_color_group_size = 0
-    largest_color_group = 0
-    for color, vertices in G.colors.items():
-        if len(vertices) > largest_color_group_size:
-            largest_color_group = color
-            largest_color_group_size = len(vertices)
-    queue.remove(largest_color_group)
-    return queue
-
-
-def __get_color_groups_with_neighbours_in_color_group(vertices_in_color_group: "List[Vertex]"):
-    """
-    Returns a dict with the color of the color group as key and the set of neighbours of the color group currently
-    investigated as value.
-    :param vertices_in_color_group: The vertices in the color group currently investigated
-    :return: The dict with the color and the vertices in those color groups with a neighbour in the color group
-    currently investigated
-    """
-    neighbours_of_color_group = {}
-    # Get the color of the color group currently investigated
-    color = vertices_in_color_group[0].colornum
-    for vertex in vertices_in_color_group:
-        neighbours = vertex.neighbours
-        for neighbour in neighbours:
-            if neighbour.colornum != color:
-                # Only add the vertex to the map if it is not in the color group currently investigated
-                neighbours_of_color_group.setdefault(neighbour.colornum, set()).add(neighbour)
-    return neighbours_of_color_group
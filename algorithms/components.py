@@ -0,0 +1,57 @@
+from supporting_components.graph import Graph, Vertex, Edge
+from typing import List
+
+
+def connected_components(G: "Graph") -> List[List["Vertex"]]:
+    """
+    Determines the connected components of graph G with a breadth-first search from every vertex that is not in a
+    component yet.
+    :param G: The graph
+    :return: The components as lists of vertices, in the order of their first vertex in G.vertices
+    """
+    component_of = {}
+    components = []
+    for v in G.vertices:
+        if v in component_of:
+            continue
+        component_of[v] = len(components)
+        queue = [v]
+        for vertex in queue:
+            for neighbour in vertex.neighbours:
+                if neighbour not in component_of:
+                    component_of[neighbour] = len(components)
+                    queue.append(neighbour)
+        components.append(queue)
+    return components
+
+
+def component_graphs(G: "Graph") -> List["Graph"]:
+    """
+    Splits graph G into a graph for every connected component. The vertices of a component graph get the degree_fixed,
+    n_twins and pendant_trees of the vertices of G, so that preprocessed graphs stay preprocessed.
+    :param G: The (preprocessed) graph
+    :return: The graphs of the components, or [G] if G is connected
+    """
+    components = connected_components(G)
+    if len(components) <= 1:
+        return [G]
+
+    graphs = []
+    vertex_of = {}
+    for component in components:
+        graph = Graph(directed=False, n=len(component))
+        for v, vertex in zip(component, graph.vertices):
+            vertex.degree_fixed = v.degree_fixed
+            vertex.n_twins = v.n_twins
+            vertex.pendant_trees = v.pendant_trees
+            vertex_of[v] = vertex
+        graphs.append(graph)
+
+    # The edges of every component, all edges of a component are added at once
+    edges = {id(graph): [] for graph in graphs}
+    for e in G.edges:
+        tail = vertex_of[e.tail]
+        edges[id(tail.graph)].append(Edge(tail, vertex_of[e.head]))
+    for graph in graphs:
+        graph.add_edges(edges[id(graph)])
+    return graphs
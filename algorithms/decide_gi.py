@@ -1,3 +1,6 @@
+from supporting_components.compact_graph import CompactGraph
+
+
 def is_balanced_or_bijected(G: 'Graph'):
     """
     This function returns if the graph is balanced and bijected.
@@ -11,6 +14,29 @@ def is_balanced_or_bijected(G: 'Graph'):
 
     return False, False
 
+
+def is_balanced_or_bijected_since(G: 'CompactGraph', checkpoint):
+    """
+    This function returns if the compact graph is balanced and bijected, given that it was balanced at `checkpoint`.
+    Every color group after the checkpoint consists of color groups at the checkpoint and groups of vertices that were
+    moved together by `split`. So the graph is still balanced if and only if every group of moved vertices has as many
+    vertices of the first graph as of the second graph, which only takes time proportional to the amount of moved
+    vertices. A balanced graph is bijected if every color group has exactly two vertices.
+    :param G: Disjoint union compact graph
+    :param checkpoint: A checkpoint of `G` at which its coloring was balanced
+    :return: bool is_balanced, bool is_bijected
+    """
+    graph_label = G.graph_label
+    for _, _, moved in G.trail[checkpoint[0]:]:
+        balance = 0
+        for v in moved:
+            balance += 1 if graph_label[v] == 1 else -1
+        if balance != 0:
+            return False, False
+
+    return True, 2 * len(G.colors) == len(G)
+
+
 def is_balanced(G: 'Graph'):
     """
     The vertex coloring of the `self` and `other` graph are extracted from the disjoint union.
@@ -26,17 +52,22 @@ def is_balanced(G: 'Graph'):
     g_self_colornums  = []
     g_other_colornums = []
 
-    for v in G.vertices:
-        if type(v.graph_label) == int:
-            if v.graph_label == 1:
-                g_self_colornums.append(v.colornum)
-            elif v.graph_label == 2:
-                g_other_colornums.append(v.colornum)
+    if isinstance(G, CompactGraph):
+        labelled_colornums = zip(G.graph_label, G.colornum)
+    else:
+        labelled_colornums = ((v.graph_label, v.colornum) for v in G.vertices)
+
+    for graph_label, colornum in labelled_colornums:
+        if type(graph_label) == int:
+            if graph_label == 1:
+                g_self_colornums.append(colornum)
+            elif graph_label == 2:
+                g_other_colornums.append(colornum)
             else:
                 raise ValueError('Error: Vertex with graph_label {graph_label} is not an int 1 or 2"'.format(
-                    graph_label=repr(v.graph_label)))
+                    graph_label=repr(graph_label)))
         else:
-            raise ValueError('Error: Vertex with graph_label {graph_label} is not of type int"'.format(graph_label=repr(v.graph_label)))
+            raise ValueError('Error: Vertex with graph_label {graph_label} is not of type int"'.format(graph_label=repr(graph_label)))
 
     # If the amount of vertices of the two graphs are not the same, the graphs are not isomorphic
     if len(g_self_colornums) != len(g_other_colornums):
@@ -0,0 +1,355 @@
+from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from supporting_components.result_store import certificate_hash
+from algorithms.canonical_labeling import certificate
+from algorithms.automorphism_problem import count_automorphisms
+from collections import Counter
+from math import factorial
+from typing import Callable, Dict, List, Optional, Set
+
+"""
+Modular decomposition: a module of a graph is a set of vertices that all have the same neighbours outside the set, like
+twins are modules of two vertices. The strong modules, the modules that do not overlap any other module, form a tree:
+ - a parallel module (disconnected) has its connected components as children,
+ - a series module (of which the complement is disconnected) has the components of its complement as children,
+ - a prime module has its maximal strong modules as children, and the graph of the children (the quotient graph, with
+   one vertex for every child) has no modules except the trivial ones.
+Every automorphism maps the tree to itself, so the amount of automorphisms of a graph is the product over the modules of
+the automorphisms of their quotient graph that only map children to isomorphic children: k! for every class of k
+isomorphic children of a parallel or series module, and the automorphisms of the colored quotient graph of a prime
+module. Cographs only have parallel and series modules, so they are solved without any branching.
+"""
+
+PARALLEL = 'parallel'
+SERIES = 'series'
+PRIME = 'prime'
+VERTEX = 'vertex'
+
+
+class Module(object):
+    """
+    `Module` objects are the nodes of the modular decomposition tree: the `kind` of the module (parallel, series, prime
+    or vertex), its `vertices` and its `children`.
+    """
+
+    def __init__(self, vertices: List[int]):
+        """
+        Creates a module of which the kind and children are determined by `modular_decomposition`.
+        :param vertices: The vertex ids of the module
+        """
+        self.kind = None
+        self.vertices = vertices
+        self.children = []
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the Module.
+        :return: The string to approximate the constructor arguments of the `Module'
+        """
+        return 'Module(kind={}, vertices={})'.format(self.kind, self.vertices)
+
+
+def modular_decomposition(G: 'Graph') -> 'Module':
+    """
+    Determines the modular decomposition tree of a graph, from the root down. The children of a parallel or series
+    module are found with a breadth-first search in the module or its complement in O(n + m). The children of a prime
+    module are found with the partition of the module into maximal modules that do not contain its first vertex v,
+    the parts of which are the other children and the modules inside the child of v.
+    Every module is searched again for its children, so the time is not linear in the size of the graph: it grows with
+    the depth of the tree, up to O(n * m) for a cograph of depth n - 1 like a threshold graph.
+    :param G: The graph (or compact graph)
+    :return: The root of the tree, the module of all vertices
+    """
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+    adjacency = [set(G.neighbours(v)) for v in G.vertices]
+
+    root = Module(list(G.vertices))
+    stack = [root]
+    while stack:
+        module = stack.pop()
+        if len(module.vertices) == 1:
+            module.kind = VERTEX
+            continue
+
+        parts = __components(module.vertices, adjacency, False)
+        module.kind = PARALLEL
+        if len(parts) == 1:
+            parts = __components(module.vertices, adjacency, True)
+            module.kind = SERIES
+            if len(parts) == 1:
+                parts = __maximal_modules(module.vertices, adjacency)
+                module.kind = PRIME
+        module.children = [Module(part) for part in parts]
+        stack.extend(module.children)
+    return root
+
+
+def is_decomposable(tree: 'Module') -> bool:
+    """
+    :param tree: The modular decomposition tree of a graph
+    :return: Whether the graph has a module other than a single vertex or all vertices, so whether the tree makes the
+    problem smaller
+    """
+    return tree.kind != PRIME or any(child.kind != VERTEX for child in tree.children)
+
+
+def module_certificate(G: 'Graph', tree: 'Module', statistics: 'SearchStatistics' = None,
+                       max_nodes: int = None) -> Optional[str]:
+    """
+    :param G: The graph (or compact graph)
+    :param tree: The modular decomposition tree of the graph
+    :param statistics: Optional, the collector of the statistics of the canonical labeling of the quotient graphs
+    :param max_nodes: Optional, the maximal amount of nodes of the search tree of the canonical labeling of every
+    quotient graph
+    :return: The certificate of the graph, which is equal for two graphs if and only if they are isomorphic. Or None if
+    the search tree of a quotient graph has more than max_nodes nodes.
+    """
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+    return __certificates(G, __post_order(tree), statistics, max_nodes)[id(tree)]
+
+
+def module_automorphisms(G: 'Graph', tree: 'Module', color_refinement_method: Callable[[Graph], None],
+                         statistics: 'SearchStatistics' = None) -> int:
+    """
+    Counts the automorphisms of a graph with its modular decomposition tree. The children of every module are
+    classified by their certificates, the classes are the colors of the quotient graph.
+    :param G: The graph (or compact graph)
+    :param tree: The modular decomposition tree of the graph
+    :param color_refinement_method: The color refinement method that is used in the branching on the quotient graphs of
+    prime modules
+    :param statistics: Optional, the collector of the statistics of the canonical labeling and the branching
+    :return: The amount of automorphisms of the graph
+    """
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+    modules = __post_order(tree)
+    # The certificate of the root is not needed, the root is the last module
+    certificates = __certificates(G, modules[:-1], statistics, None)
+
+    amount = 1
+    for module in modules:
+        child_certificates = [certificates[id(child)] for child in module.children]
+        if module.kind in (PARALLEL, SERIES):
+            for k in Counter(child_certificates).values():
+                amount *= factorial(k)
+        elif module.kind == PRIME:
+            quotient = __quotient(G, module, child_certificates)
+            quotient_union = quotient.self_disjoint_union()
+            quotient_union.set_coloring(quotient.degree_fixed * 2)
+            amount *= count_automorphisms(quotient_union, color_refinement_method, statistics)
+    return amount
+
+
+def __post_order(tree: 'Module') -> List['Module']:
+    """
+    :return: The modules of the tree, every module after its children
+    """
+    modules = []
+    stack = [tree]
+    while stack:
+        module = stack.pop()
+        modules.append(module)
+        stack.extend(module.children)
+    modules.reverse()
+    return modules
+
+
+def __certificates(G: 'CompactGraph', modules: List['Module'], statistics: 'SearchStatistics',
+                   max_nodes: Optional[int]) -> Dict[int, Optional[str]]:
+    """
+    Computes the certificates of modules, which are hashes so that they can be sorted and compared in constant time.
+    The certificate of a vertex consists of its degree_fixed, n_twins and pendant_trees, the certificate of a parallel
+    or series module of the sorted certificates of its children. The certificate of a prime module also contains the
+    certificate of its quotient graph, of which the vertices are colored by the rank of the certificate of their child.
+    :param modules: The modules, every module after its children
+    :return: For the id of every module its certificate, or None if the certificate of a quotient graph was not found
+    """
+    certificates = {}
+    for module in modules:
+        if module.kind == VERTEX:
+            v = module.vertices[0]
+            key = (G.degree_fixed[v] if G.degree_fixed[v] is not None else G.degree(v), G.n_twins[v],
+                   G.pendant_trees[v])
+            certificates[id(module)] = certificate_hash((VERTEX, key))
+            continue
+
+        child_certificates = [certificates[id(child)] for child in module.children]
+        if None in child_certificates:
+            certificates[id(module)] = None
+        elif module.kind in (PARALLEL, SERIES):
+            certificates[id(module)] = certificate_hash((module.kind, tuple(sorted(child_certificates))))
+        else:
+            quotient_certificate = certificate(__quotient(G, module, child_certificates), statistics, max_nodes)
+            if quotient_certificate is None:
+                certificates[id(module)] = None
+            else:
+                certificates[id(module)] = certificate_hash((module.kind, tuple(sorted(set(child_certificates))),
+                                                             quotient_certificate))
+    return certificates
+
+
+def __quotient(G: 'CompactGraph', module: 'Module', child_certificates: List[str]) -> 'CompactGraph':
+    """
+    :param module: A prime module
+    :param child_certificates: The certificates of the children of the module
+    :return: The quotient graph of the module, with the first vertex of every child as representative. The degree_fixed
+    of a vertex is the rank of the certificate of its child, so that only isomorphic children are mapped to each other.
+    """
+    index = {child.vertices[0]: i for i, child in enumerate(module.children)}
+    edges = [(i, index[w]) for v, i in index.items() for w in G.neighbours(v) if w in index and i < index[w]]
+    quotient = CompactGraph(len(index), edges)
+    ranks = {c: rank for rank, c in enumerate(sorted(set(child_certificates)))}
+    quotient.degree_fixed = [ranks[c] for c in child_certificates]
+    return quotient
+
+
+def __components(vertices: List[int], adjacency: List[Set[int]], complement: bool) -> List[List[int]]:
+    """
+    Determines the connected components of the subgraph of the vertices, or of its complement, with a breadth-first
+    search. In the complement, the vertices that are not visited yet are checked for every vertex, of which the
+    vertices that stay unvisited are neighbours, so the search takes O(n + m) time as well.
+    :param vertices: The vertices of the subgraph
+    :param adjacency: The neighbours of every vertex of the graph
+    :param complement: Whether the components of the complement are determined
+    :return: The components as lists of vertices
+    """
+    unvisited = set(vertices)
+    components = []
+    for s in vertices:
+        if s not in unvisited:
+            continue
+        unvisited.discard(s)
+        queue = [s]
+        for v in queue:
+            if complement:
+                found = [w for w in unvisited if w not in adjacency[v]]
+            else:
+                found = [w for w in adjacency[v] if w in unvisited]
+            unvisited.difference_update(found)
+            queue.extend(found)
+        components.append(queue)
+    return components
+
+
+def __maximal_modules(vertices: List[int], adjacency: List[Set[int]]) -> List[List[int]]:
+    """
+    Determines the children of a prime module. Every part of the partition into maximal modules without v is either a
+    child or a module inside the child of v. The smallest module that contains v and a vertex of a part is the whole
+    module if the part is a child, so the child of v consists of v and the parts of which that module is smaller.
+    :param vertices: The vertices of the prime module
+    :param adjacency: The neighbours of every vertex of the graph
+    :return: The maximal strong modules, the module of v first
+    """
+    v = vertices[0]
+    inside = set(vertices)
+    parts = __modules_without(v, vertices, inside, adjacency)
+
+    # The vertices of the modules with v that were found, which are all inside the child of v, and the vertices of the
+    # other children that were found
+    found = {v}
+    outside = set()
+    module = [v]
+    children = []
+    for part in parts:
+        if part[0] in found or __closure(v, part[0], inside, adjacency, found, outside):
+            module += part
+        else:
+            children.append(part)
+            outside.update(part)
+    return [module] + children
+
+
+def __modules_without(v: int, vertices: List[int], inside: Set[int], adjacency: List[Set[int]]) -> List[List[int]]:
+    """
+    Partitions the vertices except v into maximal modules with partition refinement: the parts start as the neighbours
+    and the non-neighbours of v, and every part is split by the neighbourhood of every vertex outside it until no
+    vertex has neighbours in only a part of a part.
+    :param v: The vertex that is not in the parts
+    :param vertices: The vertices of the (sub)graph
+    :param inside: The vertices of the (sub)graph as a set
+    :param adjacency: The neighbours of every vertex of the graph
+    :return: The parts, in the order of their first vertex
+    """
+    neighbours = [w for w in vertices if w in adjacency[v]]
+    non_neighbours = [w for w in vertices if w != v and w not in adjacency[v]]
+    parts = [set(part) for part in (neighbours, non_neighbours) if part]
+    part_of = {w: i for i, part in enumerate(parts) for w in part}
+
+    queue = [w for w in vertices if w != v]
+    queued = set(queue)
+    while queue:
+        p = queue.pop()
+        queued.discard(p)
+        # The neighbours of p in every part except its own
+        split = {}
+        for w in adjacency[p]:
+            if w in inside and w != v and part_of[w] != part_of[p]:
+                split.setdefault(part_of[w], []).append(w)
+        for i, part_neighbours in split.items():
+            if len(part_neighbours) == len(parts[i]):
+                continue
+            parts[i].difference_update(part_neighbours)
+            for w in part_neighbours:
+                part_of[w] = len(parts)
+            parts.append(set(part_neighbours))
+
+            # The vertices of both new parts are outside the other part. The vertices of the smaller part can split
+            # the larger part, the vertices of the larger part that can split the smaller part are the ones with some
+            # but not all of its vertices as neighbours. So only the smaller part is searched.
+            small, large = sorted((parts[i], parts[-1]), key=len)
+            counts = {}
+            for s in small:
+                for w in adjacency[s]:
+                    if w in large:
+                        counts[w] = counts.get(w, 0) + 1
+            for w in list(small) + [w for w, c in counts.items() if c < len(small)]:
+                if w not in queued:
+                    queued.add(w)
+                    queue.append(w)
+
+    position = {w: i for i, w in enumerate(vertices)}
+    return sorted((sorted(part, key=position.get) for part in parts), key=lambda part: position[part[0]])
+
+
+def __closure(v: int, x: int, inside: Set[int], adjacency: List[Set[int]], found: Set[int], outside: Set[int]) -> bool:
+    """
+    Determines the smallest module that contains v and x by adding the vertices that have neighbours in only a part of
+    the module until there are none. Only the vertices that are adjacent to the whole module are kept track of: a
+    vertex with a neighbour in the module that is not one of them has to be added.
+    :param inside: The vertices of the (sub)graph
+    :param adjacency: The neighbours of every vertex of the graph
+    :param found: The vertices of the modules with v that were found, the module is added to it if it is not the whole
+    (sub)graph
+    :param outside: The vertices of children without v, the module is the whole (sub)graph if it contains one of them
+    :return: Whether the smallest module is smaller than the (sub)graph
+    """
+    module = set()
+    full = None
+    queue = [v, x]
+    queued = {v, x}
+    while queue:
+        u = queue.pop()
+        module.add(u)
+        neighbours = [w for w in adjacency[u] if w in inside and w not in module]
+        if full is None:
+            full = set(neighbours)
+            continue
+        full.discard(u)
+        splitters = [w for w in neighbours if w not in full]
+        still_full = full.intersection(neighbours)
+        splitters += full - still_full
+        full = still_full
+        if not outside.isdisjoint(splitters):
+            return False
+        for w in splitters:
+            if w not in queued:
+                queued.add(w)
+                queue.append(w)
+
+    if len(module) == len(inside):
+        return False
+    found |= module
+    return True
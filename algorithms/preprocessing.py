@@ -1,4 +1,5 @@
 from supporting_components.graph import Graph, Vertex
+from algorithms.tree_algorithm import pendant_trees
 from math import factorial
 from typing import List
 
@@ -18,24 +19,30 @@ def remove_twins(G: 'Graph'):
     """
     Removes the twins from the graph (Twins are vertices that share the same neighbours)
     Next to twins, also triplets and any number of similar vertices with the same neighbours are taken into account.
+    Vertices that are not connected to each other are twins if their neighbourhoods are equal, vertices that are
+    connected to each other are twins if their neighbourhoods including themselves are equal. So the vertices are
+    grouped on both neighbourhoods in one pass, after which the first vertex of every group is kept.
     :param G: The graph of which the twins needs to be removed
     :return factor: To find the right amount of isomorphisms, the amount of isomorphisms found with the remaining
     graph should be multiplied by this factor.
     """
-    # Put all vertices in a queue for evaluation
-    queue = []
-    for v in G.vertices:
-        queue.append(v)
+    vertices = G.vertices
 
-    factor = 1
-    while len(queue) > 0:
-        v0 = queue.pop(0)
-        twin_list = []
-        for v1 in queue:
-            if are_twins(v0, v1):
-                # v0 and v1 are twins, add to list for removal later
-                twin_list.append(v1)
+    # Group the vertices on their neighbourhood (without and with the vertex itself)
+    open_groups = {}
+    closed_groups = {}
+    for v in vertices:
+        neighbours = frozenset(v.neighbours)
+        open_groups.setdefault(neighbours, []).append(v)
+        closed_groups.setdefault(neighbours | {v}, []).append(v)
+
+    # A vertex can not be in a group of unconnected twins and a group of connected twins at the same time
+    twin_groups = [group for group in open_groups.values() if len(group) > 1]
+    twin_groups += [group for group in closed_groups.values() if len(group) > 1]
 
+    factor = 1
+    removed = []
+    for v0, *twin_list in twin_groups:
         # For a pair of twins, if one of them is removed, you will still find half of all isomorphisms.
         # If there exists a triplet, if only one of them is kept in, you have to multiply the amount of
         # isomorphisms found by 3! = 6.
@@ -43,11 +50,33 @@ def remove_twins(G: 'Graph'):
         # should be multiplied by n!.
         factor *= factorial(len(twin_list) + 1)
         v0.n_twins += len(twin_list)
-        for twin in twin_list:
-            # delete all twins from the graph G
-            G.del_vertex(twin)
-            # also remove it from the queue
-            queue.remove(twin)
+        removed += twin_list
+
+    # delete all twins from the graph G at once
+    G.del_vertices(removed)
+
+    i_label = 0
+    for v in G.vertices:
+        v.label = i_label
+        i_label += 1
+
+    return factor
+
+
+def remove_pendant_trees(G: 'Graph'):
+    """
+    Removes the trees that hang from the graph (see pendant_trees), such as leaves and paths attached to a vertex.
+    The vertex a tree hangs from gets the name of the tree in its property pendant_trees, which is part of its color, so
+    that vertices are only mapped to vertices with the same trees. What remains is the core of the graph, in which every
+    vertex has at least two neighbours, or the one or two roots of a tree.
+    :param G: The graph of which the trees need to be removed
+    :return factor: To find the right amount of isomorphisms, the amount of isomorphisms found with the remaining
+    graph should be multiplied by this factor, the amount of ways the trees can be mapped to themselves.
+    """
+    removed, factor = pendant_trees(G)
+
+    # delete all trees from the graph G at once
+    G.del_vertices(removed)
 
     i_label = 0
     for v in G.vertices:
@@ -1,6 +1,7 @@
 from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
 from algorithms.color_initialization import degree_color_initialization
-from algorithms.decide_gi import is_balanced
+from algorithms.color_refinement import fast_color_refinement
 
 
 def could_be_isomorphic(G: 'Graph', H: 'Graph'):
@@ -16,9 +17,32 @@ def could_be_isomorphic(G: 'Graph', H: 'Graph'):
     if len(G.edges) != len(H.edges):
         return False
     # Isomorphic graphs should have the same amount of vertices with a specific degree
-    G_disjoint_union = G + H
-    degree_color_initialization(G_disjoint_union)
-    if not is_balanced(G_disjoint_union)[0]:
+    if __degree_sequence(G) != __degree_sequence(H):
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+
+def isomorphism_invariant(G: 'Graph'):
+    """
+    Computes a cheap invariant of the graph, which is equal for isomorphic graphs. Graphs with a different invariant
+    are not isomorphic, so only graphs with the same invariant have to be compared.
+    The invariant consists of the amount of vertices and edges, the degree sequence and the sizes of the color groups of
+    the stable coloring of the graph on its own, starting from the coloring by degree.
+    :param G: The graph to compute the invariant of
+    :return: The invariant as a (hashable) tuple
+    """
+    G_compact = CompactGraph.from_graph(G)
+    degree_color_initialization(G_compact)
+    fast_color_refinement(G_compact)
+    color_sizes = tuple(sorted(len(vertices) for vertices in G_compact.colors.values()))
+
+    return len(G.vertices), len(G.edges), __degree_sequence(G), color_sizes
+
+
+def __degree_sequence(G: 'Graph'):
+    """
+    :param G: The graph
+    :return: The sorted tuple of the degrees of the vertices, as used for the initial coloring
+    """
+    return tuple(sorted(v.degree_fixed for v in G.vertices))
@@ -1,13 +1,27 @@
 from supporting_components.graph import Graph, Vertex
+from supporting_components.result_store import certificate_hash
+from collections import Counter
 from math import factorial
 
 
 def is_tree(G: "Graph"):
     """
-    Determines if graph G is a tree based on the Theorem that the amount of edges is one less than the amount of vertices
+    Determines if graph G is a tree based on the Theorem that a connected graph is a tree if the amount of edges is one
+    less than the amount of vertices
     :return: Boolean if graph G is a tree or not
     """
-    return len(G.edges) == len(G.vertices) - 1
+    if len(G.edges) != len(G.vertices) - 1:
+        return False
+
+    # A graph with a cycle and an other component can have the same amount of edges, so it must be connected
+    reached = {G.vertices[0]}
+    queue = [G.vertices[0]]
+    for vertex in queue:
+        for neighbour in vertex.neighbours:
+            if neighbour not in reached:
+                reached.add(neighbour)
+                queue.append(neighbour)
+    return len(reached) == len(G.vertices)
 
 
 def trees_are_isomorph(T1: "Graph", T2: "Graph"):
@@ -33,8 +47,8 @@ def trees_are_isomorph(T1: "Graph", T2: "Graph"):
         root2 = root_T2[0]
 
         # Assign level numbers to all nodes
-        __assign_level(root1, 0, [])
-        __assign_level(root2, 0, [])
+        __assign_level(root1)
+        __assign_level(root2)
 
         # Assign all vertices to level number lists
         L1 = {}
@@ -53,9 +67,10 @@ def trees_are_isomorph(T1: "Graph", T2: "Graph"):
         # From the bottom level up, assign names to the vertices
         are_isomorphic = True    # For each level it is checked if the trees still can be isomoprhic, if not, the loop is stopped
         for i in range(h, -1, -1):
-            # Name the vertices of tree T1 an tree T2
-            H1 = __name_vertices(L1[i])
-            H2 = __name_vertices(L2[i])
+            # Name the vertices of tree T1 an tree T2, the names of a level are shared by both trees
+            names = {}
+            H1 = __name_vertices(L1[i], names)
+            H2 = __name_vertices(L2[i], names)
 
             # On each level, the collections of names should be equal for the two trees for them to be isomorphic
             H1.sort()
@@ -94,14 +109,17 @@ def trees_automorphisms(T: "Graph"):
     # Determine the root of the tree
     root_T = __root(T)
 
-    # If there are two roots, the amount of isomorphisms is the addition of isomorphisms from the two roots
+    # If there are two roots, the roots can only be swapped if the tree has the same name with both roots. The names
+    # of a level are shared by both roots, so that they can be compared.
     # If there are two roots, root levels are overwritten in the second cycle.
+    names = {}
+    root_names = []
     total_isomorphisms = 0
     for i_root in range(len(root_T)):
         root = root_T[i_root]
 
         # Assign level numbers to all nodes
-        __assign_level(root, 0, [])
+        __assign_level(root)
 
         # Assign all vertices to level number lists
         L = {}
@@ -113,69 +131,166 @@ def trees_automorphisms(T: "Graph"):
 
         # From the bottom level up, assign names to the vertices
         for i in range(h, -1, -1):
-            # Name the vertices of tree T1 an tree T2
-            H = __name_vertices(L[i])
+            # Name the vertices of tree T
+            H = __name_vertices(L[i], names.setdefault(i, {}))
 
-        total_isomorphisms += L[0][0].auto
+        # The amount of automorphisms with the first root, which is added again if the second root is the same
+        root_names.append((h, root.name))
+        if root_names[-1] == root_names[0]:
+            total_isomorphisms += root.auto
 
     return total_isomorphisms
 
 
+def tree_certificate(T: "Graph"):
+    """
+    Computes a certificate of tree T with the AHU algorithm, which is equal for two trees if and only if they are
+    isomorphic. The names of a level are numbered in the sorted order of the names of the children, so that they do not
+    depend on the order of the vertices, and the certificate consists of the names of the vertices of every level.
+    The degree_fixed, the number of twins and the removed trees (see pendant_trees) of a vertex are part of its name.
+    :param T: Graph that is a tree (so is_tree(T) returns True)
+    :return: The certificate, which is hashable
+    """
+    certificates = []
+    for root in __root(T):
+        # Assign level numbers to all nodes
+        __assign_level(root)
+
+        # Assign all vertices to level number lists
+        L = {}
+        for v in T.vertices:
+            L.setdefault(v.level, []).append(v)
+
+        # From the bottom level up, the name of a vertex is the rank of its degree_fixed, number of twins, removed trees
+        # and the names of its children among the vertices of the level
+        levels = []
+        for i in range(max(L.keys()), -1, -1):
+            keys = {v: (v.degree_fixed, v.n_twins, v.pendant_trees,
+                        tuple(sorted(n.name for n in v.neighbours if n.level > v.level))) for v in L[i]}
+            ranks = {key: rank for rank, key in enumerate(sorted(set(keys.values())))}
+            for v in L[i]:
+                v.name = ranks[keys[v]]
+            levels.append(tuple(sorted(keys.values())))
+        certificates.append(tuple(levels))
+
+    # If there are two roots, the largest certificate of the two is used
+    return "tree", max(certificates)
+
+
+def pendant_trees(G: "Graph"):
+    """
+    Determines the trees that hang from graph G by removing leaves in rounds, like the roots of a tree are found. Every
+    removed vertex gets a name from the bottom up like in the AHU algorithm, but the name is the hash of the
+    degree_fixed, number of twins and sorted names of the children, so that it does not depend on the other vertices of
+    the level and is the same in every graph. The remaining vertices get the sorted names of their removed children as
+    property pendant_trees.
+    Two leaves that are only adjacent to each other are not removed, so a tree keeps its one or two roots.
+    :param G: The graph of which the trees are determined, which is not changed except for pendant_trees
+    :return: The removed vertices, and the amount of automorphisms of the trees that fix the vertices they hang from
+    """
+    degree = {}
+    for v in G.vertices:
+        degree[v] = v.degree
+
+    removed = []
+    removed_set = set()
+    children = {}
+    leaves = [v for v in G.vertices if degree[v] == 1]
+    while leaves:
+        leaf_set = set(leaves)
+        next_leaves = []
+        for v in leaves:
+            parent = next(n for n in v.neighbours if n not in removed_set)
+            if parent in leaf_set:
+                continue
+            removed.append(v)
+            removed_set.add(v)
+            v.name = certificate_hash((v.degree_fixed, v.n_twins, tuple(sorted(children.get(v, ())))))
+            children.setdefault(parent, []).append(v.name)
+            degree[parent] -= 1
+            next_leaves.append(parent)
+        # Only vertices that have become a leaf after removing all leaves of this round are removed in the next round
+        leaves = [v for v in set(next_leaves) if degree[v] == 1]
+
+    # Children with the same name can be mapped to each other in every order
+    factor = 1
+    for v, names in children.items():
+        for count in Counter(names).values():
+            factor *= factorial(count)
+        if v not in removed_set:
+            v.pendant_trees = tuple(sorted(names))
+    return removed, factor
+
+
 def __root(T: "Graph"):
     """
     Determines the root of tree T by removing all leaves from the tree until there are 1 or 2 vertices left.
+    The leaves are not removed from the graph, but the degrees of the remaining vertices are counted, so every vertex is
+    removed in time proportional to its degree.
     :return: A list of vertices of the roots of tree T
     """
-    T_copy = T.copy()
-
-    # Leaves are removed from the copy untill 1 or 2 vertices remain
-    while len(T_copy.vertices) > 2:
-        vertices_to_remove = []
-        for v in T_copy.vertices:
-            if v.degree == 1:
-                vertices_to_remove.append(v)
-        for v in vertices_to_remove:
-            T_copy.del_vertex(v)
-
-    root_labels = []
-    for v in T_copy.vertices:
-        root_labels.append(v.label)
+    vertices = T.vertices
+    degree = {}
+    for v in vertices:
+        degree[v] = v.degree
+
+    # Leaves are removed untill 1 or 2 vertices remain
+    removed = set()
+    leaves = [v for v in vertices if degree[v] == 1]
+    while len(vertices) - len(removed) > 2 and leaves:
+        next_leaves = []
+        for v in leaves:
+            removed.add(v)
+            for n in v.neighbours:
+                if n not in removed:
+                    degree[n] -= 1
+                    next_leaves.append(n)
+        # Only vertices that have become a leaf after removing all leaves of this round are removed in the next round
+        leaves = [v for v in set(next_leaves) if degree[v] == 1 and v not in removed]
 
     # From the original tree, the roots are returned
     T_root = []
-    for v in T.vertices:
-        if v.label in root_labels:
+    for v in vertices:
+        if v not in removed:
             T_root.append(v)
 
     return T_root
 
 
-def __assign_level(vertex: "Vertex", level, already_assigned: "List[Vertex]"):
+def __assign_level(root: "Vertex"):
     """
-    Assumes that levels are assigned to tree from root to the leafs
-    :param vertex: Vertex that a level needs to be assigned to
-    :param level: The level that needs to be assigned
-    :param already_assigned: List of vertices with all vertices that already have assigned a level
+    Assigns levels to the tree from the root to the leafs, with a breadth-first search
+    :param root: Vertex that is the root of the tree, which gets level 0
     """
-    vertex.level = level
-    already_assigned.append(vertex)
-    for neighbour in vertex.neighbours:
-        if neighbour not in already_assigned:
-            __assign_level(neighbour, level + 1, already_assigned)
-
-def __name_vertices(vertices: "List[Vertex]"):
+    root.level = 0
+    assigned = {root}
+    queue = [root]
+    for vertex in queue:
+        for neighbour in vertex.neighbours:
+            if neighbour not in assigned:
+                neighbour.level = vertex.level + 1
+                assigned.add(neighbour)
+                queue.append(neighbour)
+
+
+def __name_vertices(vertices: "List[Vertex]", names: dict):
     """
-    This method names one level of vertices
+    This method names one level of vertices (AHU algorithm).
+    The name of a vertex is a small integer: the sorted tuple of the names of its children is looked up in the
+    dictionary 'names' of this level, and if it is not there yet, it gets the next number. This way, the length of the
+    names does not grow with the size of the subtrees.
     :param vertices: The vertices of a level of a tree to be named
+    :param names: The dictionary of the names of this level, which maps the degree_fixed, n_twins, pendant_trees and the
+    sorted tuple of names of the children to the name of a vertex
     :return: A list of all names of the vertices in 'vertices'
     """
     # In H all names of vertices are saved
     H = []
     for v in vertices:
-        # If the vertex is a leaf, the name 'lr' is assigned
+        # If the vertex is a leaf, the name of the empty tuple of children is assigned
         # The amount of automorphisms of the subtree of the leaf, with the leaf as root, is equal to 1
         if v.degree_fixed == 1:
-            v.name = 'lr'
+            children = ()
             v.auto = 1
         else:
             # The name of all other vertices is a sorted collection of the names of its children
@@ -200,18 +315,16 @@ def __name_vertices(vertices: "List[Vertex]"):
             # other the amount of isomorphisms should be multiplied with factorial(amount of children that can be
             # mapped to each other)
             v_auto = 1
-            for child_name in set(children_names):
+            for child_name in children_count:
                 v_auto *= factorial(children_count[child_name]) * children_auto[child_name]
             v.auto = v_auto
 
             # To be able to compare the names of vertices, make sure the collection of children names is sorted
-            # and than concatenate them to one string
             children_names.sort()
-            v_name = 'l'
-            for child_name in children_names:
-                v_name += child_name
-            v_name += 'r'
-            v.name = v_name
+            children = tuple(children_names)
+        # The degree, number of twins and removed trees of the vertex are part of its name, since they are not
+        # determined by its children if the tree is the result of removing twins or trees from a graph
+        v.name = names.setdefault((v.degree_fixed, v.n_twins, v.pendant_trees, children), len(names))
         H.append(v.name)
 
     return H
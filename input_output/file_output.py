@@ -1,6 +1,8 @@
-from supporting_components.graph_io import load_graph, write_dot
+from supporting_components.graph_io import load_graph, read_graph6, write_dot
+from supporting_components.graph_cache import load_graph_list as load_cached_graph_list
 import os
 import csv
+import json
 import time
 
 
@@ -11,18 +13,32 @@ Install instructions:
     https://www.graphviz.org/download/
 """
 
+# The extensions of files in graph6 or sparse6 format, the other files are in the .gr/.grl format
+GRAPH6_EXTENSIONS = ['.g6', '.s6', '.graph6', '.sparse6']
+
 # change dir to path of this file
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 ROOT = os.path.abspath('../')
 os.chdir(ROOT)
 
 
-def load_graph_list_from_filepath(filepath):
+def load_graph_list_from_filepath(filepath, cache=False):
     """
     Given a filepath, this method loads a list of graphs from that file
     :param filepath: The file the graphs should be extracted from
+    :param cache: Optional, whether the graphs are loaded from the binary cache of the file (see graph_cache), which is
+    written next to the file the first time it is loaded. Building the graphs takes about as long as parsing the file,
+    so this only helps for files that are parsed slowly. Otherwise the file is parsed. Files in graph6 or sparse6
+    format (see GRAPH6_EXTENSIONS) are always parsed, since they are compact already.
     :return: A list of graphs
         """
+    if os.path.splitext(filepath)[1] in GRAPH6_EXTENSIONS:
+        with open(filepath) as f:
+            return [G.to_graph() for G in read_graph6(f)]
+
+    if cache:
+        return load_cached_graph_list(filepath)
+
     with open(filepath) as f:
         L = load_graph(f, read_list=True)
 
@@ -86,3 +102,21 @@ def write_csv_line(csv_filename: 'String', col_strlist: 'List[String]'):
         csv_writer = csv.writer(csv_file, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
         csv_writer.writerow(col_strlist)
 
+
+
+def write_json_file(name: 'String', data):
+    """
+    Writes data to a JSON file.
+    The filename will be timestamped by prefixing name with the current time:
+    example: YYYYMMDD-HH_MM_SS-name
+    If the folder output_files/json does not exist it is created using os.makedirs().
+    :param name: preferred name of the file
+    :param data: The data (dictionaries, lists, strings and numbers) to write
+    :return: string json_filename, path to the file
+    """
+    json_filename = ROOT + '/output_files/json/' + time.strftime('%Y%m%d-%H_%M_%S') + '-' + name + '.json'
+    os.makedirs(os.path.dirname(json_filename), exist_ok=True)
+    with open(json_filename, 'w') as json_file:
+        json.dump(data, json_file, indent=2)
+
+    return json_filename
@@ -0,0 +1,429 @@
+"""
+This is a module for working with undirected graphs in a compact, array-backed format.
+Vertices are the integers 0...n-1 and the adjacency is stored in CSR (compressed sparse row) form: the neighbours of
+vertex v are neighbours[offsets[v]:offsets[v + 1]].
+"""
+
+from array import array
+from typing import List, Iterable, Tuple, Dict
+
+from supporting_components.graph import Graph, Vertex, Edge, GraphError
+
+
+class CompactGraph(object):
+    """
+    `CompactGraph` objects hold the same information the algorithms need from a `Graph`, but without `Vertex` and
+    `Edge` objects. The properties of the vertices (`label`, `graph_label`, `coupling_label`, `degree_fixed`,
+    `n_twins`, `pendant_trees` and `colornum`) are stored in lists that are indexed by vertex id.
+    The coloring is stored like it is stored in `Graph`: `colors` maps a color to the list of vertex ids with that
+    color and `max_colornum` is the largest color in use.
+    Changes to the coloring that are made with `split` are recorded on a trail, so that they can be undone back to a
+    `checkpoint` during branching.
+    """
+
+    def __init__(self, n: int, edges: Iterable[Tuple[int, int]] = ()):
+        """
+        Creates a compact undirected graph.
+        :param n: The number of vertices, the vertices are 0...n-1
+        :param edges: The edges of the graph as (tail, head) pairs of vertex ids
+        """
+        degrees = [0] * n
+        edges = list(edges)
+        for tail, head in edges:
+            if not (0 <= tail < n and 0 <= head < n):
+                raise GraphError('Edge ({}, {}) has an end that is not a vertex of the graph'.format(tail, head))
+            degrees[tail] += 1
+            if tail != head:
+                degrees[head] += 1
+
+        offsets = array('i', [0]) * (n + 1)
+        for v in range(n):
+            offsets[v + 1] = offsets[v] + degrees[v]
+
+        neighbours = array('i', [0]) * offsets[n]
+        fill = list(offsets[:n])
+        for tail, head in edges:
+            neighbours[fill[tail]] = head
+            fill[tail] += 1
+            if tail != head:
+                neighbours[fill[head]] = tail
+                fill[head] += 1
+
+        self._n = n
+        self._m = len(edges)
+        self._offsets = offsets
+        self._neighbours = neighbours
+
+        self.label = list(range(n))
+        self.graph_label = [None] * n
+        self.coupling_label = [None] * n
+        self.degree_fixed = [None] * n
+        self.n_twins = [1] * n
+        self.pendant_trees = [()] * n
+        self.colornum = [None] * n
+        self.max_colornum = 0
+        self._position = [0] * n
+        self.colors = {}
+        self.trail = []
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the CompactGraph.
+        :return: The string to approximate the constructor arguments of the `CompactGraph'
+        """
+        return 'CompactGraph(#edges={}, #vertices={})'.format(self._m, self._n)
+
+    def __len__(self) -> int:
+        """
+        :return: The number of vertices of the graph
+        """
+        return self._n
+
+    @property
+    def colors(self) -> Dict[int, List[int]]:
+        """
+        :return: The map of color with its vertex ids. The lists in this map should only be changed with `split`.
+        """
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors: Dict[int, List[int]]):
+        """
+        Replaces the map of color with its vertex ids and indexes the position of every vertex in its list.
+        :param colors: The map of color with its vertex ids
+        """
+        self._colors = colors
+        for color_vertices in colors.values():
+            for i, v in enumerate(color_vertices):
+                self._position[v] = i
+
+    def set_coloring(self, colornums: Iterable[int]):
+        """
+        Colors the vertices with the given colornums and clears the trail.
+        :param colornums: The colornum of every vertex
+        """
+        self.colornum = list(colornums)
+        colors = {}
+        for v in range(self._n):
+            colors.setdefault(self.colornum[v], []).append(v)
+        self.colors = colors
+        self.max_colornum = max(colors) if colors else 0
+        self.trail = []
+
+    @property
+    def vertices(self) -> range:
+        """
+        :return: The vertex ids of the graph
+        """
+        return range(self._n)
+
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        """
+        :return: The edges of the graph as (tail, head) pairs with tail <= head
+        """
+        offsets, neighbours = self._offsets, self._neighbours
+        result = []
+        for v in range(self._n):
+            for i in range(offsets[v], offsets[v + 1]):
+                if v <= neighbours[i]:
+                    result.append((v, neighbours[i]))
+        return result
+
+    @property
+    def n_edges(self) -> int:
+        """
+        :return: The amount of edges of the graph
+        """
+        return self._m
+
+    @property
+    def offsets(self) -> array:
+        """
+        :return: The CSR offset array, the neighbours of v are stored at offsets[v]...offsets[v + 1] - 1
+        """
+        return self._offsets
+
+    @property
+    def adjacency(self) -> array:
+        """
+        :return: The CSR neighbour array
+        """
+        return self._neighbours
+
+    def neighbours(self, v: int) -> array:
+        """
+        :param v: The vertex id
+        :return: The neighbours of vertex v
+        """
+        return self._neighbours[self._offsets[v]:self._offsets[v + 1]]
+
+    def degree(self, v: int) -> int:
+        """
+        :param v: The vertex id
+        :return: The degree of vertex v
+        """
+        return self._offsets[v + 1] - self._offsets[v]
+
+    def is_adjacent(self, u: int, v: int) -> bool:
+        """
+        :param u: One vertex id
+        :param v: The other vertex id
+        :return: Whether the vertices are adjacent
+        """
+        return v in self.neighbours(u)
+
+    @classmethod
+    def from_graph(cls, G: "Graph") -> "CompactGraph":
+        """
+        Converts a `Graph` to a `CompactGraph`. Vertex i of the compact graph is the i-th vertex of `G.vertices`.
+        The vertex properties and the coloring of `G` are copied as well.
+        :param G: The (undirected) graph to convert
+        :return: The compact graph
+        """
+        if G.directed:
+            raise GraphError('Only undirected graphs can be converted to a CompactGraph')
+
+        vertices = G.vertices
+        index = {}
+        for i, v in enumerate(vertices):
+            index[v] = i
+
+        compact = cls(len(vertices), [(index[e.tail], index[e.head]) for e in G.edges])
+        compact.label = [v.label for v in vertices]
+        compact.graph_label = [v.graph_label for v in vertices]
+        compact.coupling_label = [v.coupling_label for v in vertices]
+        compact.degree_fixed = [v.degree_fixed for v in vertices]
+        compact.n_twins = [v.n_twins for v in vertices]
+        compact.pendant_trees = [v.pendant_trees for v in vertices]
+        compact.colornum = [v.colornum for v in vertices]
+        compact.max_colornum = G.max_colornum
+        compact.colors = {color: [index[v] for v in color_vertices] for color, color_vertices in G.colors.items()}
+
+        return compact
+
+    @classmethod
+    def from_csr(cls, offsets, neighbours, m: int) -> "CompactGraph":
+        """
+        Creates a compact graph from CSR arrays without copying them, for example from arrays that are views on a
+        memory-mapped file. The arrays are never changed.
+        :param offsets: The offset array of n + 1 entries
+        :param neighbours: The neighbour array, in which every edge is stored at both ends (and loops once)
+        :param m: The amount of edges
+        :return: The compact graph, with the default vertex properties
+        """
+        n = len(offsets) - 1
+        compact = cls(0)
+        compact._n = n
+        compact._m = m
+        compact._offsets = offsets
+        compact._neighbours = neighbours
+        compact.label = list(range(n))
+        compact.graph_label = [None] * n
+        compact.coupling_label = [None] * n
+        compact.degree_fixed = [None] * n
+        compact.n_twins = [1] * n
+        compact.pendant_trees = [()] * n
+        compact.colornum = [None] * n
+        compact._position = [0] * n
+        return compact
+
+    def __getstate__(self):
+        """
+        The adjacency arrays can be views on a memory-mapped file, which cannot be pickled, so they are copied.
+        :return: The state of the compact graph to pickle
+        """
+        state = dict(self.__dict__)
+        state['_offsets'] = array('i', self._offsets)
+        state['_neighbours'] = array('i', self._neighbours)
+        return state
+
+    def to_graph(self) -> "Graph":
+        """
+        Converts this compact graph to a `Graph`, including the vertex properties and the coloring.
+        :return: The graph
+        """
+        G = Graph(directed=False)
+        vertices = []
+        for v in range(self._n):
+            vertex = Vertex(G, label=self.label[v], graph_label=self.graph_label[v],
+                            coupling_label=self.coupling_label[v])
+            vertex.degree_fixed = self.degree_fixed[v]
+            vertex.n_twins = self.n_twins[v]
+            vertex.pendant_trees = self.pendant_trees[v]
+            vertex.colornum = self.colornum[v]
+            G.add_vertex(vertex)
+            vertices.append(vertex)
+
+        G.add_edges([Edge(vertices[tail], vertices[head]) for tail, head in self.edges])
+
+        self.write_coloring(G)
+        return G
+
+    def write_coloring(self, G: "Graph"):
+        """
+        Copies the coloring of this compact graph back to the graph it was created from with `from_graph`.
+        :param G: The graph with the same vertices (in the same order) as this compact graph
+        """
+        vertices = G.vertices
+        for v in range(self._n):
+            vertices[v].colornum = self.colornum[v]
+        G.colors = {}
+        for color, color_vertices in self.colors.items():
+            G.colors[color] = [vertices[v] for v in color_vertices]
+        G.max_colornum = self.max_colornum
+
+    def copy(self) -> "CompactGraph":
+        """
+        Returns a copy of the graph. The adjacency arrays are shared, because they are never changed.
+        :return: The copy of the graph
+        """
+        copy = CompactGraph(0)
+        copy._n = self._n
+        copy._m = self._m
+        copy._offsets = self._offsets
+        copy._neighbours = self._neighbours
+        copy.label = list(self.label)
+        copy.graph_label = list(self.graph_label)
+        copy.coupling_label = list(self.coupling_label)
+        copy.degree_fixed = list(self.degree_fixed)
+        copy.n_twins = list(self.n_twins)
+        copy.pendant_trees = list(self.pendant_trees)
+        copy.colornum = list(self.colornum)
+        copy.max_colornum = self.max_colornum
+        copy._position = [0] * self._n
+        copy.colors = {color: list(color_vertices) for color, color_vertices in self.colors.items()}
+        return copy
+
+    def __add__(self, other: "CompactGraph") -> "CompactGraph":
+        """
+        Make a disjoint union of two compact graphs, like `Graph.__add__`.
+        The vertices of `other` are numbered after the vertices of `self`. The adjacency arrays of the union are the
+        arrays of both graphs after each other, in which the entries of `other` are moved by the amount of vertices and
+        neighbours of `self`. So the union is made in O(n + m) time without any `Vertex` or `Edge` objects.
+        Vertices originating from self get graph_label 1, the other graph_label 2.
+        :param other: Compact graph to add to `self'.
+        :return: New compact graph which is a disjoint union of `self' and `other'.
+        """
+        n = self._n
+        union = CompactGraph(0)
+        union._n = n + other._n
+        union._m = self._m + other._m
+        union._offsets = array('i', self._offsets[:n]) + \
+            array('i', [offset + self._offsets[n] for offset in other._offsets])
+        union._neighbours = array('i', self._neighbours) + array('i', [w + n for w in other._neighbours])
+        union.label = list(range(union._n))
+        union.graph_label = [1] * n + [2] * other._n
+        union.coupling_label = [None] * union._n
+        union.degree_fixed = self.degree_fixed + other.degree_fixed
+        union.n_twins = self.n_twins + other.n_twins
+        union.pendant_trees = self.pendant_trees + other.pendant_trees
+        union.colornum = [None] * union._n
+        union._position = [0] * union._n
+        return union
+
+    def self_disjoint_union(self) -> "CompactGraph":
+        """
+        Make a disjoint union with itself, like `Graph.self_disjoint_union`.
+        The vertex id is used as coupling label, to tie the vertices back together when comparing.
+        :return: New compact graph which is a disjoint union of itself.
+        """
+        union = self + self
+        union.coupling_label = list(range(self._n)) * 2
+        return union
+
+    def complement(self) -> "CompactGraph":
+        """
+        Returns the complement of the graph, built directly in CSR form from the adjacency bitsets of the vertices, so
+        that no `Edge` objects are needed. The vertex properties and the coloring are copied: a coloring is equitable
+        for a graph if and only if it is equitable for its complement, so refinement can be done on either of them.
+        :return: The complement
+        """
+        n = self._n
+        offsets, neighbours = self._offsets, self._neighbours
+        all_vertices = (1 << n) - 1
+        edges = []
+        for v in range(n):
+            row = 0
+            for i in range(offsets[v], offsets[v + 1]):
+                row |= 1 << neighbours[i]
+            # Only the vertices after v, so that every pair is added once
+            row = ~row & ~((2 << v) - 1) & all_vertices
+            while row:
+                lowest_bit = row & -row
+                edges.append((v, lowest_bit.bit_length() - 1))
+                row ^= lowest_bit
+
+        complement = CompactGraph(n, edges)
+        complement.label = list(self.label)
+        complement.graph_label = list(self.graph_label)
+        complement.coupling_label = list(self.coupling_label)
+        complement.degree_fixed = list(self.degree_fixed)
+        complement.n_twins = list(self.n_twins)
+        complement.pendant_trees = list(self.pendant_trees)
+        complement.colornum = list(self.colornum)
+        complement.max_colornum = self.max_colornum
+        complement.colors = {color: list(color_vertices) for color, color_vertices in self.colors.items()}
+        return complement
+
+    def split(self, color: int, vertices: Iterable[int], new_color: int = None) -> int:
+        """
+        Moves `vertices` from the color class `color` to the color class `new_color`. If no `new_color` is given, a new
+        color (`max_colornum` + 1) is created for them.
+        Every vertex is moved in constant time, using the position of the vertex in the list of its color.
+        The move is recorded on the trail, so that it can be undone with `undo`.
+        :param color: The current color of the vertices
+        :param vertices: The vertices to move, all with color `color`
+        :param new_color: Optional, an existing color to move the vertices to
+        :return: The color the vertices are moved to
+        """
+        if new_color is None:
+            self.max_colornum += 1
+            new_color = self.max_colornum
+
+        moved = list(vertices)
+        self._move(moved, color, new_color)
+        self.trail.append((color, new_color, moved))
+        return new_color
+
+    def _move(self, vertices: List[int], color: int, new_color: int):
+        """
+        For internal use only; moves vertices from one color class to another without recording it on the trail.
+        A vertex is removed from the list of its color by putting the last vertex of that list in its place.
+        :param vertices: The vertices to move
+        :param color: The current color of the vertices
+        :param new_color: The color to move the vertices to
+        """
+        colornum = self.colornum
+        position = self._position
+        source = self._colors[color]
+        target = self._colors.setdefault(new_color, [])
+        for v in vertices:
+            last = source.pop()
+            if last != v:
+                source[position[v]] = last
+                position[last] = position[v]
+            colornum[v] = new_color
+            position[v] = len(target)
+            target.append(v)
+        if not source:
+            del self._colors[color]
+
+    def checkpoint(self):
+        """
+        Marks the current state of the coloring. The coloring can be brought back to this state with `undo`.
+        :return: The checkpoint, the length of the trail and the maximum colornum
+        """
+        return len(self.trail), self.max_colornum
+
+    def undo(self, checkpoint):
+        """
+        Undoes all moves of vertices between color classes that were made since `checkpoint`, latest move first.
+        This takes time proportional to the amount of vertices that were moved, not to the size of the graph.
+        :param checkpoint: A checkpoint returned by `checkpoint`
+        """
+        trail_length, max_colornum = checkpoint
+        while len(self.trail) > trail_length:
+            color, new_color, moved = self.trail.pop()
+            self._move(moved, new_color, color)
+        self.max_colornum = max_colornum
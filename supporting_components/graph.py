@@ -49,6 +49,7 @@ class Vertex(object):
         self.colornum = None
         self.degree_fixed = None
         self.n_twins = 1
+        self.pendant_trees = ()
 
     def __repr__(self):
         """
@@ -319,6 +320,23 @@ class Graph(object):
 
         self._v.remove(vertex)
 
+    def del_vertices(self, vertices: List["Vertex"]):
+        """
+        Delete vertices from the graph. Also remove edges connected to those vertices.
+        The lists of vertices and edges of the graph are filtered once, instead of once for every vertex and edge.
+        :param vertices: The vertices to be removed
+        """
+        vertices = set(vertices)
+        edges = set()
+        for vertex in vertices:
+            edges.update(vertex.incidence)
+
+        for e in edges:
+            e.head._del_incidence(e)
+            e.tail._del_incidence(e)
+
+        self._e = [e for e in self._e if e not in edges]
+        self._v = [v for v in self._v if v not in vertices]
 
     def add_edge(self, edge: "Edge"):
         """
@@ -344,6 +362,31 @@ class Graph(object):
         edge.head._add_incidence(edge)
         edge.tail._add_incidence(edge)
 
+    def add_edges(self, edges: List["Edge"]):
+        """
+        Add edges to the graph. And if necessary also the vertices, in the same order as `add_edge` would.
+        The vertices of the graph are looked up in a set, instead of in the list of vertices for every edge.
+        :param edges: The edges to be added
+        """
+        if self._simple:
+            for edge in edges:
+                self.add_edge(edge)
+            return
+
+        vertices = set(self._v)
+        for edge in edges:
+            if edge.tail not in vertices:
+                self.add_vertex(edge.tail)
+                vertices.add(edge.tail)
+            if edge.head not in vertices:
+                self.add_vertex(edge.head)
+                vertices.add(edge.head)
+
+            self._e.append(edge)
+
+            edge.head._add_incidence(edge)
+            edge.tail._add_incidence(edge)
+
     def del_edge(self, edge: "Edge"):
         """
         Delete edge from the graph.
@@ -375,27 +418,19 @@ class Graph(object):
             vertex_reference_self[v_before_union] = Vertex(graph=disjoint_union_graph, graph_label=1)
             vertex_reference_self[v_before_union].degree_fixed = v_before_union.degree_fixed
             vertex_reference_self[v_before_union].n_twins = v_before_union.n_twins
+            vertex_reference_self[v_before_union].pendant_trees = v_before_union.pendant_trees
         for v_before_union in other.vertices:
             vertex_reference_other[v_before_union] = Vertex(graph=disjoint_union_graph, graph_label=2)
             vertex_reference_other[v_before_union].degree_fixed = v_before_union.degree_fixed
             vertex_reference_other[v_before_union].n_twins = v_before_union.n_twins
+            vertex_reference_other[v_before_union].pendant_trees = v_before_union.pendant_trees
 
         # Add edges
-        # If vertex on Edge is not present when calling add.edge(), the vertex is added to the Graph object.
-        for e_before_union in self.edges:
-            disjoint_union_graph.add_edge(
-                Edge(
-                    vertex_reference_self[e_before_union.tail],
-                    vertex_reference_self[e_before_union.head]
-                )
-            )
-        for e_before_union in other.edges:
-            disjoint_union_graph.add_edge(
-                Edge(
-                    vertex_reference_other[e_before_union.tail],
-                    vertex_reference_other[e_before_union.head]
-                )
-            )
+        # If vertex on Edge is not present when calling add_edges(), the vertex is added to the Graph object.
+        disjoint_union_graph.add_edges(
+            [Edge(vertex_reference_self[e.tail], vertex_reference_self[e.head]) for e in self.edges] +
+            [Edge(vertex_reference_other[e.tail], vertex_reference_other[e.head]) for e in other.edges]
+        )
 
         return disjoint_union_graph
 
@@ -415,28 +450,20 @@ class Graph(object):
             vertex_reference_self[v_before_union] = Vertex(graph=disjoint_union_graph, graph_label=1, coupling_label=v_before_union.label)
             vertex_reference_self[v_before_union].degree_fixed = v_before_union.degree_fixed
             vertex_reference_self[v_before_union].n_twins = v_before_union.n_twins
+            vertex_reference_self[v_before_union].pendant_trees = v_before_union.pendant_trees
 
         for v_before_union in self.vertices:
             vertex_reference_other[v_before_union] = Vertex(graph=disjoint_union_graph, graph_label=2, coupling_label=v_before_union.label)
             vertex_reference_other[v_before_union].degree_fixed = v_before_union.degree_fixed
             vertex_reference_other[v_before_union].n_twins = v_before_union.n_twins
+            vertex_reference_other[v_before_union].pendant_trees = v_before_union.pendant_trees
 
         # Add edges
-        # If vertex on Edge is not present when calling add.edge(), the vertex is added to the Graph object.
-        for e_before_union in self.edges:
-            disjoint_union_graph.add_edge(
-                Edge(
-                    vertex_reference_self[e_before_union.tail],
-                    vertex_reference_self[e_before_union.head]
-                )
-            )
-        for e_before_union in self.edges:
-            disjoint_union_graph.add_edge(
-                Edge(
-                    vertex_reference_other[e_before_union.tail],
-                    vertex_reference_other[e_before_union.head]
-                )
-            )
+        # If vertex on Edge is not present when calling add_edges(), the vertex is added to the Graph object.
+        disjoint_union_graph.add_edges(
+            [Edge(vertex_reference_self[e.tail], vertex_reference_self[e.head]) for e in self.edges] +
+            [Edge(vertex_reference_other[e.tail], vertex_reference_other[e.head]) for e in self.edges]
+        )
 
         return disjoint_union_graph
 
@@ -496,6 +523,7 @@ class Graph(object):
             vertices_old_to_new[v].degree_fixed = v.degree_fixed
             colors.setdefault(v.colornum, list()).append(vertices_old_to_new[v])
             vertices_old_to_new[v].n_twins = v.n_twins
+            vertices_old_to_new[v].pendant_trees = v.pendant_trees
 
         for e in self.edges:
             edge = Edge(vertices_old_to_new[e.tail], vertices_old_to_new[e.head])
@@ -551,23 +579,40 @@ class Graph(object):
     def complement(self):
         """
         Create the complement of the graph.
+        The adjacency of every vertex is stored as a bitset (a Python int, bit j is set if the vertex is adjacent to the
+        j-th vertex). The complement row of a vertex is then found with one bitwise operation, and the edges of the
+        complement are added from the set bits, so no edges have to be searched.
         :return: The complement
         """
         complement = Graph(self.directed)
-        vertices_original_to_complement = {}
+        vertices = self.vertices
+        index = {}
+        complement_vertices = []
 
         # Create vertex mapping from original graph to complement graph
-        for v in self.vertices:
-            vertices_original_to_complement[v] = Vertex(complement)
-            vertices_original_to_complement[v].label = v.label
-            vertices_original_to_complement[v].degree_fixed = v.degree_fixed
-        # Add edge to complement graph only if the edge does not exist in the original graph and no undirected edge is
-        # already present in the complement graph between those two vertices
-        for v in self.vertices:
-            neighbours = v.neighbours
-            for w in self.vertices:
-                if w not in neighbours and v != w and not any((edge.tail == vertices_original_to_complement[v] and edge.head == vertices_original_to_complement[w]) or (edge.head == vertices_original_to_complement[v] and edge.tail == vertices_original_to_complement[w]) for edge in complement.edges):
-                    complement.add_edge(Edge(vertices_original_to_complement[v], vertices_original_to_complement[w]))
+        for i, v in enumerate(vertices):
+            index[v] = i
+            complement_vertex = Vertex(complement)
+            complement_vertex.label = v.label
+            complement_vertex.degree_fixed = v.degree_fixed
+            complement.add_vertex(complement_vertex)
+            complement_vertices.append(complement_vertex)
+
+        # Add an edge to the complement graph for every pair of vertices that are not adjacent in the original graph,
+        # only to the vertices after the vertex so that every pair is added once
+        for i, v in enumerate(vertices):
+            row = 0
+            for w in v.neighbours:
+                row |= 1 << index[w]
+            row = ~row & ~((2 << i) - 1) & ((1 << len(vertices)) - 1)
+            while row:
+                lowest_bit = row & -row
+                j = lowest_bit.bit_length() - 1
+                row ^= lowest_bit
+                edge = Edge(complement_vertices[i], complement_vertices[j])
+                complement._e.append(edge)
+                edge.head._add_incidence(edge)
+                edge.tail._add_incidence(edge)
         return complement
 
 
@@ -0,0 +1,158 @@
+"""
+This module contains a binary cache of the graphs of .gr/.grl files, so that a file only has to be parsed once.
+The cache of a file is written next to it, in the directory __graphcache__, and is named after the hash of the content
+of the file, so that it is not used anymore if the file changes.
+The cache consists of native 32-bit integers: a header with MAGIC, VERSION and the amount of graphs, then for every
+graph the amount of vertices, the amount of edges and the length of its neighbour array, then the CSR offset arrays of
+all graphs and then the CSR neighbour arrays of all graphs. The cache is memory-mapped, so the arrays are views on the file without copying
+them, and processes that load the same cache share its pages.
+"""
+
+from array import array
+from hashlib import sha1
+from io import StringIO
+from mmap import mmap, ACCESS_READ
+from typing import List, Optional
+import os
+import tempfile
+
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph import Graph, Edge
+from supporting_components.graph_io import read_graphs
+
+MAGIC = 0x47524c43
+VERSION = 1
+DIRECTORY = '__graphcache__'
+
+
+def cache_path(filepath: str, content: bytes) -> str:
+    """
+    :param filepath: The path of the graph file
+    :param content: The content of the graph file
+    :return: The path of the cache of the file with this content
+    """
+    directory, filename = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, DIRECTORY, filename + '.' + sha1(content).hexdigest()[:16] + '.csr')
+
+
+def write_cache(path: str, graphs: List[CompactGraph]):
+    """
+    Writes the cache of graphs. The file is written under a temporary name and then renamed, so that other processes
+    never read a cache that is only partly written. Caches of earlier versions of the same file are removed.
+    :param path: The path of the cache
+    :param graphs: The graphs
+    """
+    data = array('i', [MAGIC, VERSION, len(graphs)])
+    for G in graphs:
+        data.extend([len(G), G.n_edges, len(G.adjacency)])
+    for G in graphs:
+        data.extend(G.offsets)
+    for G in graphs:
+        data.extend(G.adjacency)
+
+    directory, filename = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(descriptor, 'wb') as f:
+        data.tofile(f)
+    os.replace(temporary_path, path)
+
+    # The name of the cache is the name of the graph file, the hash and the extension
+    prefix = filename.rsplit('.', 2)[0] + '.'
+    for other in os.listdir(directory):
+        if other != filename and other.startswith(prefix) and other.count('.') == filename.count('.'):
+            os.remove(os.path.join(directory, other))
+
+
+def read_cache(path: str) -> Optional[List[CompactGraph]]:
+    """
+    Reads the cache of graphs by memory-mapping it. The compact graphs use views on the file as adjacency arrays.
+    :param path: The path of the cache
+    :return: The graphs, or None if there is no valid cache at the path
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < 3 * 4:
+                return None
+            data = memoryview(mmap(f.fileno(), 0, access=ACCESS_READ)).cast('i')
+    except (OSError, ValueError, TypeError):
+        return None
+
+    if data[0] != MAGIC or data[1] != VERSION:
+        return None
+    n_graphs = data[2]
+    sizes = data[3:3 + 3 * n_graphs]
+    offsets_position = 3 + 3 * n_graphs
+    neighbours_position = offsets_position + sum(sizes[3 * i] + 1 for i in range(n_graphs))
+    if neighbours_position + sum(sizes[3 * i + 2] for i in range(n_graphs)) != len(data):
+        return None
+
+    graphs = []
+    for i in range(n_graphs):
+        n, m, length = sizes[3 * i], sizes[3 * i + 1], sizes[3 * i + 2]
+        offsets = data[offsets_position:offsets_position + n + 1]
+        neighbours = data[neighbours_position:neighbours_position + length]
+        graphs.append(CompactGraph.from_csr(offsets, neighbours, m))
+        offsets_position += n + 1
+        neighbours_position += length
+    return graphs
+
+
+def load_graph_list(filepath: str, graph_class=Graph) -> List[Graph]:
+    """
+    Loads the graphs of a file from its cache, or parses the file and writes the cache if there is no cache yet.
+    Files with weighted edges are not cached, because the cache does not store weights. If the cache cannot be written,
+    the parsed graphs are returned anyway.
+    :param filepath: The path of the graph file
+    :param graph_class: The class of the graphs
+    :return: The graphs, in which vertex i is the i-th vertex of the graph in the file
+    """
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    path = cache_path(filepath, content)
+
+    compact_graphs = read_cache(path)
+    if compact_graphs is not None:
+        return [__graph(graph_class, G) for G in compact_graphs]
+
+    graphs = [G for G, _ in read_graphs(graph_class, StringIO(content.decode()))]
+    if all(e.weight is None for G in graphs for e in G.edges):
+        try:
+            write_cache(path, [CompactGraph.from_graph(G) for G in graphs])
+        except OSError:
+            pass
+    return graphs
+
+
+def load_compact_graph_list(filepath: str) -> List[CompactGraph]:
+    """
+    Loads the graphs of a file from its cache as compact graphs, of which the adjacency arrays are views on the cache.
+    The cache is written first if there is none yet.
+    :param filepath: The path of the graph file
+    :return: The compact graphs
+    """
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    path = cache_path(filepath, content)
+
+    compact_graphs = read_cache(path)
+    if compact_graphs is None:
+        compact_graphs = [CompactGraph.from_graph(G) for G, _ in read_graphs(Graph, StringIO(content.decode()))]
+        try:
+            write_cache(path, compact_graphs)
+        except OSError:
+            pass
+    return compact_graphs
+
+
+def __graph(graph_class, compact: CompactGraph) -> Graph:
+    """
+    :return: The graph of the compact graph, with the vertices created like the parser creates them
+    """
+    n = len(compact)
+    graph = graph_class(directed=False, n=n)
+    vertices = graph.vertices
+    offsets, neighbours = compact.offsets.tolist(), compact.adjacency.tolist()
+    graph.add_edges([Edge(vertices[v], vertices[w])
+                     for v in range(n) for w in neighbours[offsets[v]:offsets[v + 1]] if v <= w])
+    return graph
@@ -0,0 +1,332 @@
+"""
+This module contains generators of graphs of arbitrary size for which the amount of automorphisms, or the answer to
+the isomorphism problem, is known.
+Graphs are generated as (n, edges, n_automorphisms): the vertices are 0...n-1, the edges are (tail, head) pairs of
+vertices and n_automorphisms is the amount of automorphisms of the graph, or None if it is not known.
+Random generators take a seed, so that the same graph is generated every time.
+"""
+
+from math import factorial
+from random import Random
+from typing import List, Tuple
+
+# A generated graph: the amount of vertices, the edges and the amount of automorphisms (or None if it is not known)
+GeneratedGraph = Tuple[int, List[Tuple[int, int]], int]
+
+
+def relabel(graph: GeneratedGraph, seed: int = 0) -> GeneratedGraph:
+    """
+    :param graph: A generated graph
+    :param seed: The seed of the random permutation
+    :return: The graph with the vertices randomly permuted and the edges shuffled, which is isomorphic to the graph
+    """
+    n, edges, n_automorphisms = graph
+    random = Random(seed)
+    permutation = list(range(n))
+    random.shuffle(permutation)
+    relabeled_edges = [(permutation[u], permutation[v]) for u, v in edges]
+    random.shuffle(relabeled_edges)
+    return n, relabeled_edges, n_automorphisms
+
+
+def cycle(n: int) -> GeneratedGraph:
+    """
+    :param n: The amount of vertices, at least 3
+    :return: The cycle on n vertices
+    """
+    return n, [(v, (v + 1) % n) for v in range(n)], 2 * n
+
+
+def cartesian_product(graph: GeneratedGraph, other: GeneratedGraph) -> GeneratedGraph:
+    """
+    The cartesian product has a vertex (u, v) for every vertex u of the graph and v of the other graph, which is
+    adjacent to (u', v) if u is adjacent to u' and to (u, v') if v is adjacent to v'.
+    The amount of automorphisms is only known for the products that are generated by the other generators.
+    :param graph, other: Generated graphs
+    :return: The cartesian product, vertex (u, v) is u * n_other + v
+    """
+    n, edges, _ = graph
+    n_other, other_edges, _ = other
+    product_edges = []
+    for u, w in edges:
+        for v in range(n_other):
+            product_edges.append((u * n_other + v, w * n_other + v))
+    for u in range(n):
+        for v, w in other_edges:
+            product_edges.append((u * n_other + v, u * n_other + w))
+    return n * n_other, product_edges, None
+
+
+def hypercube(d: int) -> GeneratedGraph:
+    """
+    :param d: The dimension, at least 1
+    :return: The hypercube Q_d, which has 2^d * d! automorphisms
+    """
+    n = 2 ** d
+    edges = [(v, v | 1 << i) for v in range(n) for i in range(d) if not v & 1 << i]
+    return n, edges, 2 ** d * factorial(d)
+
+
+def torus(m: int, n: int) -> GeneratedGraph:
+    """
+    :param m, n: The lengths of the cycles, at least 3
+    :return: The toroidal grid, the cartesian product of the cycles C_m and C_n
+    """
+    n_vertices, edges, _ = cartesian_product(cycle(m), cycle(n))
+    if m == n == 4:
+        # C_4 x C_4 is the hypercube Q_4
+        n_automorphisms = hypercube(4)[2]
+    elif m == n:
+        # The automorphisms of both cycles and swapping the cycles
+        n_automorphisms = 2 * (2 * m) ** 2
+    else:
+        n_automorphisms = 2 * m * 2 * n
+    return n_vertices, edges, n_automorphisms
+
+
+def cube_cycle_product(d: int, m: int) -> GeneratedGraph:
+    """
+    :param d: The dimension of the hypercube
+    :param m: The length of the cycle, at least 3 and not 4 (C_4 is the hypercube Q_2)
+    :return: The cartesian product of the hypercube Q_d and the cycle C_m. Both factors are products of different prime
+    graphs, so the automorphisms are those of the factors: 2^d * d! * 2m
+    """
+    n, edges, _ = cartesian_product(hypercube(d), cycle(m))
+    return n, edges, hypercube(d)[2] * 2 * m
+
+
+def random_regular_graph(n: int, d: int, seed: int = 0) -> GeneratedGraph:
+    """
+    Generates a random d-regular graph with the algorithm of Steger and Wormald: d points are created for every vertex
+    and random pairs of points are matched if they do not create a loop or multiple edge. If no pair can be matched
+    anymore, the generation starts over. Random regular graphs almost always have no other automorphism than the
+    identity, but this is not known for a particular graph.
+    :param n: The amount of vertices
+    :param d: The degree, n * d must be even and d < n
+    :param seed: The seed
+    :return: The random regular graph
+    """
+    if n * d % 2 != 0 or d >= n:
+        raise ValueError('There is no {}-regular graph on {} vertices'.format(d, n))
+
+    random = Random(seed)
+    while True:
+        points = [v for v in range(n) for _ in range(d)]
+        adjacent = [set() for _ in range(n)]
+        edges = []
+        while points:
+            # Try random pairs of points, a limited amount of times before starting over
+            for _ in range(100):
+                i = random.randrange(len(points))
+                j = random.randrange(len(points))
+                u, v = points[i], points[j]
+                if u != v and v not in adjacent[u]:
+                    break
+            else:
+                break
+            adjacent[u].add(v)
+            adjacent[v].add(u)
+            edges.append((u, v))
+            for k in sorted((i, j), reverse=True):
+                points[k] = points[-1]
+                points.pop()
+        if not points:
+            return n, edges, None
+
+
+def cfi_pair(base: GeneratedGraph) -> Tuple[GeneratedGraph, GeneratedGraph]:
+    """
+    Creates the Cai-Fürer-Immerman graphs of a connected base graph, which are not isomorphic, while color refinement
+    (and k-dimensional refinement for small k) does not distinguish them.
+    For every vertex v of degree k there are 2^(k-1) middle vertices, one for every even subset S of the edges of v,
+    and two vertices a(v, e, 0) and a(v, e, 1) for every edge e of v. The middle vertex of S is adjacent to a(v, e, 1) if
+    e is in S and to a(v, e, 0) otherwise. For every edge {u, v} the vertices a(u, e, i) and a(v, e, i) are adjacent in
+    the first graph. In the second graph the first edge is twisted: a(u, e, i) is adjacent to a(v, e, 1 - i).
+    :param base: A connected generated graph without isolated vertices
+    :return: The pair of graphs
+    """
+    n_base, base_edges, _ = base
+    incident = [[] for _ in range(n_base)]
+    for e, (u, v) in enumerate(base_edges):
+        incident[u].append(e)
+        incident[v].append(e)
+
+    n = 0
+    # The vertex a(v, e, 0), a(v, e, 1) is a[(v, e)] and a[(v, e)] + 1
+    a = {}
+    edges = []
+    for v in range(n_base):
+        for e in incident[v]:
+            a[(v, e)] = n
+            n += 2
+        k = len(incident[v])
+        for subset in range(2 ** k):
+            if bin(subset).count('1') % 2 == 0:
+                for i, e in enumerate(incident[v]):
+                    edges.append((n, a[(v, e)] + (subset >> i & 1)))
+                n += 1
+
+    twisted_edges = list(edges)
+    for e, (u, v) in enumerate(base_edges):
+        for i in range(2):
+            edges.append((a[(u, e)] + i, a[(v, e)] + i))
+            twist = 1 if e == 0 else 0
+            twisted_edges.append((a[(u, e)] + i, a[(v, e)] + (i ^ twist)))
+    return (n, edges, None), (n, twisted_edges, None)
+
+
+def random_tree(n: int, seed: int = 0) -> GeneratedGraph:
+    """
+    :param n: The amount of vertices
+    :param seed: The seed
+    :return: A random recursive tree, every vertex is attached to a random earlier vertex
+    """
+    random = Random(seed)
+    edges = [(random.randrange(v), v) for v in range(1, n)]
+    return n, edges, __tree_automorphisms(n, edges)
+
+
+def symmetric_tree(branch_size: int, copies: int, seed: int = 0) -> GeneratedGraph:
+    """
+    Creates a tree with controlled symmetry: a root with 'copies' copies of the same random tree attached to it.
+    :param branch_size: The amount of vertices of the random tree
+    :param copies: The amount of copies, the amount of automorphisms grows with copies!
+    :param seed: The seed of the random tree
+    :return: The tree, vertex 0 is the root
+    """
+    _, branch_edges, _ = random_tree(branch_size, seed)
+    edges = []
+    for i in range(copies):
+        offset = 1 + i * branch_size
+        edges.append((0, offset))
+        edges += [(offset + u, offset + v) for u, v in branch_edges]
+    n = 1 + copies * branch_size
+    return n, edges, __tree_automorphisms(n, edges)
+
+
+def random_cograph(n: int, seed: int = 0) -> GeneratedGraph:
+    """
+    Creates a random cograph from a random cotree. Every inner node of the cotree is the disjoint union or the join of
+    at least two children, and the operations alternate, so the cotree is unique and the automorphisms of the cograph
+    are the automorphisms of the cotree.
+    :param n: The amount of vertices
+    :param seed: The seed
+    :return: The cograph
+    """
+    random = Random(seed)
+    edges = []
+    # The cotree nodes as (vertices, is_join, children), where children are indices of nodes
+    nodes = []
+    # The nodes are created from the root, every node that is created is split later
+    stack = [(list(range(n)), random.random() < 0.5, None)]
+    while stack:
+        vertices, is_join, parent = stack.pop()
+        node = len(nodes)
+        nodes.append((vertices, is_join, []))
+        if parent is not None:
+            nodes[parent][2].append(node)
+        if len(vertices) == 1:
+            continue
+
+        # Split the vertices in at least two random parts
+        k = random.randint(2, min(len(vertices), 4))
+        cuts = sorted(random.sample(range(1, len(vertices)), k - 1))
+        parts = [vertices[i:j] for i, j in zip([0] + cuts, cuts + [len(vertices)])]
+        if is_join:
+            for i in range(len(parts)):
+                for j in range(i + 1, len(parts)):
+                    edges += [(u, v) for u in parts[i] for v in parts[j]]
+        for part in parts:
+            stack.append((part, not is_join, node))
+
+    # The children of a node are created after it, so the nodes are handled in reverse order
+    names = {}
+    name = [0] * len(nodes)
+    n_automorphisms = [1] * len(nodes)
+    for node in range(len(nodes) - 1, -1, -1):
+        vertices, is_join, children = nodes[node]
+        if not children:
+            name[node] = names.setdefault(('leaf',), len(names))
+            continue
+        name[node], n_automorphisms[node] = __combine(names, is_join, children, name, n_automorphisms)
+    return n, edges, n_automorphisms[0]
+
+
+def __tree_automorphisms(n: int, edges: List[Tuple[int, int]]) -> int:
+    """
+    Counts the automorphisms of a tree by rooting it in its center. If the center is an edge, both halves are rooted in
+    their end of the edge, and they can be swapped if they are isomorphic.
+    :param n: The amount of vertices
+    :param edges: The edges of the tree
+    :return: The amount of automorphisms
+    """
+    neighbours = [[] for _ in range(n)]
+    for u, v in edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+
+    # Peel off the leaves until one or two vertices are left
+    degree = [len(neighbours[v]) for v in range(n)]
+    leaves = [v for v in range(n) if degree[v] <= 1]
+    remaining = n
+    while remaining > 2:
+        remaining -= len(leaves)
+        next_leaves = []
+        for v in leaves:
+            for w in neighbours[v]:
+                degree[w] -= 1
+                if degree[w] == 1:
+                    next_leaves.append(w)
+        leaves = next_leaves
+    centers = leaves
+
+    # Name the rooted subtrees from the bottom up, the root halves are not each others children
+    parent = [None] * n
+    order = list(centers)
+    for v in centers:
+        parent[v] = v
+    for v in order:
+        for w in neighbours[v]:
+            if parent[w] is None:
+                parent[w] = v
+                order.append(w)
+    children = [[] for _ in range(n)]
+    for v in order:
+        if parent[v] != v:
+            children[parent[v]].append(v)
+
+    names = {}
+    name = [0] * n
+    n_automorphisms = [1] * n
+    for v in reversed(order):
+        name[v], n_automorphisms[v] = __combine(names, False, children[v], name, n_automorphisms)
+
+    total = 1
+    for v in centers:
+        total *= n_automorphisms[v]
+    if len(centers) == 2 and name[centers[0]] == name[centers[1]]:
+        total *= 2
+    return total
+
+
+def __combine(names, label, children, name, n_automorphisms):
+    """
+    Names a node of a tree after the names of its children and counts its automorphisms: the automorphisms of the
+    children, and all permutations of children with the same name.
+    :param names: The names that have been given, by sorted tuple of the label and the names of the children
+    :param label: The label of the node, which is part of the name
+    :param children: The children of the node
+    :param name: The name of every node, which is set for the children
+    :param n_automorphisms: The amount of automorphisms of every node, which is set for the children
+    :return: The name and the amount of automorphisms of the node
+    """
+    child_names = sorted(name[c] for c in children)
+    n = 1
+    for c in children:
+        n *= n_automorphisms[c]
+    multiplicity = {}
+    for child_name in child_names:
+        multiplicity[child_name] = multiplicity.get(child_name, 0) + 1
+    for count in multiplicity.values():
+        n *= factorial(count)
+    return names.setdefault((label, tuple(child_names)), len(names)), n
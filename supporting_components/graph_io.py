@@ -9,14 +9,24 @@ Includes functions for reading and writing graphs, in a very simple readable for
 # updated 5-2-2015: no black fill color used, when more than numcolors**2 vertices.
 # updated 29-1-2017: pep8 reformat, general improvements
 
+import re
 import sys
-from typing import IO, Tuple, List, Union
+from typing import IO, Tuple, List, Union, Iterator
 
 from supporting_components.graph import Graph, Vertex, Edge
+from supporting_components.compact_graph import CompactGraph
 
 DEFAULT_COLOR_SCHEME = "paired12"
 NUM_COLORS = 12
 
+# The line that separates the graphs of a list
+SEPARATOR = re.compile('^-', re.MULTILINE)
+
+# The optional headers of graph6 and sparse6 files, and the bits of the value of a graph6/sparse6 character
+GRAPH6_HEADER = '>>graph6<<'
+SPARSE6_HEADER = '>>sparse6<<'
+SIX_BITS = [format(i, '06b') for i in range(64)]
+
 
 def read_line(f: IO[str]) -> str:
     """
@@ -65,13 +75,11 @@ def read_graph(graphclass, f: IO[str]) -> Tuple[Graph, List[str], bool]:
             else:
                 edges.append((int(line[:comma]), int(line[comma + 1:]), None))
             line = read_line(f)
-    except Exception:
+    except ValueError:
         pass
 
-    indexed_nodes = list(graph.vertices)
-
-    for edge in edges:
-        graph += Edge(indexed_nodes[edge[0]], indexed_nodes[edge[1]], edge[2])
+    indexed_nodes = graph.vertices
+    graph.add_edges([Edge(indexed_nodes[edge[0]], indexed_nodes[edge[1]], edge[2]) for edge in edges])
 
     if line != '' and line[0] == '-':
         return graph, options, True
@@ -79,6 +87,71 @@ def read_graph(graphclass, f: IO[str]) -> Tuple[Graph, List[str], bool]:
         return graph, options, False
 
 
+def read_graphs(graph_class, f: IO[str]) -> Iterator[Tuple[Graph, List[str]]]:
+    """
+    Read the graphs from a file one at a time. The file is read at once and split into the parts of the graphs, and the
+    edge list of a graph is split in one pass, so that this takes linear time.
+    :param graph_class: The graph class
+    :param f: The file
+    :return: A generator of the graphs with the options that are given before them
+    """
+    text = f.read()
+
+    start = 0
+    while True:
+        # Every graph but the last one is followed by a line starting with '-'
+        separator = SEPARATOR.search(text, start)
+        end = separator.start() if separator else len(text)
+        yield __parse_graph(graph_class, text[start:end])
+        if separator is None:
+            return
+        start = text.find('\n', end) + 1
+        if start == 0:
+            return
+
+
+def __parse_graph(graph_class, text: str) -> Tuple[Graph, List[str]]:
+    """
+    Parses the part of a file with one graph: the options, the amount of vertices and the edge list.
+    :return: The graph and the options before it
+    """
+    lines = [line for line in text.split('\n') if len(line) == 0 or line[0] != '#']
+
+    options = []
+    for i, line in enumerate(lines):
+        try:
+            n = int(line)
+            break
+        except ValueError:
+            options.append(line)
+    else:
+        raise ValueError('The amount of vertices of a graph is missing')
+
+    # The edge list ends at the first line that is not an edge
+    edge_lines = lines[i + 1:]
+    for j, line in enumerate(edge_lines):
+        if ',' not in line:
+            edge_lines = edge_lines[:j]
+            break
+
+    graph = graph_class(directed=False, n=n)
+    vertices = graph.vertices
+    if any(':' in line for line in edge_lines):
+        edges = []
+        for line in edge_lines:
+            pair, _, weight = line.partition(':')
+            tail, head = pair.split(',')
+            edges.append(Edge(vertices[int(tail)], vertices[int(head)], int(weight) if weight else None))
+    else:
+        ends = list(map(int, ','.join(edge_lines).split(','))) if edge_lines else []
+        if len(ends) != 2 * len(edge_lines):
+            raise ValueError('An edge does not consist of two vertices')
+        edges = [Edge(vertices[tail], vertices[head]) for tail, head in zip(ends[0::2], ends[1::2])]
+    graph.add_edges(edges)
+
+    return graph, options
+
+
 def read_graph_list(graph_class, f: IO[str]) -> Tuple[List[Graph], List[str]]:
     """
     Read a list of graphs from a file
@@ -88,10 +161,8 @@ def read_graph_list(graph_class, f: IO[str]) -> Tuple[List[Graph], List[str]]:
     """
     options = []
     graphs = []
-    cont = True
 
-    while cont:
-        graph, new_options, cont = read_graph(graph_class, f)
+    for graph, new_options in read_graphs(graph_class, f):
         options += new_options
         graphs.append(graph)
 
@@ -110,7 +181,7 @@ def load_graph(f: IO[str], graph_class=Graph, read_list: bool = False) -> Union[
         graph_list, options = read_graph_list(graph_class, f)
         return graph_list, options
     else:
-        graph, options, tmp = read_graph(graph_class, f)
+        graph, options = next(read_graphs(graph_class, f))
         return graph  # ,options
 
 
@@ -169,6 +240,31 @@ def write_graph_list(graph_list: List[Graph], f: IO[str], options=[]):
             write_line(f, '--- Next graph:')
 
 
+def write_edge_lists(graph_list: List[Tuple[int, List[Tuple[int, int]]]], f: IO[str], options=[]):
+    """
+    Write a list of graphs that are given as edge lists to a file, in the same format as `write_graph_list`, without
+    creating Graph objects.
+    :param graph_list: The list of graphs as (n, edges), the vertices are 0...n-1 and the edges are (tail, head) pairs
+    :param f: the file
+    :param options: the (optional) options to write to the file.
+    """
+    # we may only write options that cannot be seen as an integer:
+    for S in options:
+        try:
+            int(S)
+        except ValueError:
+            write_line(f, str(S))
+
+    for i, (n, edges) in enumerate(graph_list):
+        write_line(f, '# Number of vertices:')
+        write_line(f, str(n))
+        write_line(f, '# Edge list:')
+        f.write(''.join(str(tail) + ',' + str(head) + '\n' for tail, head in edges))
+
+        if i + 1 < len(graph_list):
+            write_line(f, '--- Next graph:')
+
+
 def save_graph(graph_list: Union[Graph, List[Graph]], f: IO[str], options=[]):
     """
     Write a graph, or a list of graphs to a file.
@@ -194,6 +290,216 @@ def print_graph(graph_list: Union[Graph, List[Graph]], options=[]):
         write_graph_list([graph_list], sys.stdout, options)
 
 
+def read_graph6(f: IO[str]) -> Iterator[CompactGraph]:
+    """
+    Read graphs in graph6 or sparse6 format from a file, one graph per line, straight into compact graphs. Lines that
+    start with ':' are sparse6, the others graph6. The optional headers '>>graph6<<' and '>>sparse6<<' are skipped.
+    :param f: The file
+    :return: A generator of the compact graphs
+    """
+    for line in f:
+        line = line.strip()
+        for header in (GRAPH6_HEADER, SPARSE6_HEADER):
+            if line.startswith(header):
+                line = line[len(header):]
+        if len(line) == 0:
+            continue
+        if line[0] == ':':
+            yield parse_sparse6(line)
+        else:
+            yield parse_graph6(line)
+
+
+def load_graph6(f: IO[str], read_list: bool = False) -> Union[List[CompactGraph], CompactGraph]:
+    """
+    Load a graph from a file in graph6 or sparse6 format
+    :param f: The file
+    :param read_list: Specifies whether to read a list of graphs from the file, or just a single graph.
+    :return: The compact graph, or a list of compact graphs.
+    """
+    if read_list:
+        return list(read_graph6(f))
+    else:
+        return next(read_graph6(f))
+
+
+def parse_graph6(line: str) -> CompactGraph:
+    """
+    Parses a graph in graph6 format: the amount of vertices followed by the upper triangle of the adjacency matrix
+    column by column, 6 bits per character.
+    :param line: The graph6 string, without header and line end
+    :return: The compact graph
+    """
+    n, position = __decode_size(line, 0)
+    bits = __decode_bits(line[position:])
+    if len(bits) < n * (n - 1) // 2:
+        raise ValueError('The graph6 string is too short for {} vertices'.format(n))
+
+    # Bit j * (j - 1) / 2 + i is the edge {i, j} with i < j
+    edges = []
+    j, column = 1, 0
+    p = bits.find('1')
+    while p != -1 and p < n * (n - 1) // 2:
+        while p >= column + j:
+            column += j
+            j += 1
+        edges.append((p - column, j))
+        p = bits.find('1', p + 1)
+    return CompactGraph(n, edges)
+
+
+def parse_sparse6(line: str) -> CompactGraph:
+    """
+    Parses a graph in sparse6 format: ':', the amount of vertices and a sequence of (b, x) pairs of 1 and k bits, where
+    b = 1 moves to the next vertex v, x > v moves to vertex x and x <= v is the edge {x, v}.
+    :param line: The sparse6 string, without header and line end
+    :return: The compact graph, which can have loops and multiple edges
+    """
+    if line[0] != ':':
+        raise ValueError('A sparse6 string starts with \':\'')
+    n, position = __decode_size(line, 1)
+    k = __sparse6_width(n)
+    bits = __decode_bits(line[position:])
+
+    edges = []
+    v = 0
+    # The last bits are padding if there are not enough bits for a (b, x) pair
+    for p in range(0, len(bits) - k, k + 1):
+        if bits[p] == '1':
+            v += 1
+        x = int(bits[p + 1:p + 1 + k], 2) if k > 0 else 0
+        if x >= n or v >= n:
+            break
+        elif x > v:
+            v = x
+        else:
+            edges.append((x, v))
+    return CompactGraph(n, edges)
+
+
+def format_graph6(G: Union[Graph, CompactGraph]) -> str:
+    """
+    :param G: The graph, which must not have loops or multiple edges
+    :return: The graph6 string of the graph, with vertex i the i-th vertex of the graph
+    """
+    if isinstance(G, Graph):
+        G = CompactGraph.from_graph(G)
+    n = len(G)
+    bits = bytearray(n * (n - 1) // 2)
+    for i, j in G.edges:
+        if i == j or bits[j * (j - 1) // 2 + i]:
+            raise ValueError('The graph6 format does not support loops and multiple edges')
+        bits[j * (j - 1) // 2 + i] = 1
+    return __encode_size(n) + __encode_bits(bits)
+
+
+def format_sparse6(G: Union[Graph, CompactGraph]) -> str:
+    """
+    :param G: The graph
+    :return: The sparse6 string of the graph, with vertex i the i-th vertex of the graph
+    """
+    if isinstance(G, Graph):
+        G = CompactGraph.from_graph(G)
+    n = len(G)
+    k = __sparse6_width(n)
+
+    bits = bytearray()
+
+    def add(b, x):
+        bits.append(b)
+        bits.extend((x >> (k - 1 - i)) & 1 for i in range(k))
+
+    v = 0
+    for w, u in sorted((max(e), min(e)) for e in G.edges):
+        if w == v:
+            add(0, u)
+        elif w == v + 1:
+            v += 1
+            add(1, u)
+        else:
+            v = w
+            add(1, w)
+            add(0, u)
+
+    # The padding must not be read as a pair that adds an edge. If n = 2^k, the last edge is at vertex n - 2 and the
+    # padding is long enough for a pair (k + 1 bits), 1 bits would move to vertex n - 1 and add the loop
+    # {n - 1, n - 1}, so the padding starts with a 0 bit. This is the encoding of nauty, in all other cases the padding
+    # only consists of 1 bits.
+    padding = -len(bits) % 6
+    if k < 6 and n == 1 << k and padding >= k + 1 and v == n - 2:
+        bits.append(0)
+        padding -= 1
+    bits.extend([1] * padding)
+    return ':' + __encode_size(n) + __encode_bits(bits)
+
+
+def write_graph6(graph_list: List[Union[Graph, CompactGraph]], f: IO[str], sparse: bool = False,
+                 header: bool = False):
+    """
+    Write graphs to a file in graph6 or sparse6 format, one graph per line
+    :param graph_list: The list of graphs
+    :param f: The file
+    :param sparse: Whether the sparse6 format is used
+    :param header: Whether the header '>>graph6<<' or '>>sparse6<<' is written before the first graph
+    """
+    if header:
+        f.write(SPARSE6_HEADER if sparse else GRAPH6_HEADER)
+    for G in graph_list:
+        write_line(f, format_sparse6(G) if sparse else format_graph6(G))
+
+
+def __sparse6_width(n: int) -> int:
+    """
+    :return: The amount of bits k of a vertex in sparse6, the amount of bits needed for n - 1 (at least 1)
+    """
+    k = 1
+    while 1 << k < n:
+        k += 1
+    return k
+
+
+def __decode_size(line: str, position: int) -> Tuple[int, int]:
+    """
+    Decodes the amount of vertices of a graph6 or sparse6 string: 1 character up to 62, otherwise '~' and 3 characters
+    up to 258047, otherwise '~~' and 6 characters.
+    :return: The amount of vertices and the position after it
+    """
+    if line[position] != '~':
+        return ord(line[position]) - 63, position + 1
+    if line[position + 1] != '~':
+        return int(__decode_bits(line[position + 1:position + 4]), 2), position + 4
+    return int(__decode_bits(line[position + 2:position + 8]), 2), position + 8
+
+
+def __encode_size(n: int) -> str:
+    """
+    :return: The amount of vertices n encoded like in `__decode_size`
+    """
+    if n <= 62:
+        return chr(n + 63)
+    if n <= 258047:
+        return '~' + ''.join(chr((n >> shift & 63) + 63) for shift in (12, 6, 0))
+    return '~~' + ''.join(chr((n >> shift & 63) + 63) for shift in (30, 24, 18, 12, 6, 0))
+
+
+def __decode_bits(data: str) -> str:
+    """
+    :return: The bits of the characters, 6 per character, as string of '0' and '1'
+    """
+    if any(not 63 <= ord(c) <= 126 for c in data):
+        raise ValueError('Invalid character in graph6/sparse6 string')
+    return ''.join(SIX_BITS[ord(c) - 63] for c in data)
+
+
+def __encode_bits(bits: bytearray) -> str:
+    """
+    :return: The bits (0 or 1 each), padded with 0 bits to a multiple of 6, as characters of 6 bits
+    """
+    bits = bits + bytearray(-len(bits) % 6)
+    return ''.join(chr((bits[i] << 5 | bits[i + 1] << 4 | bits[i + 2] << 3 | bits[i + 3] << 2 | bits[i + 4] << 1 |
+                        bits[i + 5]) + 63) for i in range(0, len(bits), 6))
+
+
 def write_dot(graph: Graph, f: IO[str], directed=False):
     """
     Writes a given graph to a file in .dot format.
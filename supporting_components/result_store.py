@@ -0,0 +1,214 @@
+"""
+This module contains a store on disk of the results of earlier runs, so that graphs that are evaluated again do not
+have to be searched again.
+A preprocessed graph is identified by its fingerprint, the hash of its edges and the properties of its vertices that
+preprocessing sets, which is the same in every run on the same file. For every fingerprint the store holds the hash of
+its certificate (see canonical_labeling), the amount of automorphisms with the generators of the automorphism group
+and the results of comparisons with other graphs. Graphs with the same certificate are isomorphic,
+so the amount of automorphisms of a graph can also be found with the certificate of an isomorphic graph.
+All results are stored with the version of the code and settings that computed them (see code_version), and only
+results of the same version are used, so results of changed code are computed again.
+The store is an SQLite database, which can be used by several processes at the same time.
+"""
+
+from array import array
+from hashlib import sha1
+from typing import List, Optional, Tuple
+import json
+import os
+import sqlite3
+
+from supporting_components.compact_graph import CompactGraph
+
+# The layout of the tables, stores with an other layout are emptied when they are opened
+SCHEMA_VERSION = 4
+
+TABLES = [
+    'CREATE TABLE IF NOT EXISTS certificates (version TEXT, fingerprint TEXT, max_nodes INTEGER, certificate TEXT, '
+    'PRIMARY KEY (version, fingerprint))',
+    'CREATE INDEX IF NOT EXISTS certificates_certificate ON certificates (version, certificate)',
+    'CREATE TABLE IF NOT EXISTS automorphisms (version TEXT, fingerprint TEXT, amount TEXT, generators TEXT, '
+    'PRIMARY KEY (version, fingerprint))',
+    'CREATE TABLE IF NOT EXISTS isomorphisms (version TEXT, fingerprint TEXT, other_fingerprint TEXT, '
+    'isomorphic INTEGER, PRIMARY KEY (version, fingerprint, other_fingerprint))',
+]
+
+
+def fingerprint(G: 'CompactGraph') -> str:
+    """
+    :param G: The preprocessed (compact) graph
+    :return: The hash of the sorted edges of the graph and the degree_fixed, n_twins and pendant_trees of its vertices,
+    which does not depend on the order of the neighbours in the adjacency arrays
+    """
+    if not isinstance(G, CompactGraph):
+        G = CompactGraph.from_graph(G)
+    h = sha1()
+    h.update(len(G).to_bytes(8, 'little'))
+    h.update(array('i', [v for edge in sorted(G.edges) for v in edge]).tobytes())
+    h.update(repr((G.degree_fixed, G.n_twins, G.pendant_trees)).encode())
+    return h.hexdigest()
+
+
+def code_version(paths: List[str], settings=()) -> str:
+    """
+    :param paths: The Python files, and directories of which all Python files are used, that compute the results
+    :param settings: The settings that the results depend on
+    :return: The hash of the source code and the settings, which changes with every change of the code that computes
+    the results
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.py'))
+        else:
+            files.append(path)
+    h = sha1()
+    for file in files:
+        with open(file, 'rb') as f:
+            h.update(os.path.basename(file).encode())
+            h.update(f.read())
+    h.update(repr(settings).encode())
+    return h.hexdigest()
+
+
+def certificate_hash(certificate) -> str:
+    """
+    :param certificate: A certificate of canonical_labeling or tree_certificate
+    :return: The hash of the certificate
+    """
+    return sha1(repr(certificate).encode()).hexdigest()
+
+
+class ResultStore(object):
+    """
+    `ResultStore` objects are connections to the store of results in a file. A connection can only be used by the
+    process that opened it, so every worker process opens its own (`pid`). A connection only reads and writes the
+    results of its `version`.
+    """
+
+    def __init__(self, path: str, version: str = ''):
+        """
+        Opens the store, which is created if it does not exist yet.
+        :param path: The path of the database file
+        :param version: The version of the code that computes the results, see code_version
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.version = version
+        self.pid = os.getpid()
+        self._connection = sqlite3.connect(path, timeout=60)
+        with self._connection as connection:
+            if connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                for table in ['certificates', 'automorphisms', 'isomorphisms']:
+                    connection.execute('DROP TABLE IF EXISTS ' + table)
+                connection.execute('PRAGMA user_version = ' + str(SCHEMA_VERSION))
+            for table in TABLES:
+                connection.execute(table)
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the ResultStore.
+        :return: The string to approximate the constructor arguments of the `ResultStore'
+        """
+        return 'ResultStore(path={}, version={})'.format(self.path, self.version)
+
+    def close(self):
+        """
+        Closes the connection to the store.
+        """
+        self._connection.close()
+
+    def certificate(self, key: str, max_nodes: int = None) -> Tuple[bool, Optional[str]]:
+        """
+        :param key: The fingerprint of the graph
+        :param max_nodes: The maximal amount of nodes of the search for the certificate, or None if there is no maximum
+        :return: Whether the result of the search is stored, and the hash of the certificate, which is None if the
+        search was stopped after at least max_nodes nodes
+        """
+        row = self._connection.execute('SELECT max_nodes, certificate FROM certificates WHERE version = ? AND '
+                                       'fingerprint = ?', (self.version, key)).fetchone()
+        if row is None:
+            return False, None
+        stored_max_nodes, certificate = row
+        if certificate is None and (max_nodes is None or max_nodes > stored_max_nodes):
+            # The search was stopped earlier than it would be now
+            return False, None
+        return True, certificate
+
+    def add_certificate(self, key: str, certificate: Optional[str], max_nodes: int = None):
+        """
+        :param key: The fingerprint of the graph
+        :param certificate: The hash of the certificate, or None if the search was stopped
+        :param max_nodes: The maximal amount of nodes of the search
+        """
+        with self._connection as connection:
+            connection.execute('INSERT OR REPLACE INTO certificates VALUES (?, ?, ?, ?)',
+                               (self.version, key, max_nodes, certificate))
+
+    def automorphisms(self, key: str) -> Optional[Tuple[int, Optional[List[List[int]]]]]:
+        """
+        :param key: The fingerprint of the graph
+        :return: The amount of automorphisms of the graph and the generators of its automorphism group (None if they
+        are not known), or None if the amount is not stored. If only the amount of an isomorphic graph is stored, there
+        are no generators.
+        """
+        row = self._connection.execute('SELECT amount, generators FROM automorphisms WHERE version = ? AND '
+                                       'fingerprint = ?', (self.version, key)).fetchone()
+        if row is not None:
+            amount, generators = row
+            return int(amount), json.loads(generators) if generators is not None else None
+
+        row = self._connection.execute('SELECT automorphisms.amount FROM certificates AS graph '
+                                       'JOIN certificates AS other ON graph.version = other.version AND '
+                                       'graph.certificate = other.certificate '
+                                       'JOIN automorphisms ON other.version = automorphisms.version AND '
+                                       'other.fingerprint = automorphisms.fingerprint '
+                                       'WHERE graph.version = ? AND graph.fingerprint = ? LIMIT 1',
+                                       (self.version, key)).fetchone()
+        if row is not None:
+            return int(row[0]), None
+        return None
+
+    def add_automorphisms(self, key: str, amount: int, generators: List[List[int]] = None):
+        """
+        :param key: The fingerprint of the graph
+        :param amount: The amount of automorphisms, which is stored as text because it can be larger than 64 bits
+        :param generators: Optional, the generators of the automorphism group, as mappings of the vertices
+        """
+        with self._connection as connection:
+            connection.execute('INSERT OR REPLACE INTO automorphisms VALUES (?, ?, ?, ?)',
+                               (self.version, key, str(amount),
+                                json.dumps(generators) if generators is not None else None))
+
+    def isomorphic(self, key: str, other_key: str) -> Optional[bool]:
+        """
+        :param key, other_key: The fingerprints of two graphs
+        :return: Whether the graphs are isomorphic, or None if it is not known. It is known if the result of comparing
+        them is stored, or if both have a stored certificate.
+        """
+        if key == other_key:
+            return True
+        key, other_key = min(key, other_key), max(key, other_key)
+        row = self._connection.execute('SELECT isomorphic FROM isomorphisms WHERE version = ? AND fingerprint = ? AND '
+                                       'other_fingerprint = ?', (self.version, key, other_key)).fetchone()
+        if row is not None:
+            return bool(row[0])
+
+        certificates = self._connection.execute('SELECT certificate FROM certificates WHERE version = ? AND '
+                                                'fingerprint IN (?, ?) AND certificate IS NOT NULL',
+                                                (self.version, key, other_key)).fetchall()
+        if len(certificates) == 2:
+            return certificates[0][0] == certificates[1][0]
+        return None
+
+    def add_isomorphic(self, key: str, other_key: str, isomorphic: bool):
+        """
+        :param key, other_key: The fingerprints of two graphs
+        :param isomorphic: Whether the graphs are isomorphic
+        """
+        key, other_key = min(key, other_key), max(key, other_key)
+        with self._connection as connection:
+            connection.execute('INSERT OR REPLACE INTO isomorphisms VALUES (?, ?, ?, ?)',
+                               (self.version, key, other_key, int(isomorphic)))
@@ -0,0 +1,192 @@
+"""
+This module contains a stabilizer chain for permutation groups, which is built with the Schreier-Sims algorithm.
+The chain consists of a base b_0...b_k-1 and a strong generating set: the generators that fix b_0...b_i-1 generate the
+pointwise stabilizer of b_0...b_i-1. For every base point the orbit under these generators is stored with a transversal.
+The order of the group is the product of the lengths of these basic orbits.
+The base can be given in advance with `extend_base`, so that a search that fixes points in that order can ask which
+points are already known to be equivalent under the stabilizer of the points it has fixed (`in_basic_orbit`).
+"""
+
+from typing import List, Tuple
+
+from supporting_components.permv2 import permutation
+
+
+class StabilizerChain(object):
+    """
+    `StabilizerChain` objects represent the group generated by the permutations that are added with `add_generator`.
+    Permutations are stored as lists with the image of every element, transversal elements are stored together with
+    their inverse.
+    A new generator is first sifted through the chain. If it is already in the group, the chain is not changed.
+    Otherwise the remainder is added to the strong generating set and all new Schreier generators are sifted as well, so
+    the chain stays complete after every generator that is added.
+    """
+
+    def __init__(self, n: int):
+        """
+        Creates the stabilizer chain of the trivial group.
+        :param n: The number of elements the permutations act on, the elements are 0...n-1
+        """
+        self._n = n
+        self._identity = list(range(n))
+        self.base = []
+        # The strong generators that fix the first i base points, for every level i
+        self._generators = []
+        # The basic orbit of every level in order of discovery, the transversal maps an orbit point to the pair
+        # (u, u^-1) with u mapping the base point to the orbit point
+        self._orbits = []
+        self._transversals = []
+        # For every orbit point the amount of generators of that level it has been checked with
+        self._checked = []
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the StabilizerChain.
+        :return: The string to approximate the constructor arguments of the `StabilizerChain'
+        """
+        return 'StabilizerChain(n={}, base={})'.format(self._n, self.base)
+
+    def __len__(self) -> int:
+        """
+        :return: The number of base points
+        """
+        return len(self.base)
+
+    @property
+    def strong_generators(self) -> List[List[int]]:
+        """
+        :return: The strong generating set of the group, the generators of all levels
+        """
+        strong_generators = []
+        for generators in self._generators:
+            for g in generators:
+                if not any(g is h for h in strong_generators):
+                    strong_generators.append(g)
+        return strong_generators
+
+    def order(self) -> int:
+        """
+        :return: The order of the group, the product of the lengths of the basic orbits
+        """
+        order = 1
+        for orbit in self._orbits:
+            order *= len(orbit)
+        return order
+
+    def extend_base(self, point: int) -> int:
+        """
+        Adds a point at the end of the base, if it is not a base point yet. The chain is complete, so the stabilizer of
+        all base points is trivial and the basic orbit of the new base point only contains the point itself.
+        :param point: An element of 0...n-1
+        :return: The level of the point in the base
+        """
+        if point in self.base:
+            return self.base.index(point)
+        self.base.append(point)
+        self._generators.append([])
+        self._orbits.append([point])
+        self._transversals.append({point: (self._identity, self._identity)})
+        self._checked.append([0])
+        return len(self.base) - 1
+
+    def in_basic_orbit(self, level: int, point: int) -> bool:
+        """
+        :param level: A level of the chain
+        :param point: An element of 0...n-1
+        :return: Whether an element of the group that fixes the base points before `level` maps the base point of
+        `level` to the point
+        """
+        return point in self._transversals[level]
+
+    def contains(self, P: "permutation") -> bool:
+        """
+        :param P: A permutation on 0...n-1
+        :return: Whether the permutation is an element of the group
+        """
+        residue, _ = self._sift(P.P, 0)
+        return residue == self._identity
+
+    def add_generator(self, P: "permutation") -> bool:
+        """
+        Adds a permutation to the generators of the group.
+        :param P: A permutation on 0...n-1
+        :return: Whether the group has become larger, False if the permutation was already an element of the group
+        """
+        residue, level = self._sift(P.P, 0)
+        if residue == self._identity:
+            return False
+        self._add(residue, level, 0)
+        return True
+
+    def _sift(self, g: List[int], level: int) -> Tuple[List[int], int]:
+        """
+        For internal use only; divides a permutation by transversal elements, starting at `level`.
+        :param g: The permutation, which fixes the base points before `level`
+        :param level: The first level to sift through
+        :return: The residue and the level at which it could not be sifted further. The residue fixes all base points
+        before that level and is the identity if the permutation is an element of the group.
+        """
+        for i in range(level, len(self.base)):
+            image = g[self.base[i]]
+            if image not in self._transversals[i]:
+                return g, i
+            _, u_inverse = self._transversals[i][image]
+            g = [u_inverse[x] for x in g]
+        return g, len(self.base)
+
+    def _add(self, g: List[int], level: int, top: int):
+        """
+        For internal use only; adds a permutation that fixes the base points before `level`, but is not in the
+        stabilizer at `level`, to the strong generating set. Afterwards the levels `level` up to `top` are completed
+        again, because the new generator is in all of their stabilizers.
+        :param g: The permutation
+        :param level: The level of the permutation
+        :param top: The highest level that has to be completed
+        """
+        if level == len(self.base):
+            # The permutation fixes all base points, so a point it moves becomes a new base point
+            self.extend_base(next(x for x in self._identity if g[x] != x))
+
+        for i in range(top, level + 1):
+            self._generators[i].append(g)
+        for i in range(level, top - 1, -1):
+            self._complete(i)
+
+    def _complete(self, level: int):
+        """
+        For internal use only; extends the basic orbit of `level` and sifts the Schreier generators of all pairs of an
+        orbit point and a generator that have not been checked yet. A Schreier generator that is not in the group yet
+        is added to the strong generating set of a lower level.
+        :param level: The level to complete
+        """
+        generators = self._generators[level]
+        orbit = self._orbits[level]
+        transversal = self._transversals[level]
+        checked = self._checked[level]
+
+        i = 0
+        while i < len(orbit):
+            # The list of generators can grow while checking, if Schreier generators are added at lower levels
+            while checked[i] < len(generators):
+                s = generators[checked[i]]
+                checked[i] += 1
+                u, _ = transversal[orbit[i]]
+                image = s[orbit[i]]
+                if image not in transversal:
+                    # The orbit is extended with the image, its transversal element is s * u
+                    su = [s[x] for x in u]
+                    su_inverse = [0] * self._n
+                    for x in self._identity:
+                        su_inverse[su[x]] = x
+                    transversal[image] = (su, su_inverse)
+                    orbit.append(image)
+                    checked.append(0)
+                    continue
+
+                # The Schreier generator u_image^-1 * s * u fixes the base point of this level
+                _, u_image_inverse = transversal[image]
+                schreier_generator = [u_image_inverse[s[x]] for x in u]
+                residue, residue_level = self._sift(schreier_generator, level + 1)
+                if residue != self._identity:
+                    self._add(residue, residue_level, level + 1)
+            i += 1
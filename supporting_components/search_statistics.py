@@ -0,0 +1,91 @@
+"""
+This module contains a collector of statistics of the search for isomorphisms, which can be passed to the branching and
+color refinement methods to see where the time of a search goes.
+"""
+
+from typing import Dict
+
+
+class SearchStatistics(object):
+    """
+    `SearchStatistics` objects count the work that is done in a search: the nodes of the search tree per depth, the
+    leaves (bijected nodes), the dead ends (unbalanced nodes), the branches that are pruned without searching them and
+    the work of color refinement. The time spent in every stage of the search is added up as well.
+    The branching methods change `depth` while descending in the search tree, so that nodes are counted per depth.
+    """
+
+    def __init__(self, depth: int = 0):
+        """
+        Creates an empty collector.
+        :param depth: The depth of the first node that is counted
+        """
+        self.depth = depth
+        self.nodes = []
+        self.leaves = 0
+        self.dead_ends = 0
+        self.pruned = 0
+        self.refinements = 0
+        self.refinement_rounds = 0
+        self.cells_split = 0
+        self.queue_pushes = 0
+        self.times = {}
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the SearchStatistics.
+        :return: The string with the amount of nodes and leaves of the `SearchStatistics'
+        """
+        return 'SearchStatistics(#nodes={}, #leaves={})'.format(sum(self.nodes), self.leaves)
+
+    def node(self):
+        """
+        Counts a node of the search tree at the current depth.
+        """
+        while len(self.nodes) <= self.depth:
+            self.nodes.append(0)
+        self.nodes[self.depth] += 1
+
+    def add_time(self, stage: str, seconds: float):
+        """
+        Adds the time spent in a stage of the search.
+        :param stage: The name of the stage
+        :param seconds: The time in seconds
+        """
+        self.times[stage] = self.times.get(stage, 0.0) + seconds
+
+    def merge(self, other: "SearchStatistics"):
+        """
+        Adds the statistics of another collector, for example of a part of the search that is done in another process.
+        :param other: The other collector, of which the depths are counted from the same root. Its times are added to
+        the times of this collector, so they can add up to more than the wall time if the processes run at the same time.
+        """
+        while len(self.nodes) < len(other.nodes):
+            self.nodes.append(0)
+        for depth, nodes in enumerate(other.nodes):
+            self.nodes[depth] += nodes
+        self.leaves += other.leaves
+        self.dead_ends += other.dead_ends
+        self.pruned += other.pruned
+        self.refinements += other.refinements
+        self.refinement_rounds += other.refinement_rounds
+        self.cells_split += other.cells_split
+        self.queue_pushes += other.queue_pushes
+        for stage, seconds in other.times.items():
+            self.add_time(stage, seconds)
+
+    def to_dict(self) -> Dict:
+        """
+        :return: The statistics as a dictionary that can be written as JSON
+        """
+        return {
+            'nodes': sum(self.nodes),
+            'nodes_per_depth': list(self.nodes),
+            'leaves': self.leaves,
+            'dead_ends': self.dead_ends,
+            'pruned': self.pruned,
+            'refinements': self.refinements,
+            'refinement_rounds': self.refinement_rounds,
+            'cells_split': self.cells_split,
+            'queue_pushes': self.queue_pushes,
+            'times': dict(self.times)
+        }
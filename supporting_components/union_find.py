@@ -0,0 +1,70 @@
+"""
+This module contains a union-find (disjoint set) structure on the elements 0...n-1, which is used to keep track of the
+classes of isomorphic graphs.
+"""
+
+from typing import List
+
+
+class UnionFind(object):
+    """
+    `UnionFind` objects represent a partition of the elements 0...n-1 into disjoint classes. Initially every element is
+    in a class of its own. Classes are joined by union by size, and paths are halved while finding the root of a class.
+    """
+
+    def __init__(self, n: int):
+        """
+        Creates the partition of 0...n-1 into classes of one element.
+        :param n: The number of elements
+        """
+        self._parent = list(range(n))
+        self._size = [1] * n
+
+    def __repr__(self):
+        """
+        A programmer-friendly representation of the UnionFind.
+        :return: The string to approximate the constructor arguments of the `UnionFind'
+        """
+        return 'UnionFind(n={})'.format(len(self._parent))
+
+    def __len__(self) -> int:
+        """
+        :return: The number of elements
+        """
+        return len(self._parent)
+
+    def find(self, x: int) -> int:
+        """
+        :param x: An element
+        :return: The root of the class of the element, which is the same for all elements in the class
+        """
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        """
+        Joins the classes of two elements.
+        :param x, y: The elements
+        :return: Whether the classes have been joined, False if the elements were already in the same class
+        """
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return False
+        if self._size[x] < self._size[y]:
+            x, y = y, x
+        self._parent[y] = x
+        self._size[x] += self._size[y]
+        return True
+
+    def classes(self) -> List[List[int]]:
+        """
+        :return: The classes as sorted lists, in order of their smallest element
+        """
+        classes = {}
+        for x in range(len(self._parent)):
+            classes.setdefault(self.find(x), []).append(x)
+        return list(classes.values())
@@ -1,10 +1,14 @@
 from input_output.sys_output import fail, passed
-from algorithms.automorphism_problem import count_automorphisms
+from algorithms.automorphism_problem import count_automorphisms, branching, order_computation, \
+    mappings_to_permutations
 from algorithms.color_refinement import fast_color_refinement
 from supporting_components.graph import Graph, Vertex, Edge
 from supporting_components.permv2 import permutation
 from algorithms.preprocessing import fix_degrees
 from algorithms.color_initialization import degree_color_initialization
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_generators import hypercube, torus, cube_cycle_product
+from supporting_components.search_statistics import SearchStatistics
 
 """
 To test if the new branching algorithm works.
@@ -109,6 +113,28 @@ def test_example_slides_star():
     return order == 48
 
 
+def self_disjoint_union(generated):
+    G = CompactGraph(generated[0], generated[1])
+    G.degree_fixed = [G.degree(v) for v in G.vertices]
+    return degree_color_initialization(G.self_disjoint_union())
+
+
+def test_stabilizer_chain_pruning():
+    # The branches of which the automorphisms are known from the stabilizer chain are skipped, which gives the same order
+    # as the search of all branches of the trivial nodes, with fewer nodes
+    for generated in [hypercube(4), torus(4, 6), cube_cycle_product(2, 5)]:
+        statistics = SearchStatistics()
+        order = count_automorphisms(self_disjoint_union(generated), fast_color_refinement, statistics)
+        unpruned_statistics = SearchStatistics()
+        mappings = branching(self_disjoint_union(generated), fast_color_refinement, trivial_node=True,
+                             statistics=unpruned_statistics)
+        unpruned_order = order_computation(mappings_to_permutations(generated[0], mappings), generated[0])
+        if order != generated[2] or unpruned_order != order or \
+                sum(statistics.nodes) >= sum(unpruned_statistics.nodes):
+            return False
+    return True
+
+
 def unit_test():
     test_name = 'automorphisms-problem'
     print('<' + test_name + '>')
@@ -125,6 +151,10 @@ def unit_test():
         fail("test_example_slides_star: TEST FAILED")
         pass_bool = False
 
+    if not test_stabilizer_chain_pruning():
+        fail("test_stabilizer_chain_pruning: TEST FAILED")
+        pass_bool = False
+
     if pass_bool:
         passed('' + test_name + ' PASS')
 
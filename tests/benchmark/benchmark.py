@@ -0,0 +1,163 @@
+from input_output.file_output import load_graph_list_from_filepath
+from tests.integration_test.isomorphism_problem import preprocessing
+from tests.integration_test.algorithm_options import color_refinement_method
+from supporting_components.compact_graph import CompactGraph
+from algorithms.color_initialization import degree_color_initialization
+from algorithms.automorphism_problem import branching, mappings_to_permutations, order_computation
+from supporting_components.schreier_sims import StabilizerChain
+from math import log, exp
+from time import time
+
+"""
+Benchmark of the stages of the algorithm: parsing (without the binary cache), preprocessing, color refinement,
+branching (which adds the automorphisms to a stabilizer chain that prunes it) and the order computation of the
+automorphisms that are found.
+The time of every stage is measured per file, as the minimum over a number of repeats. The scaling of every stage is
+measured on a series of graphs of increasing size, to which a power law t = c * n^k is fitted.
+Results can be compared with a baseline that was measured before on the same machine.
+"""
+
+# The files of the corpus that is benchmarked by default, relative to the root of the project
+CORPUS = [
+    '/test_graphs/color_refinement/colorref_largeexample_4_1026.grl',
+    '/test_graphs/color_refinement/colorref_largeexample_6_960.grl',
+    '/test_graphs/color_refinement/colorref_smallexample_6_15.grl',
+    '/test_graphs/individualization_refinement/torus24.grl',
+    '/test_graphs/individualization_refinement/torus144.grl',
+    '/test_graphs/individualization_refinement/trees36.grl',
+    '/test_graphs/individualization_refinement/trees90.grl',
+    '/test_graphs/individualization_refinement/products72.grl',
+    '/test_graphs/individualization_refinement/cubes5.grl',
+    '/test_graphs/individualization_refinement/cubes6.grl',
+    '/test_graphs/individualization_refinement/cographs1.grl',
+    '/test_graphs/individualization_refinement/bigtrees1.grl',
+    '/test_graphs/individualization_refinement/modulesC.grl',
+    '/test_graphs/additional_instances/Autom1.gr',
+]
+
+# The series of graphs the scaling curves are fitted on, with the size parameter of every file
+SCALING_SERIES = [(n, '/test_graphs/fast_color_refinement/threepaths' + str(n) + '.gr')
+                  for n in [5, 10, 20, 40, 80, 160, 320, 640, 1280, 2560, 5120, 10240]]
+
+STAGES = ['parse', 'preprocessing', 'refinement', 'branching', 'order computation']
+
+# Times below this amount of seconds are too small to measure reliably
+NOISE = 0.005
+
+
+def benchmark_file(filepath, repeat=3):
+    """
+    Measures the time of every stage of the algorithm on the graphs of a file.
+    :param filepath: The path of the file
+    :param repeat: The amount of times every stage is measured, the minimum time is used
+    :return: Dictionary with the amount of graphs and vertices of the file and the time of every stage
+    """
+    times = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        stage_times = {stage: 0.0 for stage in STAGES}
+
+        start = time()
+        graphs = load_graph_list_from_filepath(filepath, cache=False)
+        stage_times['parse'] = time() - start
+
+        start = time()
+        for G in graphs:
+            preprocessing(G)
+        stage_times['preprocessing'] = time() - start
+
+        for G in graphs:
+            # The refinement and branching are measured on the disjoint union of the graph with itself, like when the
+            # automorphisms of the graph are counted
+            G_compact = CompactGraph.from_graph(G)
+            A = degree_color_initialization(G_compact.self_disjoint_union())
+            start = time()
+            color_refinement_method()(A)
+            stage_times['refinement'] += time() - start
+
+            A = degree_color_initialization(G_compact.self_disjoint_union())
+            start = time()
+            mappings = branching(A, color_refinement_method(), trivial_node=True, chain=StabilizerChain(len(G_compact)))
+            stage_times['branching'] += time() - start
+
+            start = time()
+            order_computation(mappings_to_permutations(len(G_compact), mappings), len(G_compact))
+            stage_times['order computation'] += time() - start
+
+        for stage in STAGES:
+            times[stage].append(stage_times[stage])
+
+    return {
+        'graphs': len(graphs),
+        'vertices': sum(len(G.vertices) for G in graphs),
+        'stages': {stage: min(times[stage]) for stage in STAGES}
+    }
+
+
+def fit_power_law(sizes, times):
+    """
+    Fits t = c * n^k to the measured times with least squares on the logarithms. Times that are too small to measure
+    reliably are left out.
+    :param sizes: The sizes n
+    :param times: The times t
+    :return: The coefficient c and the exponent k, or None and None if less than two times could be used
+    """
+    points = [(log(n), log(t)) for n, t in zip(sizes, times) if t >= NOISE]
+    if len(points) < 2:
+        return None, None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None, None
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return exp(mean_y - exponent * mean_x), exponent
+
+
+def scaling_curves(results):
+    """
+    Fits a power law to every stage of the results of the scaling series.
+    :param results: The results of `benchmark_file` for every size of the series, as (size, result) pairs
+    :return: Dictionary with for every stage the sizes, times, coefficient and exponent
+    """
+    sizes = [n for n, _ in results]
+    curves = {}
+    for stage in STAGES:
+        times = [result['stages'][stage] for _, result in results]
+        coefficient, exponent = fit_power_law(sizes, times)
+        curves[stage] = {'sizes': sizes, 'times': times, 'coefficient': coefficient, 'exponent': exponent}
+    return curves
+
+
+def compare(results, baseline, threshold=0.25, exponent_threshold=0.15):
+    """
+    Compares the results of a benchmark with a baseline.
+    A stage of a file has regressed if it takes more than 'threshold' (relatively) longer than in the baseline, and the
+    difference is larger than the noise. A scaling curve has regressed if its exponent grew more than
+    'exponent_threshold'.
+    :param results: The results of the benchmark
+    :param baseline: The results of an earlier benchmark
+    :param threshold: The relative increase of time that is allowed
+    :param exponent_threshold: The increase of the exponent of a scaling curve that is allowed
+    :return: The list of regressions, as descriptions
+    """
+    regressions = []
+    for file, result in results['files'].items():
+        if file not in baseline['files']:
+            continue
+        for stage, seconds in result['stages'].items():
+            baseline_seconds = baseline['files'][file]['stages'].get(stage)
+            if baseline_seconds is None:
+                continue
+            if seconds > baseline_seconds * (1 + threshold) and seconds - baseline_seconds > NOISE:
+                regressions.append('{} {}: {:.3f}s, baseline {:.3f}s'.format(file, stage, seconds, baseline_seconds))
+
+    for stage, curve in results.get('scaling', {}).items():
+        baseline_curve = baseline.get('scaling', {}).get(stage)
+        if baseline_curve is None or curve['exponent'] is None or baseline_curve['exponent'] is None:
+            continue
+        if curve['exponent'] > baseline_curve['exponent'] + exponent_threshold:
+            regressions.append('scaling {}: n^{:.2f}, baseline n^{:.2f}'.format(
+                stage, curve['exponent'], baseline_curve['exponent']))
+
+    return regressions
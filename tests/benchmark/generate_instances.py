@@ -0,0 +1,144 @@
+# Util imports
+from input_output.file_output import ROOT
+from input_output.sys_output import title
+from supporting_components.graph_io import write_edge_lists
+from supporting_components import graph_generators as generators
+import argparse
+import json
+import os
+
+"""
+Generates test instances of arbitrary size, for which the answers are known, in the .grl format of the test graphs.
+Every family creates graphs that are not isomorphic to each other, and every file has these graphs followed by a random
+relabeling of each of them. So graph i is isomorphic to graph i + k, where k is the amount of graphs of the family.
+The answers are written to answers.json in the same directory: for every file the classes of isomorphic graphs and the
+amount of automorphisms of the graphs for which it is known.
+Usage:
+    python -m tests.benchmark.generate_instances [--sizes 3 4 5] [--seed 0] [--directory /output_files/generated]
+"""
+
+
+def torus_instance(size, seed):
+    """
+    :return: The tori C_size x C_4size and C_2size x C_2size, which are 4-regular on the same amount of vertices
+    """
+    return [generators.torus(size, 4 * size), generators.torus(2 * size, 2 * size)]
+
+
+def cube_instance(size, seed):
+    """
+    :return: The hypercube Q_size and the product Q_size-1 x C_3
+    """
+    return [generators.hypercube(size), generators.cube_cycle_product(size - 1, 3)]
+
+
+def product_instance(size, seed):
+    """
+    :return: The products Q_size x C_5 and Q_size-1 x C_10, which have the same amount of vertices
+    """
+    return [generators.cube_cycle_product(size, 5), generators.cube_cycle_product(size - 1, 10)]
+
+
+def cfi_instance(size, seed):
+    """
+    :return: The CFI graphs of a random 3-regular base graph on 2 * size vertices, which color refinement does not
+    distinguish
+    """
+    return list(generators.cfi_pair(generators.random_regular_graph(2 * size, 3, seed)))
+
+
+def tree_instance(size, seed):
+    """
+    :return: A random tree on 10 * size + 1 vertices and a tree of size copies of a random tree of 10 vertices
+    """
+    return __different(lambda s: generators.random_tree(10 * size + 1, s),
+                       lambda s: generators.symmetric_tree(10, size, s), seed)
+
+
+def cograph_instance(size, seed):
+    """
+    :return: Two random cographs on 10 * size vertices
+    """
+    return __different(lambda s: generators.random_cograph(10 * size, s),
+                       lambda s: generators.random_cograph(10 * size, s + 1), seed)
+
+
+def regular_instance(size, seed):
+    """
+    :return: A random 3-regular graph on 20 * size vertices. It is not known if two random regular graphs are
+    isomorphic, so only one is created.
+    """
+    return [generators.random_regular_graph(20 * size, 3, seed)]
+
+
+FAMILIES = {
+    'torus': torus_instance,
+    'cubes': cube_instance,
+    'products': product_instance,
+    'cfi': cfi_instance,
+    'trees': tree_instance,
+    'cographs': cograph_instance,
+    'regular': regular_instance,
+}
+
+
+def __different(create, create_other, seed):
+    """
+    Creates two graphs with a different amount of automorphisms, so that they are certainly not isomorphic, by trying
+    seeds from 'seed' on.
+    :return: The two graphs
+    """
+    graph = create(seed)
+    for other_seed in range(seed, seed + 100):
+        other = create_other(other_seed)
+        if other[2] != graph[2]:
+            return [graph, other]
+    raise ValueError('No graphs with a different amount of automorphisms were created')
+
+
+def generate(family, size, seed):
+    """
+    :param family: The name of the family
+    :param size: The size parameter of the family
+    :param seed: The seed of the random graphs and relabelings
+    :return: The graphs of the file, the classes of isomorphic graphs and the amount of automorphisms of every graph
+    for which it is known
+    """
+    graphs = FAMILIES[family](size, seed)
+    k = len(graphs)
+    graphs += [generators.relabel(graph, seed + i) for i, graph in enumerate(graphs)]
+    classes = [[i, i + k] for i in range(k)]
+    automorphisms = {i: graph[2] for i, graph in enumerate(graphs) if graph[2] is not None}
+    return graphs, classes, automorphisms
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate test instances with known answers.')
+    parser.add_argument('--families', nargs='*', default=list(FAMILIES), choices=list(FAMILIES),
+                        help='the families of graphs to generate')
+    parser.add_argument('--sizes', nargs='*', type=int, default=[3, 4, 5], help='the size parameters of the files')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random graphs and relabelings')
+    parser.add_argument('--directory', default='/output_files/generated',
+                        help='the directory to write to, relative to the root of the project')
+    args = parser.parse_args()
+
+    directory = ROOT + args.directory
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    title("-------------------------------")
+    title("Generating instances")
+    title("-------------------------------")
+    answers = {}
+    for family in args.families:
+        for size in args.sizes:
+            name = family + str(size)
+            graphs, classes, automorphisms = generate(family, size, args.seed)
+            with open(directory + '/' + name + '.grl', 'w') as f:
+                write_edge_lists([(n, edges) for n, edges, _ in graphs], f)
+            answers[name] = {'isomorphism': classes, 'automorphisms': automorphisms}
+            print('{:<20}{:>4} graphs{:>10} vertices'.format(name, len(graphs), graphs[0][0]))
+
+    with open(directory + '/answers.json', 'w') as f:
+        json.dump(answers, f, indent=4)
+    print('Answers written to ' + directory + '/answers.json')
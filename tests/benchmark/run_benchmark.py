@@ -0,0 +1,76 @@
+# Util imports
+from input_output.file_output import ROOT, write_json_file
+from input_output.sys_output import passed, fail, title
+from tests.integration_test.settings import color_refinement_algorithm
+from tests.benchmark.benchmark import CORPUS, SCALING_SERIES, STAGES, benchmark_file, scaling_curves, compare
+import argparse
+import json
+import os
+import sys
+
+"""
+Benchmark of the stages of the algorithm over the test graphs.
+The results are written to a json file in output_files/json and compared with the baseline, if there is one.
+Usage:
+    python -m tests.benchmark.run_benchmark [--repeat 3] [--max-size 10240] [--files FILE ...] [--save-baseline]
+Timings depend on the machine, so a baseline should be saved and compared on the same machine.
+"""
+
+BASELINE = ROOT + '/tests/benchmark/baseline.json'
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the stages of the algorithm over the test graphs.')
+    parser.add_argument('--files', nargs='*', default=CORPUS,
+                        help='the files to benchmark, relative to the root of the project')
+    parser.add_argument('--repeat', type=int, default=3, help='the amount of measurements of which the minimum is used')
+    parser.add_argument('--max-size', type=int, default=10240, help='the largest size of the scaling series')
+    parser.add_argument('--baseline', default=BASELINE, help='the baseline file to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='save the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='the relative increase of time that is allowed')
+    args = parser.parse_args()
+
+    results = {'settings': {'color_refinement_algorithm': color_refinement_algorithm, 'repeat': args.repeat},
+               'files': {}}
+
+    title("-------------------------------")
+    title("Benchmark")
+    title("-------------------------------")
+    print('{:<30}'.format('file') + ''.join('{:>19}'.format(stage) for stage in STAGES))
+    for filename in args.files:
+        name = (filename.split("/")[-1]).split(".")[0]
+        result = benchmark_file(ROOT + filename, args.repeat)
+        results['files'][name] = result
+        print('{:<30}'.format(name) + ''.join('{:>18.3f}s'.format(result['stages'][stage]) for stage in STAGES))
+
+    title("-------------------------------")
+    title("Scaling")
+    title("-------------------------------")
+    series = []
+    for n, filename in SCALING_SERIES:
+        if n > args.max_size:
+            continue
+        sys.stdout.write('\r' + "Benchmarking " + filename)
+        series.append((n, benchmark_file(ROOT + filename, args.repeat)))
+    print('')
+    results['scaling'] = scaling_curves(series)
+    for stage in STAGES:
+        exponent = results['scaling'][stage]['exponent']
+        print('{:<30}'.format(stage) + ('n^{:.2f}'.format(exponent) if exponent is not None else 'too fast to fit'))
+
+    print('Results written to ' + write_json_file('benchmark', results))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        passed('Baseline saved to ' + args.baseline)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            fail('[REGRESSION] ' + regression)
+        if regressions:
+            fail('BENCHMARK FAILED - ' + str(len(regressions)) + ' regressions.')
+            sys.exit(1)
+        passed('BENCHMARK PASSED - no regressions compared to the baseline')
+    else:
+        print('No baseline to compare with, save one with --save-baseline')
@@ -0,0 +1,53 @@
+from input_output.sys_output import fail, passed
+from tests.benchmark.benchmark import fit_power_law, compare
+
+"""
+This test tests the fit of the scaling curves and the comparison with a baseline of the benchmark.
+"""
+
+
+def test_fit_power_law():
+    sizes = [10, 100, 1000, 10000]
+    times = [0.002 * n ** 1.5 for n in sizes]
+    coefficient, exponent = fit_power_law(sizes, times)
+    # Times that are too small to measure are left out, so there is nothing to fit
+    no_coefficient, no_exponent = fit_power_law(sizes, [0.0, 0.0, 0.0, 0.001])
+
+    return abs(coefficient - 0.002) < 1e-9 and abs(exponent - 1.5) < 1e-9 and no_exponent is None
+
+
+def test_compare():
+    baseline = {'files': {'torus24': {'stages': {'parse': 0.100, 'branching': 0.001}}},
+                'scaling': {'parse': {'exponent': 1.0}}}
+    results = {'files': {'torus24': {'stages': {'parse': 0.200, 'branching': 0.003}}},
+               'scaling': {'parse': {'exponent': 1.8}}}
+    same_results = {'files': {'torus24': {'stages': {'parse': 0.110, 'branching': 0.001}}},
+                    'scaling': {'parse': {'exponent': 1.1}}}
+
+    # The branching time doubled as well, but the difference is too small to measure
+    return len(compare(results, baseline)) == 2 and compare(same_results, baseline) == []
+
+
+def unit_test():
+    test_name = 'benchmark_scaling'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_fit_power_law():
+        fail("test_fit_power_law: TEST FAILED")
+        pass_bool = False
+
+    if not test_compare():
+        fail("test_compare: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -2,8 +2,12 @@ from input_output.file_output import load_graph_list, create_csv_file, write_csv
 from input_output.sys_output import fail, passed
 from algorithms.branching import count_isomorphisms
 from algorithms.color_initialization import degree_color_initialization
-from algorithms.color_refinement import color_refinement
+from algorithms.color_refinement import color_refinement, fast_color_refinement
+from algorithms.decide_gi import is_balanced_or_bijected
 from algorithms.preprocessing import fix_degrees
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_generators import hypercube, torus
+from supporting_components.search_statistics import SearchStatistics
 from time import time
 
 
@@ -17,6 +21,51 @@ filename-0_1 = Graph of the disjoint union of Graph 0 and 1 of that file
 """
 
 
+def self_disjoint_union(generated):
+    G = CompactGraph(generated[0], generated[1])
+    G.degree_fixed = [G.degree(v) for v in G.vertices]
+    return degree_color_initialization(G.self_disjoint_union())
+
+
+def unpruned_count(G, statistics):
+    """
+    Counts the isomorphisms of the disjoint union by searching every branch, without orbit pruning.
+    """
+    statistics.node()
+    fast_color_refinement(G, None)
+    is_balanced, is_bijected = is_balanced_or_bijected(G)
+    if not is_balanced or is_bijected:
+        return int(is_balanced)
+
+    C = min((key for key in G.colors if len(G.colors[key]) >= 4), key=lambda key: len(G.colors[key]))
+    x = next(v for v in G.colors[C] if G.graph_label[v] == 1)
+    g1 = [v for v in G.colors[C] if G.graph_label[v] == 2]
+    x_color = G.split(C, [x])
+    num_isomorphisms = 0
+    for y in g1:
+        checkpoint = G.checkpoint()
+        G.split(C, [y], x_color)
+        num_isomorphisms += unpruned_count(G, statistics)
+        G.undo(checkpoint)
+    return num_isomorphisms
+
+
+def test_orbit_pruning():
+    """
+    The branches of vertices in the same orbit are not searched again, which gives the same amount of isomorphisms with
+    fewer nodes.
+    """
+    for generated in [hypercube(3), torus(3, 4)]:
+        statistics = SearchStatistics()
+        pruned = count_isomorphisms(self_disjoint_union(generated), True, fast_color_refinement, statistics=statistics)
+        unpruned_statistics = SearchStatistics()
+        unpruned = unpruned_count(self_disjoint_union(generated), unpruned_statistics)
+        if pruned != unpruned or pruned != generated[2] or not statistics.pruned or \
+                sum(statistics.nodes) >= sum(unpruned_statistics.nodes):
+            return False
+    return True
+
+
 def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=True):
     test_name = 'branching'
     if write_csv_any:
@@ -205,6 +254,11 @@ def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=T
                 error_count += error_adder
                 total_time += (end_isomorph - start_isomorph) + (end_amount_isomorphisms - start_amount_isomorphisms)
 
+    total_tests += 1
+    if not test_orbit_pruning():
+        fail("test_orbit_pruning: TEST FAILED")
+        error_count += 1
+
     # Determine test outcome
     test_pass_bool = False
     if error_count == 0:
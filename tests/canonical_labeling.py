@@ -0,0 +1,85 @@
+from input_output.sys_output import fail, passed
+from algorithms.canonical_labeling import canonical_labeling, certificate
+from algorithms.tree_algorithm import tree_certificate
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from supporting_components.graph_generators import relabel, hypercube, torus, cfi_pair, random_regular_graph, \
+    random_tree, random_cograph
+
+"""
+This test tests that canonical labeling gives isomorphic graphs the same certificate and non-isomorphic graphs
+different certificates.
+"""
+
+
+def compact(graph):
+    n, edges, _ = graph
+    return CompactGraph(n, edges)
+
+
+def test_relabeled_graphs():
+    graphs = [hypercube(4), torus(5, 5), random_tree(60, 1), random_cograph(20, 2), random_regular_graph(30, 3, 3),
+              (6, [], None)]
+    for graph in graphs:
+        labeling, graph_certificate = canonical_labeling(compact(graph))
+        # The certificate is the graph relabeled by the labeling
+        edges = tuple(sorted((min(labeling[u], labeling[v]), max(labeling[u], labeling[v])) for u, v in graph[1]))
+        if edges != graph_certificate[1]:
+            return False
+        for seed in range(3):
+            if certificate(compact(relabel(graph, seed))) != graph_certificate:
+                return False
+    return True
+
+
+def test_non_isomorphic_graphs():
+    X, Y = cfi_pair(random_regular_graph(6, 3, 1))
+    return certificate(compact(X)) != certificate(compact(Y)) and \
+        certificate(compact(torus(4, 16))) != certificate(compact(torus(8, 8)))
+
+
+def test_tree_certificates():
+    trees = [random_tree(40, seed) for seed in range(3)]
+    certificates = [tree_certificate(compact(tree).to_graph()) for tree in trees]
+    return len(set(certificates)) == 3 and \
+        all(tree_certificate(compact(relabel(tree, 5)).to_graph()) == c for tree, c in zip(trees, certificates))
+
+
+def test_pruning():
+    # The hypercube has 2^6 * 6! automorphisms, which are found in a few leaves
+    statistics = SearchStatistics()
+    certificate(compact(hypercube(6)), statistics)
+    return statistics.leaves < 20
+
+
+def unit_test():
+    test_name = 'canonical_labeling'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_relabeled_graphs():
+        fail("test_relabeled_graphs: TEST FAILED")
+        pass_bool = False
+
+    if not test_non_isomorphic_graphs():
+        fail("test_non_isomorphic_graphs: TEST FAILED")
+        pass_bool = False
+
+    if not test_tree_certificates():
+        fail("test_tree_certificates: TEST FAILED")
+        pass_bool = False
+
+    if not test_pruning():
+        fail("test_pruning: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
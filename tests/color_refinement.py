@@ -1,5 +1,5 @@
 from algorithms.color_initialization import degree_color_initialization
-from algorithms.color_refinement import color_refinement
+from algorithms.color_refinement import color_refinement, signature_color_refinement
 from input_output.file_output import load_graph_list, save_graph_as_dot, create_csv_file, write_csv_line
 from algorithms.decide_gi import is_balanced_or_bijected
 from input_output.sys_output import fail, passed
@@ -56,11 +56,19 @@ def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=T
                 fix_degrees(graphs[j])
 
                 G = graphs[i] + graphs[j]
+                G_signature = degree_color_initialization(G.copy())
 
                 start = time()
                 color_refinement(degree_color_initialization(G))
                 end = time()
 
+                # The signature color refinement should result in the same balanced or unbalanced coloring
+                signature_color_refinement(G_signature)
+                if is_balanced_or_bijected(G_signature)[0] != ((i, j) in solution_isomorphisms[i_file]):
+                    error_count += 1
+                    if write_stdout_fail:
+                        fail(file + "-" + str(i) + "_" + str(j) + " [FAIL] Signature color refinement is not correct.")
+
                 output_filename = file + '_' + str(i) + '_' + str(j)
                 save_graph_as_dot(G, output_filename)
                 process_time = end - start
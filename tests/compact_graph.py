@@ -0,0 +1,261 @@
+from input_output.file_output import load_graph_list
+from input_output.sys_output import fail, passed
+from supporting_components.compact_graph import CompactGraph
+from algorithms.color_initialization import degree_color_initialization
+from algorithms.color_refinement import fast_color_refinement
+from algorithms.branching import count_isomorphisms
+from algorithms.automorphism_problem import count_automorphisms
+from algorithms.decide_gi import is_balanced_or_bijected, is_balanced_or_bijected_since
+from algorithms.preprocessing import fix_degrees
+from supporting_components.search_statistics import SearchStatistics
+
+"""
+To test if the CompactGraph has the same structure as the Graph it is converted from, if the algorithms can be
+applied to it directly and if changes to the coloring can be undone using the trail.
+"""
+
+
+def test_conversion():
+    """
+    Converts graphs to a CompactGraph and back and checks that the neighbours of every vertex are the same.
+    """
+    graphs = load_graph_list('/test_graphs/color_refinement/colorref_smallexample_6_15.grl')
+    for G in graphs:
+        fix_degrees(G)
+        G_compact = CompactGraph.from_graph(G)
+        if len(G_compact) != len(G.vertices) or len(G_compact.edges) != len(G.edges):
+            return False
+
+        vertices = G.vertices
+        for i, v in enumerate(vertices):
+            if sorted(G_compact.neighbours(i)) != sorted(vertices.index(w) for w in v.neighbours):
+                return False
+            if G_compact.degree(i) != v.degree or G_compact.degree_fixed[i] != v.degree_fixed:
+                return False
+
+        G_back = G_compact.to_graph()
+        if len(G_back.vertices) != len(G.vertices) or len(G_back.edges) != len(G.edges):
+            return False
+        for v, w in zip(G.vertices, G_back.vertices):
+            if v.label != w.label or sorted(n.label for n in v.neighbours) != sorted(n.label for n in w.neighbours):
+                return False
+    return True
+
+
+def test_fast_color_refinement():
+    """
+    Applies fast color refinement to the disjoint union as a CompactGraph and checks that the coloring is balanced for
+    isomorphic graphs (0 and 1) and not balanced for non-isomorphic graphs (0 and 2).
+    """
+    graphs = load_graph_list('/test_graphs/color_refinement/colorref_smallexample_6_15.grl')
+    for G in graphs:
+        fix_degrees(G)
+
+    G_compact = CompactGraph.from_graph(graphs[0] + graphs[1])
+    fast_color_refinement(degree_color_initialization(G_compact))
+    H_compact = CompactGraph.from_graph(graphs[0] + graphs[2])
+    fast_color_refinement(degree_color_initialization(H_compact))
+
+    return is_balanced_or_bijected(G_compact)[0] and not is_balanced_or_bijected(H_compact)[0]
+
+
+def test_branching():
+    """
+    Counts the isomorphisms and automorphisms of graphs of torus24 using CompactGraphs.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    for G in graphs:
+        fix_degrees(G)
+
+    G_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[3]))
+    H_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[1]))
+    A_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0].self_disjoint_union()))
+
+    return count_isomorphisms(G_compact, True, fast_color_refinement) == 96 \
+        and not count_isomorphisms(H_compact, False, fast_color_refinement) \
+        and count_automorphisms(A_compact, fast_color_refinement) == 96
+
+
+def test_parallel_branching():
+    """
+    Counts the isomorphisms of graphs of torus24 with the subtrees of the first one and two branching levels searched by
+    worker processes.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    for G in graphs:
+        fix_degrees(G)
+
+    G_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[3]))
+    G_compact_depth_2 = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[3]))
+    H_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[1]))
+
+    return count_isomorphisms(G_compact, True, fast_color_refinement, 2) == 96 \
+        and count_isomorphisms(G_compact_depth_2, True, fast_color_refinement, 2, 2) == 96 \
+        and not count_isomorphisms(H_compact, False, fast_color_refinement, 2)
+
+
+def test_search_statistics():
+    """
+    Collects the statistics of counting the isomorphisms of graphs of torus24. The root is the only node at depth 0,
+    every leaf is a node, and a split color group is created by every split of refinement.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    for G in graphs:
+        fix_degrees(G)
+
+    G_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0] + graphs[3]))
+    statistics = SearchStatistics()
+    n_isomorphisms = count_isomorphisms(G_compact, True, fast_color_refinement, statistics=statistics)
+    report = statistics.to_dict()
+
+    return n_isomorphisms == 96 and report['nodes_per_depth'][0] == 1 \
+        and 0 < report['leaves'] + report['dead_ends'] <= report['nodes'] == report['refinements'] \
+        and report['cells_split'] > 0 and report['queue_pushes'] >= report['refinement_rounds'] > 0 \
+        and report['times']['search'] >= report['times']['refinement']
+
+
+def test_undo():
+    """
+    Individualizes a vertex and refines the coloring, after which the changes are undone with the trail. The coloring
+    should be exactly the same as before the checkpoint.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    fix_degrees(graphs[0])
+    G_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0].self_disjoint_union()))
+    fast_color_refinement(G_compact)
+
+    colornum_before = list(G_compact.colornum)
+    colors_before = {color: sorted(vertices) for color, vertices in G_compact.colors.items()}
+    max_colornum_before = G_compact.max_colornum
+
+    checkpoint = G_compact.checkpoint()
+    color = G_compact.colornum[0]
+    new_color = G_compact.split(color, [0])
+    G_compact.split(color, [len(G_compact) - 1], new_color)
+    fast_color_refinement(G_compact)
+    changed = len(G_compact.colors) > len(colors_before)
+    G_compact.undo(checkpoint)
+
+    return changed \
+        and G_compact.colornum == colornum_before \
+        and {color: sorted(vertices) for color, vertices in G_compact.colors.items()} == colors_before \
+        and G_compact.max_colornum == max_colornum_before
+
+
+def test_incremental_refinement():
+    """
+    Individualizes a vertex in both graphs of the disjoint union and refines the coloring using only the new color as
+    splitter. The resulting partition should be the same as the one of a full refinement.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    fix_degrees(graphs[0])
+    G_compact = degree_color_initialization(CompactGraph.from_graph(graphs[0].self_disjoint_union()))
+    fast_color_refinement(G_compact)
+
+    color = G_compact.colornum[0]
+    new_color = G_compact.split(color, [0])
+    G_compact.split(color, [len(G_compact) - 1], new_color)
+    H_compact = G_compact.copy()
+
+    checkpoint = G_compact.checkpoint()
+    fast_color_refinement(G_compact, [new_color])
+    fast_color_refinement(H_compact)
+
+    return sorted(sorted(vertices) for vertices in G_compact.colors.values()) \
+        == sorted(sorted(vertices) for vertices in H_compact.colors.values()) \
+        and is_balanced_or_bijected_since(G_compact, checkpoint) == is_balanced_or_bijected(H_compact)
+
+
+def test_complement():
+    """
+    Takes the complement of a CompactGraph and checks that it has the same edges as the complement of the Graph it was
+    converted from, and that the complement of the complement is the graph itself.
+    """
+    graphs = load_graph_list('/test_graphs/color_refinement/colorref_smallexample_6_15.grl')
+    G = graphs[0]
+    G_compact = CompactGraph.from_graph(G)
+    complement_compact = G_compact.complement()
+
+    complement_edges = {frozenset((e.tail.label, e.head.label)) for e in G.complement().edges}
+    compact_edges = {frozenset((G_compact.label[u], G_compact.label[v])) for u, v in complement_compact.edges}
+
+    return compact_edges == complement_edges \
+        and sorted(complement_compact.complement().edges) == sorted(G_compact.edges)
+
+
+def test_disjoint_union():
+    """
+    Makes the disjoint union of two CompactGraphs and checks that it has the edges of both graphs, and that the
+    isomorphisms and automorphisms are counted correctly on it.
+    """
+    graphs = load_graph_list('/test_graphs/individualization_refinement/torus24.grl')
+    for G in graphs:
+        fix_degrees(G)
+
+    G_compact = CompactGraph.from_graph(graphs[0])
+    H_compact = CompactGraph.from_graph(graphs[3])
+    union = G_compact + H_compact
+    self_union = G_compact.self_disjoint_union()
+
+    n = len(G_compact)
+    expected_edges = G_compact.edges + [(u + n, v + n) for u, v in H_compact.edges]
+
+    return sorted(union.edges) == sorted(expected_edges) \
+        and union.graph_label == [1] * n + [2] * len(H_compact) \
+        and union.degree_fixed == G_compact.degree_fixed + H_compact.degree_fixed \
+        and count_isomorphisms(degree_color_initialization(union), True, fast_color_refinement) == 96 \
+        and count_automorphisms(degree_color_initialization(self_union), fast_color_refinement) == 96
+
+
+def unit_test():
+    # Because this test does not show any intermediate results, the arguments are ignored.
+    test_name = 'compact_graph'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_conversion():
+        fail("test_conversion: TEST FAILED")
+        pass_bool = False
+
+    if not test_fast_color_refinement():
+        fail("test_fast_color_refinement: TEST FAILED")
+        pass_bool = False
+
+    if not test_branching():
+        fail("test_branching: TEST FAILED")
+        pass_bool = False
+
+    if not test_parallel_branching():
+        fail("test_parallel_branching: TEST FAILED")
+        pass_bool = False
+
+    if not test_search_statistics():
+        fail("test_search_statistics: TEST FAILED")
+        pass_bool = False
+
+    if not test_undo():
+        fail("test_undo: TEST FAILED")
+        pass_bool = False
+
+    if not test_incremental_refinement():
+        fail("test_incremental_refinement: TEST FAILED")
+        pass_bool = False
+
+    if not test_complement():
+        fail("test_complement: TEST FAILED")
+        pass_bool = False
+
+    if not test_disjoint_union():
+        fail("test_disjoint_union: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -0,0 +1,81 @@
+from input_output.sys_output import fail, passed
+from algorithms.components import connected_components, component_graphs
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_generators import cycle, relabel
+from tests.integration_test.isomorphism_problem import preprocessing, are_isomorph, amount_of_automorphisms
+
+"""
+This test tests the splitting of graphs into connected components, and the isomorphism and automorphism problems of
+disjoint unions of components.
+"""
+
+
+def union(graphs):
+    n = 0
+    edges = []
+    for graph in graphs:
+        edges += [(u + n, v + n) for u, v in graph[1]]
+        n += graph[0]
+    return n, edges, None
+
+
+def preprocessed(graph):
+    G = CompactGraph(graph[0], graph[1]).to_graph()
+    factor = preprocessing(G)['factor']
+    return G, factor
+
+
+PATH = (4, [(0, 1), (1, 2), (2, 3)], None)
+
+
+def test_components():
+    G = CompactGraph(7, [(0, 4), (4, 2), (1, 5)]).to_graph()
+    for v in G.vertices:
+        v.degree_fixed = v.degree
+    components = component_graphs(G)
+    return [[v.label for v in component] for component in connected_components(G)] == [[0, 4, 2], [1, 5], [3], [6]] \
+        and [(len(C), len(C.edges)) for C in components] == [(3, 2), (2, 1), (1, 0), (1, 0)] and \
+        [v.degree_fixed for v in components[0].vertices] == [1, 2, 1]
+
+
+def test_automorphisms():
+    # Three 5-cycles and two paths: (10^3 * 3!) * (2^2 * 2!)
+    G, factor = preprocessed(union([cycle(5), cycle(5), cycle(5), PATH, PATH]))
+    return factor * amount_of_automorphisms(G) == 48000
+
+
+def test_isomorphism():
+    graph = union([cycle(5), cycle(5), PATH])
+    G, _ = preprocessed(graph)
+    H, _ = preprocessed(relabel(graph, 1))
+    K, _ = preprocessed(union([cycle(5), PATH, PATH]))
+    return are_isomorph(G, H) and not are_isomorph(G, K)
+
+
+def unit_test():
+    test_name = 'components'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_components():
+        fail("test_components: TEST FAILED")
+        pass_bool = False
+
+    if not test_automorphisms():
+        fail("test_automorphisms: TEST FAILED")
+        pass_bool = False
+
+    if not test_isomorphism():
+        fail("test_isomorphism: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
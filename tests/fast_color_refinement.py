@@ -7,9 +7,24 @@ from time import time
 
 """
 To test if the fast_color_refinement works and if it is faster compared to color_refinement. 
-The correctness should be checked by yourself by looking at the graphs.
+The coloring that fast_color_refinement returns should be equitable, the rest of the correctness should be checked by
+yourself by looking at the graphs.
 """
 
+
+def is_equitable(G: "Graph"):
+    """
+    A coloring is equitable if all vertices with the same color have the same amount of neighbours of each color.
+    :param G: The colored graph
+    :return: Whether or not the coloring of G is equitable
+    """
+    for vertices in G.colors.values():
+        neighbour_colors = sorted(n.colornum for n in vertices[0].neighbours)
+        for v in vertices[1:]:
+            if sorted(n.colornum for n in v.neighbours) != neighbour_colors:
+                return False
+    return True
+
 def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=True):
     test_name = 'fast_color_refinement'
     if write_csv_any:
@@ -33,7 +48,6 @@ def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=T
     """
     DO NOT CHANGE ANYTHING BELOW HERE
     """
-    # There won't be any errors to detect algorithmically.
     error_count = 0
     total_tests = 0
     total_time = 0
@@ -75,6 +89,11 @@ def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=T
                 output_filename = 'threepaths' + file + '_' + str(i) + 'fast'
                 save_graph_as_dot(G_colored_fast, output_filename)
 
+            if not is_equitable(G_colored_fast):
+                error_count += 1
+                if write_stdout_fail:
+                    fail("[FAIL] Coloring of threepaths" + file + "-" + str(i) + " is not equitable")
+
             if write_stdout_passed:
                 print('')
                 print("Statistics of threepaths" + file + "-" + str(i) + ":")
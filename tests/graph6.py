@@ -0,0 +1,97 @@
+from input_output.sys_output import fail, passed
+from input_output.file_output import load_graph_list_from_filepath
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_io import parse_graph6, parse_sparse6, format_graph6, format_sparse6, read_graph6, \
+    write_graph6
+from tests.integration_test.isomorphism_problem import preprocessing, amount_of_automorphisms
+from io import StringIO
+import os
+import tempfile
+
+"""
+This test tests the graph6 and sparse6 readers and writers with examples of the format descriptions and round trips.
+"""
+
+PETERSEN = 'IheA@GUAo'
+
+
+def test_known_strings():
+    return parse_graph6('A_').edges == [(0, 1)] and parse_graph6('Bw').edges == [(0, 1), (0, 2), (1, 2)] and \
+        len(parse_graph6(PETERSEN)) == 10 and len(parse_graph6(PETERSEN).edges) == 15 and \
+        parse_sparse6(':Fa@x^').edges == [(0, 1), (0, 2), (1, 2), (5, 6)] and \
+        format_sparse6(parse_sparse6(':Fa@x^')) == ':Fa@x^' and format_graph6(parse_graph6(PETERSEN)) == PETERSEN
+
+
+def test_sparse6_padding():
+    # The padding starts with a 0 bit only if n = 2^k, the last edge is at vertex n - 2 and there are at least k + 1
+    # padding bits, like nauty encodes it
+    cases = [(':An', 2, [(0, 1)]), (':Cf', 4, [(0, 1)]), (':CoJ', 4, [(0, 2), (1, 2)]),
+             (':O{?Gn', 16, [(0, 14), (1, 14), (2, 14)])]
+    return all(format_sparse6(CompactGraph(n, edges)) == string and parse_sparse6(string).edges == edges
+               for string, n, edges in cases)
+
+
+def test_round_trips():
+    # Sizes with the three encodings of the amount of vertices, and the sparse6 padding of n = 2^k vertices
+    for n in [1, 2, 4, 16, 63, 300, 258048]:
+        edges = [(v, (v * 7 + 3) % n) for v in range(0, n, max(1, n // 50)) if v < (v * 7 + 3) % n]
+        G = CompactGraph(n, edges)
+        if len(G) < 2000 and parse_graph6(format_graph6(G)).edges != G.edges:
+            return False
+        if parse_sparse6(format_sparse6(G)).edges != G.edges:
+            return False
+
+    # Sparse6 supports loops and multiple edges
+    G = CompactGraph(4, [(0, 1), (0, 1), (2, 2)])
+    return parse_sparse6(format_sparse6(G)).edges == G.edges and \
+        parse_sparse6(format_sparse6(CompactGraph(4, [(0, 1)]))).edges == [(0, 1)]
+
+
+def test_files():
+    f = StringIO()
+    write_graph6([parse_graph6(PETERSEN), parse_graph6('Bw')], f, sparse=True, header=True)
+    f.seek(0)
+    graphs = list(read_graph6(f))
+    if [len(G.edges) for G in graphs] != [15, 3]:
+        return False
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, 'petersen.g6')
+        with open(filepath, 'w') as f:
+            write_graph6([parse_graph6(PETERSEN)], f)
+        G = load_graph_list_from_filepath(filepath)[0]
+    factor = preprocessing(G)['factor']
+    return factor * amount_of_automorphisms(G) == 120
+
+
+def unit_test():
+    test_name = 'graph6'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_known_strings():
+        fail("test_known_strings: TEST FAILED")
+        pass_bool = False
+
+    if not test_sparse6_padding():
+        fail("test_sparse6_padding: TEST FAILED")
+        pass_bool = False
+
+    if not test_round_trips():
+        fail("test_round_trips: TEST FAILED")
+        pass_bool = False
+
+    if not test_files():
+        fail("test_files: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
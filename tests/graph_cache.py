@@ -0,0 +1,93 @@
+from input_output.sys_output import fail, passed
+from supporting_components.graph_cache import DIRECTORY, load_graph_list, load_compact_graph_list, read_cache
+import os
+import pickle
+import tempfile
+
+"""
+This test tests that the graphs loaded from the binary cache are the same as the parsed graphs, and that the cache is
+replaced when the file changes.
+"""
+
+GRAPH_LIST = '''# Number of vertices:
+3
+# Edge list:
+0,1
+1,2
+--- Next graph:
+# Number of vertices:
+4
+# Edge list:
+2,3
+0,0
+'''
+
+
+def edges(G):
+    return sorted(tuple(sorted((e.tail.label, e.head.label))) for e in G.edges)
+
+
+def test_cache(directory):
+    filepath = os.path.join(directory, 'graphs.grl')
+    with open(filepath, 'w') as f:
+        f.write(GRAPH_LIST)
+
+    parsed = load_graph_list(filepath)
+    caches = os.listdir(os.path.join(directory, DIRECTORY))
+    cached = load_graph_list(filepath)
+    compact = load_compact_graph_list(filepath)
+
+    return len(caches) == 1 and [edges(G) for G in cached] == [edges(G) for G in parsed] == [[(0, 1), (1, 2)],
+                                                                                               [(0, 0), (2, 3)]] and \
+        [len(G) for G in compact] == [3, 4] and [G.n_edges for G in compact] == [2, 2] and \
+        pickle.loads(pickle.dumps(compact[1])).edges == [(0, 0), (2, 3)]
+
+
+def test_changed_file(directory):
+    filepath = os.path.join(directory, 'graphs.grl')
+    with open(filepath, 'w') as f:
+        f.write(GRAPH_LIST.replace('0,0', '1,3'))
+
+    graphs = load_graph_list(filepath)
+    caches = os.listdir(os.path.join(directory, DIRECTORY))
+
+    return len(caches) == 1 and edges(graphs[1]) == [(1, 3), (2, 3)] and \
+        [G.edges for G in load_compact_graph_list(filepath)][1] == [(1, 3), (2, 3)]
+
+
+def test_invalid_cache(directory):
+    path = os.path.join(directory, DIRECTORY, 'invalid.csr')
+    with open(path, 'wb') as f:
+        f.write(b'not a cache')
+
+    return read_cache(path) is None and read_cache(os.path.join(directory, 'missing.csr')) is None
+
+
+def unit_test():
+    test_name = 'graph_cache'
+    print('<' + test_name + '>')
+    pass_bool = True
+    with tempfile.TemporaryDirectory() as directory:
+        if not test_cache(directory):
+            fail("test_cache: TEST FAILED")
+            pass_bool = False
+
+        if not test_changed_file(directory):
+            fail("test_changed_file: TEST FAILED")
+            pass_bool = False
+
+        if not test_invalid_cache(directory):
+            fail("test_invalid_cache: TEST FAILED")
+            pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -28,6 +28,23 @@ def test_graph_del_vertex():
     return test_result and v1 not in G.vertices and v2 in G.vertices and e1 not in G.edges and v1 not in v2.neighbours
 
 
+def test_graph_del_vertices():
+    G = Graph(False, 0)
+    v1 = Vertex(G)
+    v2 = Vertex(G)
+    v3 = Vertex(G)
+    e1 = Edge(v1, v2)
+    e2 = Edge(v2, v3)
+    e3 = Edge(v1, v3)
+    G.add_edge(e1)
+    G.add_edge(e2)
+    G.add_edge(e3)
+    test_result = all(v in G.vertices for v in [v1, v2, v3]) and all(e in G.edges for e in [e1, e2, e3])
+
+    G.del_vertices([v1, v2])
+    return test_result and G.vertices == [v3] and G.edges == [] and v3.neighbours == []
+
+
 def unit_test():
     # Because this test does not show any intermediate results, the arguments are ignored.
     test_name = 'graph_del_vertex_edge'
@@ -42,6 +59,10 @@ def unit_test():
         fail("test_graph_del_vertex: TEST FAILED")
         pass_bool = False
 
+    if not test_graph_del_vertices():
+        fail("test_graph_del_vertices: TEST FAILED")
+        pass_bool = False
+
     if pass_bool:
         passed('' + test_name + ' PASS')
 
@@ -0,0 +1,101 @@
+from input_output.sys_output import fail, passed
+from supporting_components import graph_generators as generators
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_io import write_edge_lists, load_graph
+from tests.integration_test.isomorphism_problem import preprocessing, are_isomorph, amount_of_automorphisms
+from io import StringIO
+
+"""
+This test tests that the generated graphs have the amount of automorphisms and isomorphisms they are generated with, by
+solving them with the algorithm.
+"""
+
+
+def graph(generated):
+    G = CompactGraph(generated[0], generated[1]).to_graph()
+    G.factor = preprocessing(G)['factor']
+    return G
+
+
+def automorphisms_match(generated):
+    G = graph(generated)
+    return G.factor * amount_of_automorphisms(G) == generated[2]
+
+
+def test_symmetric_graphs():
+    cases = [generators.hypercube(d) for d in range(1, 5)] + \
+            [generators.torus(m, n) for m, n in [(3, 3), (3, 5), (4, 4), (4, 6), (5, 5)]] + \
+            [generators.cube_cycle_product(d, m) for d, m in [(1, 3), (2, 5), (3, 6)]]
+
+    return generators.hypercube(3)[2] == 48 and all(automorphisms_match(generated) for generated in cases)
+
+
+def test_trees():
+    # A tree with two centers of which the halves are not isomorphic, and trees with symmetric halves
+    cases = [(3, [(0, 1), (1, 2)], 2), (5, [(0, 1), (1, 2), (1, 3), (2, 4)], 2)] + \
+            [generators.random_tree(n, seed) for n in (10, 30) for seed in range(3)] + \
+            [generators.symmetric_tree(6, copies, seed) for copies in (2, 3) for seed in range(2)]
+
+    return all(automorphisms_match(generated) for generated in cases)
+
+
+def test_cographs():
+    cases = [generators.random_cograph(n, seed) for n in (5, 12, 20) for seed in range(3)]
+
+    return all(automorphisms_match(generated) for generated in cases)
+
+
+def test_isomorphisms():
+    regular = generators.random_regular_graph(30, 3, 1)
+    X, Y = generators.cfi_pair(generators.random_regular_graph(4, 3, 0))
+
+    return all(sum(1 for edge in regular[1] if v in edge) == 3 for v in range(30)) and \
+        are_isomorph(graph(regular), graph(generators.relabel(regular, 2))) and \
+        are_isomorph(graph(X), graph(generators.relabel(X, 3))) and not are_isomorph(graph(X), graph(Y))
+
+
+def test_write_edge_lists():
+    generated = [generators.cycle(5), generators.hypercube(3)]
+    f = StringIO()
+    write_edge_lists([(n, edges) for n, edges, _ in generated], f)
+    f.seek(0)
+    graphs, _ = load_graph(f, read_list=True)
+
+    return [(len(G.vertices), len(G.edges)) for G in graphs] == [(5, 5), (8, 12)]
+
+
+def unit_test():
+    test_name = 'graph_generators'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_symmetric_graphs():
+        fail("test_symmetric_graphs: TEST FAILED")
+        pass_bool = False
+
+    if not test_trees():
+        fail("test_trees: TEST FAILED")
+        pass_bool = False
+
+    if not test_cographs():
+        fail("test_cographs: TEST FAILED")
+        pass_bool = False
+
+    if not test_isomorphisms():
+        fail("test_isomorphisms: TEST FAILED")
+        pass_bool = False
+
+    if not test_write_edge_lists():
+        fail("test_write_edge_lists: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -0,0 +1,79 @@
+from input_output.sys_output import fail, passed
+from input_output.file_output import ROOT
+from supporting_components.graph import Graph
+from supporting_components.graph_io import read_graphs, read_graph, load_graph
+from io import StringIO
+
+"""
+This test tests that the graphs are parsed the same by the bulk parser and by reading the file line by line.
+"""
+
+GRAPH_LIST = '''option
+# Number of vertices:
+3
+# Edge list:
+0,1
+1,2
+--- Next graph:
+# Number of vertices:
+4
+# Edge list:
+0,1:5
+# A comment in the edge list
+2,3
+--- Next graph:
+2
+'''
+
+
+def edges(G):
+    return [(e.tail.label, e.head.label, e.weight) for e in G.edges]
+
+
+def test_graph_list():
+    graphs = read_graphs(Graph, StringIO(GRAPH_LIST))
+    # The graphs are created one at a time
+    G, options = next(graphs)
+    first = len(G) == 3 and edges(G) == [(0, 1, None), (1, 2, None)] and options == ['option']
+    rest = [(len(G), edges(G), options) for G, options in graphs]
+
+    return first and rest == [(4, [(0, 1, 5), (2, 3, None)], []), (2, [], [])]
+
+
+def test_same_as_read_graph():
+    filename = ROOT + '/test_graphs/color_refinement/colorref_smallexample_4_7.grl'
+    with open(filename) as f:
+        graphs, _ = load_graph(f, read_list=True)
+    with open(filename) as f:
+        line_graphs = []
+        cont = True
+        while cont:
+            G, _, cont = read_graph(Graph, f)
+            line_graphs.append(G)
+
+    return [edges(G) for G in graphs] == [edges(G) for G in line_graphs]
+
+
+def unit_test():
+    test_name = 'graph_io'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_graph_list():
+        fail("test_graph_list: TEST FAILED")
+        pass_bool = False
+
+    if not test_same_as_read_graph():
+        fail("test_same_as_read_graph: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -1,11 +1,18 @@
-from tests.integration_test.settings import simple_cases, twin_removal, tree_algorithm, color_refinement_algorithm, branching_algorithm, complement
+from tests.integration_test.settings import simple_cases, twin_removal, pendant_tree_removal, tree_algorithm, color_refinement_algorithm, branching_algorithm, complement, \
+    workers, branching_workers, branching_depth, result_store, result_store_path, component_decomposition, \
+    modular_decomposition, run_mode, canonical_labeling_nodes
+from input_output.file_output import ROOT
+from supporting_components.result_store import ResultStore, code_version
 from supporting_components.graph import Graph
-from algorithms.preprocessing import remove_twins, use_complement
+from algorithms.preprocessing import remove_twins, remove_pendant_trees, use_complement
 from algorithms.simple_cases import could_be_isomorphic
-from algorithms.tree_algorithm import is_tree, trees_are_isomorph, trees_automorphisms
-from algorithms.color_refinement import color_refinement, fast_color_refinement
+from algorithms.tree_algorithm import is_tree, trees_are_isomorph, trees_automorphisms, tree_certificate
+from algorithms.components import component_graphs
+from algorithms import modular_decomposition as modules
+from algorithms.color_refinement import color_refinement, fast_color_refinement, signature_color_refinement
 from algorithms.branching import count_isomorphisms
 from algorithms.automorphism_problem import count_automorphisms
+import os
 
 
 """
@@ -35,6 +42,19 @@ def apply_remove_twins(G: "Graph"):
     return factor
 
 
+def apply_remove_pendant_trees(G: "Graph"):
+    """
+    If pendant_tree_removal is set to True, the trees that hang from the graph are removed from the graph. The amount of
+    automorphisms found with the reduced graph should be multiplied with the factor that is returned by this method.
+    """
+    if pendant_tree_removal:
+        factor = remove_pendant_trees(G)
+    else:
+        factor = 1
+
+    return factor
+
+
 def apply_tree_algorithm(G: "Graph", H: "Graph" = None):
     """
     If the tree algorithm must be used, this method checks if G (and H) are trees.
@@ -54,6 +74,47 @@ def apply_tree_algorithm(G: "Graph", H: "Graph" = None):
     return False, None
 
 
+def apply_tree_certificate(G: "Graph"):
+    """
+    If the tree algorithm must be used, this method checks if G is a tree, and if it is, the certificate of the tree
+    is determined with the tree algorithm.
+    :return: Boolean that tells if the certificate is determined
+    :return: If True, the second return variable is the certificate of tree G
+    """
+    if tree_algorithm and is_tree(G):
+        return True, tree_certificate(G)
+
+    return False, None
+
+
+def apply_component_decomposition(G: "Graph"):
+    """
+    If component_decomposition is set to True, this method splits graph G into its connected components.
+    :return: Boolean that tells if G is split, which is False if it is connected
+    :return: If True, the second return variable is the list of graphs of the components of G
+    """
+    if component_decomposition:
+        components = component_graphs(G)
+        if len(components) > 1:
+            return True, components
+
+    return False, None
+
+
+def apply_modular_decomposition(G: "Graph"):
+    """
+    If modular_decomposition is set to True, this method determines the modular decomposition tree of graph G.
+    :return: Boolean that tells if G has modules other than its vertices and the whole graph
+    :return: If True, the second return variable is the modular decomposition tree of G
+    """
+    if modular_decomposition:
+        tree = modules.modular_decomposition(G)
+        if modules.is_decomposable(tree):
+            return True, tree
+
+    return False, None
+
+
 def color_refinement_method():
     """
     This method returns the color_refinement method that is chosen in the settings.
@@ -62,22 +123,73 @@ def color_refinement_method():
         return color_refinement
     elif color_refinement_algorithm == 2:
         return fast_color_refinement
+    elif color_refinement_algorithm == 3:
+        return signature_color_refinement
 
 
-def branching_method(G: "Graph", count_flag: "Bool"):
+def branching_method(G: "Graph", count_flag: "Bool", statistics: "SearchStatistics" = None,
+                     generators: "List[List[int]]" = None):
     """
     This method returns if the disjoint union graph G is isomorph or the amount of isomorphisms based on the value
     of count_flag. Also the right color_refinement method is passed along here.
+    If a statistics collector is given, the statistics of the search are collected in it. If a list of generators is
+    given and the automorphisms are counted with fast branching, the generators of the automorphism group are added to
+    it.
     """
     # If it must be determined if the graphs in G are isomorphic
     if not count_flag:
-        return count_isomorphisms(G, count_flag, color_refinement_method())
+        return count_isomorphisms(G, count_flag, color_refinement_method(), __branching_workers(), branching_depth,
+                                  statistics)
 
     # If the amount of isomorphisms / automorphisms should be determined
     if branching_algorithm == 1:
-        return count_isomorphisms(G, count_flag, color_refinement_method())
+        return count_isomorphisms(G, count_flag, color_refinement_method(), __branching_workers(), branching_depth,
+                                  statistics)
     if branching_algorithm == 2:
-        return count_automorphisms(G, color_refinement_method())
+        return count_automorphisms(G, color_refinement_method(), statistics, generators)
+
+
+def __branching_workers():
+    """
+    The subtrees of the branching are only searched by worker processes if the graphs of a file are evaluated in this
+    process, otherwise there would be more processes than cores.
+    """
+    if workers == 1:
+        return branching_workers
+    return 1
+
+
+# The store of results of this process, see result_store_method
+__result_store = None
+
+
+def result_store_method():
+    """
+    If result_store is set to True, this method returns the store of the results of earlier runs. Every process opens
+    its own connection to the store. In test mode the results are always computed again, so that they are checked.
+    :return: The `ResultStore`, or None if results are not stored
+    """
+    global __result_store
+    if not result_store or run_mode == 1:
+        return None
+    if __result_store is None or __result_store.pid != os.getpid():
+        __result_store = ResultStore(ROOT + result_store_path, __code_version())
+    return __result_store
+
+
+def __code_version():
+    """
+    :return: The version of the results (see code_version) of the algorithms, the integration test code that applies
+    them and the settings of the algorithm
+    """
+    package = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    integration_test = os.path.join(package, 'tests', 'integration_test')
+    paths = [os.path.join(package, 'algorithms'), os.path.join(package, 'supporting_components'),
+             os.path.join(integration_test, 'algorithm_options.py'),
+             os.path.join(integration_test, 'isomorphism_problem.py')]
+    return code_version(paths, (simple_cases, twin_removal, pendant_tree_removal, tree_algorithm, complement,
+                                component_decomposition, modular_decomposition, color_refinement_algorithm,
+                                branching_algorithm, canonical_labeling_nodes))
 
 
 def apply_complement(G: "Graph"):
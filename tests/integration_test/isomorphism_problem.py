@@ -1,7 +1,17 @@
 from algorithms.preprocessing import fix_degrees
-from tests.integration_test.algorithm_options import apply_could_be_isomorphic, apply_remove_twins, apply_tree_algorithm, branching_method, apply_complement
+from tests.integration_test.algorithm_options import apply_could_be_isomorphic, apply_remove_twins, apply_tree_algorithm, branching_method, apply_complement, \
+    apply_tree_certificate, result_store_method, apply_component_decomposition, apply_modular_decomposition, \
+    color_refinement_method, apply_remove_pendant_trees
+from tests.integration_test.settings import canonical_labeling_nodes
 from algorithms.color_initialization import degree_color_initialization
+from algorithms.simple_cases import isomorphism_invariant
+from algorithms.canonical_labeling import certificate
+from algorithms.modular_decomposition import module_certificate, module_automorphisms
 from supporting_components.graph import Graph
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.result_store import fingerprint, certificate_hash
+from collections import Counter
+from math import factorial
 
 
 def preprocessing(G: "Graph"):
@@ -22,21 +32,80 @@ def preprocessing(G: "Graph"):
     if complement_applied:
         fix_degrees(G_preprocessed)
         apply_remove_twins(G_preprocessed)
+        apply_remove_pendant_trees(G_preprocessed)
         preprocessed_data['complement'] = G_preprocessed
     else:
         preprocessed_data['complement'] = None
 
     # Twin removal
     factor = apply_remove_twins(G)
+
+    # Removal of the trees that hang from the graph, of which the twin leaves are removed already
+    factor *= apply_remove_pendant_trees(G)
     preprocessed_data['factor'] = factor
 
     return preprocessed_data
 
 
-def are_isomorph(G: "Graph", H: "Graph"):
+def graph_invariant(G: "Graph"):
+    """
+    This method computes an invariant of a preprocessed graph. Graphs with different invariants are not isomorphic, so
+    only graphs with the same invariant need to be compared with are_isomorph.
+    :param G: The preprocessed graph
+    :return: The invariant of the graph, which can be used as key of a dictionary
+    """
+    return isomorphism_invariant(G)
+
+
+def graph_certificate(G: "Graph", statistics: "SearchStatistics" = None, max_nodes: int = None):
+    """
+    This method computes the certificate of a preprocessed graph with canonical labeling. Two preprocessed graphs are
+    isomorphic if and only if their certificates are equal, so the graphs can be classified without comparing them.
+    If the results are stored, the stored certificate is used if there is one.
+    :param G: The preprocessed graph
+    :param statistics: Optional, the collector of the statistics of the search
+    :param max_nodes: Optional, the maximal amount of nodes of the search tree
+    :return: The hash of the certificate of the graph, which can be used as key of a dictionary, or None if the search
+    tree has more than max_nodes nodes
+    """
+    # If graph is a tree, use the tree algorithm to determine the certificate
+    problem_solved, tree_certificate = apply_tree_certificate(G)
+    if problem_solved:
+        return certificate_hash(tree_certificate)
+
+    # If graph is disconnected, the certificate consists of the certificates of its components
+    decomposed, components = apply_component_decomposition(G)
+    if decomposed:
+        component_certificates = [graph_certificate(C, statistics, max_nodes) for C in components]
+        if None in component_certificates:
+            return None
+        return certificate_hash(('components', tuple(sorted(component_certificates))))
+
+    # If graph has modules, the certificate consists of the certificates of the quotient graphs of the modules
+    decomposed, tree = apply_modular_decomposition(G)
+    if decomposed:
+        return module_certificate(G, tree, statistics, max_nodes)
+
+    G_compact = CompactGraph.from_graph(G)
+    store = result_store_method()
+    if store is not None:
+        key = fingerprint(G_compact)
+        stored, graph_certificate_hash = store.certificate(key, max_nodes)
+        if stored:
+            return graph_certificate_hash
+
+    graph_certificate_actual = certificate(G_compact, statistics, max_nodes)
+    graph_certificate_hash = certificate_hash(graph_certificate_actual) if graph_certificate_actual is not None else None
+    if store is not None:
+        store.add_certificate(key, graph_certificate_hash, max_nodes)
+    return graph_certificate_hash
+
+
+def are_isomorph(G: "Graph", H: "Graph", statistics: "SearchStatistics" = None):
     """
     This method determines if graph G and graph H have at least one isomorphism.
     :param G, H: The two graphs of which it must be determined if there is an isomorphism.
+    :param statistics: Optional, the collector of the statistics of the branching
     :return: Boolean that indicates if graph G and H are isomorph or not.
     """
     # Test if graphs are isomorphic using simple properties of the graphs
@@ -48,17 +117,55 @@ def are_isomorph(G: "Graph", H: "Graph"):
     if problem_solved:
         return is_isomorph
 
+    # If a graph is disconnected, the graphs are isomorphic if they have the same amount of components of every class
+    # of isomorphic components
+    G_decomposed, G_components = apply_component_decomposition(G)
+    H_decomposed, H_components = apply_component_decomposition(H)
+    if G_decomposed or H_decomposed:
+        G_components = G_components if G_decomposed else [G]
+        H_components = H_components if H_decomposed else [H]
+        if len(G_components) != len(H_components):
+            return False
+        classes = __component_classes(G_components + H_components, statistics)
+        return Counter(classes[:len(G_components)]) == Counter(classes[len(G_components):])
+
+    # If a graph has modules, the graphs are isomorphic if their modular decomposition trees have the same certificate.
+    # Whether a graph has modules does not depend on the numbering of its vertices.
+    G_decomposed, G_tree = apply_modular_decomposition(G)
+    H_decomposed, H_tree = apply_modular_decomposition(H)
+    if G_decomposed != H_decomposed:
+        return False
+    if G_decomposed:
+        G_certificate = module_certificate(G, G_tree, statistics, canonical_labeling_nodes)
+        H_certificate = module_certificate(H, H_tree, statistics, canonical_labeling_nodes)
+        if G_certificate is not None and H_certificate is not None:
+            return G_certificate == H_certificate
+
+    # If the result of an earlier run is stored, it is used
+    G_compact, H_compact = CompactGraph.from_graph(G), CompactGraph.from_graph(H)
+    store = result_store_method()
+    if store is not None:
+        keys = fingerprint(G_compact), fingerprint(H_compact)
+        is_isomorph = store.isomorphic(*keys)
+        if is_isomorph is not None:
+            return is_isomorph
+
     # If GI problem is not solved, make a disjoint union of the graphs, color it and do branching
-    G_disjoint_union = G + H
+    # The union is made of the compact graphs, so that the graphs are not copied as a whole
+    G_disjoint_union = G_compact + H_compact
     degree_color_initialization(G_disjoint_union)
 
-    return branching_method(G_disjoint_union, False)
+    is_isomorph = branching_method(G_disjoint_union, False, statistics)
+    if store is not None:
+        store.add_isomorphic(*keys, is_isomorph)
+    return is_isomorph
 
 
-def amount_of_automorphisms(G: "Graph"):
+def amount_of_automorphisms(G: "Graph", statistics: "SearchStatistics" = None):
     """
     This method calculates the amount of isomorphisms there are between graph G and H.
     :param G, H: The two graphs of which the amount of isomorphisms must be determined.
+    :param statistics: Optional, the collector of the statistics of the branching
     :return: Amount of isomorphisms graph G and H have.
     """
     # If graph is a tree, use this algorithm to solve the GI problem
@@ -66,8 +173,69 @@ def amount_of_automorphisms(G: "Graph"):
     if problem_solved:
         return isomorph_count
 
+    # If graph is disconnected, the automorphisms permute the components of every class of k isomorphic components in
+    # k! ways, and map every component to its image in |Aut(C)| ways
+    decomposed, components = apply_component_decomposition(G)
+    if decomposed:
+        isomorph_count = 1
+        for representative, k in Counter(__component_classes(components, statistics)).items():
+            isomorph_count *= amount_of_automorphisms(components[representative], statistics) ** k * factorial(k)
+        return isomorph_count
+
+    # If graph has modules, the automorphisms are counted on the quotient graphs of the modules, which is done without
+    # branching if there are no prime modules
+    decomposed, tree = apply_modular_decomposition(G)
+    if decomposed:
+        return module_automorphisms(G, tree, color_refinement_method(), statistics)
+
+    # If the amount of automorphisms of this graph, or of a graph with the same certificate, is stored, it is used
+    G_compact = CompactGraph.from_graph(G)
+    store = result_store_method()
+    if store is not None:
+        key = fingerprint(G_compact)
+        stored = store.automorphisms(key)
+        if stored is not None:
+            return stored[0]
+
     # If GI problem is not solved, make a disjoint union of itself, color it and do branching
-    G_disjoint_union = G.self_disjoint_union()
+    G_disjoint_union = G_compact.self_disjoint_union()
     degree_color_initialization(G_disjoint_union)
 
-    return branching_method(G_disjoint_union, True)
\ No newline at end of file
+    generators = []
+    isomorph_count = branching_method(G_disjoint_union, True, statistics, generators)
+    if store is not None:
+        # Without generators, the group is only trivial if it has one element, otherwise they are not known
+        store.add_automorphisms(key, isomorph_count, generators if generators or isomorph_count == 1 else None)
+    return isomorph_count
+
+
+def __component_classes(components: "List[Graph]", statistics: "SearchStatistics" = None):
+    """
+    Classifies connected graphs by isomorphism. Graphs with the same certificate are isomorphic, graphs of which the
+    certificate could not be determined within canonical_labeling_nodes nodes are compared with the representatives of
+    the classes.
+    :param components: The connected (preprocessed) graphs
+    :param statistics: Optional, the collector of the statistics of the search
+    :return: For every graph the index of the first graph of its class
+    """
+    certificates = [graph_certificate(C, statistics, canonical_labeling_nodes) for C in components]
+    classes = []
+    representatives = []
+    # The representative of every certificate
+    certificate_representatives = {}
+    for i, C in enumerate(components):
+        if certificates[i] in certificate_representatives:
+            classes.append(certificate_representatives[certificates[i]])
+            continue
+
+        # Graphs are only compared if one of them has no certificate, otherwise their certificates are different
+        for j in representatives:
+            if (certificates[i] is None or certificates[j] is None) and are_isomorph(C, components[j], statistics):
+                classes.append(j)
+                break
+        else:
+            classes.append(i)
+            representatives.append(i)
+        if certificates[i] is not None:
+            certificate_representatives[certificates[i]] = classes[i]
+    return classes
@@ -0,0 +1,216 @@
+from tests.integration_test.settings import workers, search_statistics, canonical_labeling, canonical_labeling_nodes
+from tests.integration_test.isomorphism_problem import graph_invariant, graph_certificate, are_isomorph, \
+    amount_of_automorphisms
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.union_find import UnionFind
+from supporting_components.search_statistics import SearchStatistics
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from time import time
+import sys
+
+"""
+Evaluation of the graphs of one file, either in this process or in a pool of worker processes.
+The graphs are shipped to every worker process once, as compact graphs, when the pool is created. After that, a task
+only consists of the indices of the graphs it is about. The tasks are the same in both cases and the results are
+merged in the order in which the tasks were created, so the outcome does not depend on the amount of workers.
+"""
+
+# The preprocessed graphs and their complements (None if the complement is not used) of the file that is evaluated
+__graphs = []
+__complements = []
+
+
+def create_executor(graphs, complements):
+    """
+    Stores the graphs in this process and creates the pool of worker processes, if more than one worker is used,
+    which gives the graphs to every worker.
+    :param graphs: The preprocessed graphs
+    :param complements: For every graph the preprocessed complement, or None if the complement is not used
+    :return: The executor that the tasks should be run on, or None if they are run in this process
+    """
+    __init_worker(graphs, complements)
+    n_workers = workers if workers > 0 else cpu_count()
+    if n_workers == 1:
+        return None
+
+    compact_graphs = [CompactGraph.from_graph(G) for G in graphs]
+    compact_complements = [CompactGraph.from_graph(G) if G is not None else None for G in complements]
+    return ProcessPoolExecutor(n_workers, initializer=__init_worker, initargs=(compact_graphs, compact_complements))
+
+
+def isomorphism_classes(filename, executor, report=None):
+    """
+    Determines the classes of isomorphic graphs. If canonical_labeling is set to True, every graph gets a certificate
+    first, and graphs with the same certificate are in the same class. The other graphs are put in buckets by a cheap
+    invariant, since graphs in different buckets are not isomorphic. Within a bucket, the first graph that is not
+    classified yet is the representative of a new class, and all other graphs that are not classified yet are compared
+    with it, unless both have a certificate. This is done in rounds, in which the comparisons of all buckets are done
+    at the same time.
+    :param filename: The name of the file the graphs are from, for the progress on the console
+    :param executor: The executor from `create_executor`
+    :param report: Optional, the dictionary the statistics of the search of every compared pair and every certificate
+    are added to, if search_statistics is set to True
+    :return: The classes of isomorphic graphs as `UnionFind`
+    """
+    invariants = list(__map(executor, __graph_invariant, range(len(__graphs))))
+    certificates = __certificates(filename, executor, report) if canonical_labeling else [None] * len(__graphs)
+
+    classes = UnionFind(len(__graphs))
+    # The first graph with every certificate, which represents the other graphs with that certificate in its bucket
+    representatives = {}
+    buckets = {}
+    for i, (invariant, graph_certificate_actual) in enumerate(zip(invariants, certificates)):
+        if graph_certificate_actual is not None:
+            representative = representatives.setdefault(graph_certificate_actual, i)
+            if representative != i:
+                classes.union(representative, i)
+                continue
+        buckets.setdefault(invariant, []).append(i)
+    buckets = __unresolved(buckets.values(), certificates)
+
+    while buckets:
+        # Compare the representative of every bucket with the other graphs in the bucket, graphs with different
+        # certificates are not isomorphic
+        pairs = [(bucket[0], j) for bucket in buckets for j in bucket[1:]
+                 if certificates[bucket[0]] is None or certificates[j] is None]
+        results = __map(executor, __are_isomorph, pairs)
+        for (i, j), (are_isomorph_actual, statistics) in zip(pairs, results):
+            if report is not None and statistics is not None:
+                report.setdefault('pairs', {})[str(i) + ',' + str(j)] = statistics
+            s = filename + ": Determining if [" + str(i) + "," + str(j) + "] are isomorphic (out of " + str(len(__graphs) - 1) + " graphs)"
+            sys.stdout.write('\r' + s)
+            if are_isomorph_actual:
+                classes.union(i, j)
+
+        # The graphs that are not isomorphic to the representative are left in the bucket
+        buckets = [[j for j in bucket[1:] if classes.find(j) != classes.find(bucket[0])] for bucket in buckets]
+        buckets = __unresolved(buckets, certificates)
+
+    return classes
+
+
+def __certificates(filename, executor, report):
+    """
+    :return: For every graph its certificate, or None if the search for it was stopped
+    """
+    certificates = []
+    for i, (graph_certificate_actual, statistics) in enumerate(__map(executor, __certificate, range(len(__graphs)))):
+        if report is not None and statistics is not None:
+            report.setdefault('certificates', {})[str(i)] = statistics
+        s = filename + ": Computing the certificate of graph " + str(i) + " (out of " + str(len(__graphs) - 1) + " graphs)"
+        sys.stdout.write('\r' + s)
+        certificates.append(graph_certificate_actual)
+    return certificates
+
+
+def __unresolved(buckets, certificates):
+    """
+    :return: The buckets with more than one graph, of which at least one graph has no certificate
+    """
+    return [bucket for bucket in buckets if len(bucket) > 1 and any(certificates[i] is None for i in bucket)]
+
+
+def amounts_of_automorphisms(filename, groups, multiplication_factor, executor, report=None):
+    """
+    Calculates the amount of automorphisms of the first graph of every group of isomorphic graphs. This can be done
+    because the graphs are isomorphic and the amount of isomorphisms are equal to the amount of automorphisms of the
+    independent graphs.
+    :param filename: The name of the file the graphs are from, for the progress on the console
+    :param groups: The groups of isomorphic graphs
+    :param multiplication_factor: For every graph the factor the amount of automorphisms need to be multiplied with
+    :param executor: The executor from `create_executor`
+    :param report: Optional, the dictionary the statistics of the search of every group are added to, if
+    search_statistics is set to True
+    :return: Dictionary that saves for each graph the amount of automorphisms
+    """
+    automorphisms = {}
+    results = __map(executor, __amount_of_automorphisms, [group[0] for group in groups])
+    for group_count, (group, (amount_automorphisms, statistics)) in enumerate(zip(groups, results), 1):
+        if report is not None and statistics is not None:
+            report.setdefault('automorphisms', {})[str(group[0])] = statistics
+        s = filename + ": Calculating amount of isomorphisms of isomorphic group " + str(group) + " (" + str(group_count) + " out of " + str(len(groups)) + " groups)"
+        sys.stdout.write('\r' + s)
+        # Each graph in the group has the same amount of automorphisms
+        for graph in group:
+            automorphisms[graph] = multiplication_factor[group[0]] * amount_automorphisms
+    return automorphisms
+
+
+def __map(executor, task, arguments):
+    """
+    :return: The results of the task for every argument in order, computed by the executor or in this process
+    """
+    if executor is None:
+        return map(task, arguments)
+    return executor.map(task, arguments)
+
+
+def __init_worker(graphs, complements):
+    """
+    Stores the graphs of the file in the (worker) process, compact graphs are converted back to graphs.
+    """
+    global __graphs, __complements
+    __graphs = [G.to_graph() if isinstance(G, CompactGraph) else G for G in graphs]
+    __complements = [G.to_graph() if isinstance(G, CompactGraph) else G for G in complements]
+
+
+def __graph_invariant(i):
+    """
+    :return: The invariant of graph i
+    """
+    return graph_invariant(__graphs[i])
+
+
+def __certificate(i):
+    """
+    :return: The certificate of graph i, of its complement if it has one (whether the complement is used only depends
+    on the graph, so isomorphic graphs both use it or both do not), or None if the search tree has more than
+    canonical_labeling_nodes nodes. And the statistics of the search as dictionary, or
+    None if search_statistics is set to False.
+    """
+    statistics = SearchStatistics() if search_statistics else None
+    start = time()
+    if __complements[i] is not None:
+        result = graph_certificate(__complements[i], statistics, canonical_labeling_nodes)
+        result = ('complement', result) if result is not None else None
+    else:
+        result = graph_certificate(__graphs[i], statistics, canonical_labeling_nodes)
+        result = ('graph', result) if result is not None else None
+    return result, __statistics_dict(statistics, start)
+
+
+def __are_isomorph(pair):
+    """
+    :return: Whether the graphs of the pair are isomorphic, the complements are compared if both graphs have one. And
+    the statistics of the search as dictionary, or None if search_statistics is set to False.
+    """
+    i, j = pair
+    statistics = SearchStatistics() if search_statistics else None
+    start = time()
+    if __complements[i] is not None and __complements[j] is not None:
+        result = are_isomorph(__complements[i], __complements[j], statistics)
+    else:
+        result = are_isomorph(__graphs[i], __graphs[j], statistics)
+    return result, __statistics_dict(statistics, start)
+
+
+def __amount_of_automorphisms(i):
+    """
+    :return: The amount of automorphisms of graph i, without the factor of twin removal. And the statistics of the
+    search as dictionary, or None if search_statistics is set to False.
+    """
+    statistics = SearchStatistics() if search_statistics else None
+    start = time()
+    result = amount_of_automorphisms(__graphs[i], statistics)
+    return result, __statistics_dict(statistics, start)
+
+
+def __statistics_dict(statistics, start):
+    """
+    :return: The statistics as dictionary with the total time since start added to it, or None if there are none
+    """
+    if statistics is None:
+        return None
+    statistics.add_time('total', time() - start)
+    return statistics.to_dict()
@@ -6,6 +6,9 @@ Choose which outputs you want to produce
 console_pass = True
 # When set to true, test results are written to a csv file
 write_to_csv = True
+# When set to true, statistics of the search (nodes per depth, refinement work, time per stage) of every pair of graphs
+# and every automorphism count are written to a json file
+search_statistics = False
 
 """
 RUN MODE
@@ -27,15 +30,51 @@ SETTINGS OF ALGORITHM
 # Choose which preprocessing steps you want to have by turning them to True
 simple_cases = True
 twin_removal = True
+# Trees that hang from the graph are removed and become part of the color of the vertex they hang from
+pendant_tree_removal = True
 tree_algorithm = True
 complement = True
+# Disconnected graphs are split into their connected components, which are solved once per class of isomorphic
+# components
+component_decomposition = True
+# Graphs with modules (sets of vertices with the same neighbours outside the set, larger than twins) are solved with the
+# modular decomposition tree, so cographs are solved without branching
+modular_decomposition = True
 
 # Choose a color refinement algorithm
 # 1 - normal color refinement
 # 2 - fast color refinement
+# 3 - signature color refinement (computes the signatures of all vertices in bulk each round, for dense graphs)
 color_refinement_algorithm = 2
 
 # Choose a branching algorithm
 # 1 - normal branching
 # 2 - fast branching
-branching_algorithm = 2
\ No newline at end of file
+branching_algorithm = 2
+
+# Choose how the classes of isomorphic graphs are determined
+# True - every graph gets a certificate by canonical labeling, graphs with the same certificate are isomorphic
+# False - graphs with the same invariant are compared pairwise with their representative
+canonical_labeling = True
+# Choose the maximal amount of nodes of the search tree of a certificate, graphs of which the search tree is larger
+# get no certificate and are compared pairwise
+canonical_labeling_nodes = 500
+
+# When set to true, certificates, amounts of automorphisms and results of comparisons are stored in a database, so
+# that graphs that are evaluated again (by fingerprint, or by certificate for amounts of automorphisms) are not
+# searched again. Results are only used by the same version of the algorithms and settings, and never in test mode
+# (run_mode = 1), in which every result is computed again to check it. Remove the database to free the space.
+result_store = False
+result_store_path = '/output_files/store/results.sqlite'
+
+# Choose the amount of worker processes that search the subtrees of the first branching levels of one pair of graphs
+# This is only done if the graphs of a file are evaluated in this process (workers = 1)
+# 1 - the subtrees are searched in sequence, with the automorphisms of earlier subtrees used to skip subtrees
+branching_workers = 1
+# Choose the amount of branching levels (1 or 2) that are split into subtrees
+branching_depth = 1
+# Choose the amount of worker processes that evaluate the graphs of a file
+# 1 - all evaluation is done in the process of the integration test itself, so prints and tracebacks of the
+#     algorithms are shown as usual and branching_workers can be used
+# 0 - as many workers as the machine has cores, for tournament runs on large files
+workers = 1
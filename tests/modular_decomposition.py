@@ -0,0 +1,148 @@
+from input_output.sys_output import fail, passed
+from algorithms.modular_decomposition import modular_decomposition, is_decomposable, module_certificate, \
+    module_automorphisms
+from algorithms.color_refinement import fast_color_refinement
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.search_statistics import SearchStatistics
+from supporting_components.graph_generators import relabel, random_cograph, cycle
+from tests.integration_test.isomorphism_problem import preprocessing, are_isomorph, amount_of_automorphisms
+
+"""
+This test tests the modular decomposition tree, and the isomorphism and automorphism problems of graphs with modules.
+"""
+
+
+def substituted_path(first, second):
+    """
+    :return: The path a - B - C - d of which the middle vertices are replaced by the modules B and C, which are given as
+    (n, edges)
+    """
+    n = 2 + first[0] + second[0]
+    B = range(1, 1 + first[0])
+    C = range(1 + first[0], n - 1)
+    edges = [(0, b) for b in B] + [(b, c) for b in B for c in C] + [(c, n - 1) for c in C]
+    edges += [(1 + u, 1 + v) for u, v in first[1]] + [(B.stop + u, B.stop + v) for u, v in second[1]]
+    return n, edges, None
+
+
+def deep_cograph(steps):
+    """
+    :return: The cograph with a modular decomposition tree of depth steps + 1, given as (n, edges, automorphisms):
+    starting with two isolated vertices, every step adds a pair of twins, which is adjacent to all vertices in odd steps
+    and to none in even steps. Every module has a pair and the module of the steps before as children, so the graph has
+    2 ** (steps + 1) automorphisms.
+    """
+    n = 2 * steps + 2
+    edges = []
+    for step in range(1, steps + 1):
+        if step % 2:
+            pair = (2 * step, 2 * step + 1)
+            edges += [(u, w) for w in pair for u in range(w)]
+    return n, edges, 2 ** (steps + 1)
+
+
+INDEPENDENT = (3, [])
+TRIANGLE = (3, [(0, 1), (0, 2), (1, 2)])
+
+
+def compact(graph):
+    return CompactGraph(graph[0], graph[1])
+
+
+def test_decomposition():
+    tree = modular_decomposition(compact(substituted_path(INDEPENDENT, TRIANGLE)))
+    return tree.kind == 'prime' and [(child.kind, sorted(child.vertices)) for child in tree.children] == \
+        [('vertex', [0]), ('parallel', [1, 2, 3]), ('series', [4, 5, 6]), ('vertex', [7])] and \
+        not is_decomposable(modular_decomposition(compact(cycle(7))))
+
+
+def test_automorphisms():
+    # The modules of a prime graph are permuted by the automorphisms of the quotient graph: 3! * 3! * 2
+    if module_automorphisms(compact(substituted_path(INDEPENDENT, INDEPENDENT)), modular_decomposition(
+            compact(substituted_path(INDEPENDENT, INDEPENDENT))), fast_color_refinement) != 72:
+        return False
+
+    # Cographs are solved without any branching
+    statistics = SearchStatistics()
+    for seed in range(5):
+        n, edges, n_automorphisms = random_cograph(25, seed)
+        G = compact((n, edges))
+        if module_automorphisms(G, modular_decomposition(G), fast_color_refinement, statistics) != n_automorphisms:
+            return False
+
+        G = CompactGraph(n, edges).to_graph()
+        if preprocessing(G)['factor'] * amount_of_automorphisms(G) != n_automorphisms:
+            return False
+    return not statistics.nodes
+
+
+def test_deep_cograph():
+    steps = 100
+    graph = deep_cograph(steps)
+    G = compact(graph)
+    tree = modular_decomposition(G)
+    depth = 0
+    module = tree
+    while module.kind != 'vertex':
+        depth += 1
+        module = max(module.children, key=lambda child: len(child.vertices))
+    if depth != steps + 1:
+        return False
+
+    statistics = SearchStatistics()
+    if module_automorphisms(G, tree, fast_color_refinement, statistics) != graph[2] or statistics.nodes:
+        return False
+    relabeled = compact(relabel(graph, 0))
+    return module_certificate(relabeled, modular_decomposition(relabeled)) == module_certificate(G, tree)
+
+
+def test_isomorphism():
+    graph = substituted_path(INDEPENDENT, TRIANGLE)
+    certificate = module_certificate(compact(graph), modular_decomposition(compact(graph)))
+    other = substituted_path(TRIANGLE, INDEPENDENT)
+    if module_certificate(compact(other), modular_decomposition(compact(other))) != certificate:
+        return False
+    for seed in range(3):
+        relabeled = compact(relabel(graph, seed))
+        if module_certificate(relabeled, modular_decomposition(relabeled)) != certificate:
+            return False
+
+    G = CompactGraph(*random_cograph(30, 1)[:2]).to_graph()
+    H = CompactGraph(*relabel(random_cograph(30, 1), 2)[:2]).to_graph()
+    K = CompactGraph(*random_cograph(30, 2)[:2]).to_graph()
+    for X in (G, H, K):
+        preprocessing(X)
+    return are_isomorph(G, H) and not are_isomorph(G, K)
+
+
+def unit_test():
+    test_name = 'modular_decomposition'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_decomposition():
+        fail("test_decomposition: TEST FAILED")
+        pass_bool = False
+
+    if not test_automorphisms():
+        fail("test_automorphisms: TEST FAILED")
+        pass_bool = False
+
+    if not test_deep_cograph():
+        fail("test_deep_cograph: TEST FAILED")
+        pass_bool = False
+
+    if not test_isomorphism():
+        fail("test_isomorphism: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
@@ -1,5 +1,6 @@
 from input_output.sys_output import fail, passed
 from supporting_components.permv2 import permutation
+from supporting_components.schreier_sims import StabilizerChain
 from algorithms.automorphism_problem import order_computation
 
 """
@@ -28,6 +29,39 @@ def test_example_redundant_permutation():
     return order == 48
 
 
+def test_symmetric_group():
+    # The symmetric group on 8 elements is generated by a transposition and a cycle of length 8
+    p = permutation(8, cycles=[[0, 1]])
+    q = permutation(8, cycles=[[0, 1, 2, 3, 4, 5, 6, 7]])
+    order = order_computation([p, q])
+
+    return order == 40320
+
+
+def test_stabilizer_chain():
+    chain = StabilizerChain(6)
+    p = permutation(6, cycles=[[0, 1, 2], [4, 5]])
+    q = permutation(6, cycles=[[2, 3]])
+    added = chain.add_generator(p) and chain.add_generator(q)
+    # Elements of the group are not added again
+    redundant = chain.add_generator(permutation(6, cycles=[[0, 1]]))
+
+    return added and not redundant and chain.order() == 48 \
+        and chain.contains(p * q * p) and not chain.contains(permutation(6, cycles=[[3, 4]]))
+
+
+def test_given_base():
+    # With base 3, 0 the basic orbits are the orbit of 3 and the orbit of 0 under the stabilizer of 3
+    chain = StabilizerChain(6)
+    levels = [chain.extend_base(3), chain.extend_base(0), chain.extend_base(3)]
+    chain.add_generator(permutation(6, cycles=[[0, 1, 2], [4, 5]]))
+    chain.add_generator(permutation(6, cycles=[[2, 3]]))
+
+    return levels == [0, 1, 0] and chain.base[:2] == [3, 0] and chain.order() == 48 \
+        and all(chain.in_basic_orbit(0, x) for x in range(4)) and not chain.in_basic_orbit(0, 4) \
+        and all(chain.in_basic_orbit(1, x) for x in range(3)) and not chain.in_basic_orbit(1, 3)
+
+
 def unit_test():
     test_name = 'order_computation'
     print('<' + test_name + '>')
@@ -40,6 +74,18 @@ def unit_test():
         fail("test_example_redundant_permutation: TEST FAILED")
         pass_bool = False
 
+    if not test_symmetric_group():
+        fail("test_symmetric_group: TEST FAILED")
+        pass_bool = False
+
+    if not test_stabilizer_chain():
+        fail("test_stabilizer_chain: TEST FAILED")
+        pass_bool = False
+
+    if not test_given_base():
+        fail("test_given_base: TEST FAILED")
+        pass_bool = False
+
     if pass_bool:
         passed('' + test_name + ' PASS')
 
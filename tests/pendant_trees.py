@@ -0,0 +1,84 @@
+from input_output.sys_output import fail, passed
+from algorithms.preprocessing import remove_pendant_trees
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.graph_generators import relabel, random_tree
+from tests.integration_test.isomorphism_problem import preprocessing, are_isomorph, amount_of_automorphisms
+
+"""
+This test tests the removal of the trees that hang from a graph, and the isomorphism and automorphism problems of the
+graphs that remain.
+"""
+
+
+def decorated_cycle(star_at: int):
+    """
+    :param star_at: The vertex of the cycle from which the star hangs
+    :return: The cycle 0...4 with two paths of length 2 hanging from vertex 0 and a star with 3 leaves hanging from
+    vertex star_at, with 2 * 3! automorphisms if star_at is 1
+    """
+    edges = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (0, 5), (5, 6), (0, 7), (7, 8),
+             (star_at, 9), (9, 10), (9, 11), (9, 12)]
+    return 13, edges, 12
+
+
+def graph(generated):
+    return CompactGraph(generated[0], generated[1]).to_graph()
+
+
+def test_remove_pendant_trees():
+    G = graph(decorated_cycle(1))
+    factor = remove_pendant_trees(G)
+
+    # Only the cycle remains, of which vertices 0 and 1 have trees
+    pendant_trees = [v.pendant_trees for v in G.vertices]
+    return factor == 12 and len(G.vertices) == 5 and len(G.edges) == 5 \
+        and len(pendant_trees[0]) == 2 and pendant_trees[0][0] == pendant_trees[0][1] \
+        and len(pendant_trees[1]) == 1 and pendant_trees[1][0] not in pendant_trees[0] \
+        and not any(pendant_trees[2:])
+
+
+def test_automorphisms():
+    generated = [decorated_cycle(1)] + [random_tree(20, seed) for seed in range(5)]
+    for n, edges, n_automorphisms in generated:
+        G = graph((n, edges))
+        if preprocessing(G)['factor'] * amount_of_automorphisms(G) != n_automorphisms:
+            return False
+    return True
+
+
+def test_isomorphism():
+    G = graph(decorated_cycle(1))
+    H = graph(relabel(decorated_cycle(1), 3))
+    K = graph(decorated_cycle(2))
+    for X in (G, H, K):
+        preprocessing(X)
+    return are_isomorph(G, H) and not are_isomorph(G, K)
+
+
+def unit_test():
+    test_name = 'pendant_trees'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_remove_pendant_trees():
+        fail("test_remove_pendant_trees: TEST FAILED")
+        pass_bool = False
+
+    if not test_automorphisms():
+        fail("test_automorphisms: TEST FAILED")
+        pass_bool = False
+
+    if not test_isomorphism():
+        fail("test_isomorphism: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
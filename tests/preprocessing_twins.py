@@ -1,6 +1,9 @@
 from supporting_components.graph import Graph, Vertex, Edge
 from input_output.sys_output import fail, passed
-from algorithms.preprocessing import remove_twins
+from algorithms.preprocessing import fix_degrees, remove_twins
+from algorithms.color_initialization import degree_color_initialization
+from supporting_components.compact_graph import CompactGraph
+from tests.integration_test.isomorphism_problem import preprocessing, amount_of_automorphisms
 
 
 """
@@ -107,6 +110,35 @@ def test_remove_connected_twins():
            and factor == 12
 
 
+def substituted_graph():
+    """
+    :return: The graph with the edges 0-1, 0-2, 1-3, 2-3, 2-4 and 3-4, of which the vertices are replaced by classes of
+    2, 3, 2, 3 and 2 independent twins. Classes 0, 1 and 4 have degree 5, classes 2 and 3 have degree 7.
+    """
+    members = [[0, 1], [2, 3, 4], [5, 6], [7, 8, 9], [10, 11]]
+    edges = [(a, b) for u, v in [(0, 1), (0, 2), (1, 3), (2, 3), (2, 4), (3, 4)] for a in members[u] for b in members[v]]
+    return CompactGraph(12, edges).to_graph()
+
+
+def test_twins_of_other_multiplicity():
+    G = substituted_graph()
+    fix_degrees(G)
+    remove_twins(G)
+    degree_color_initialization(G)
+
+    # Vertices with the same degree but another amount of twins can not be mapped to each other, so they get another
+    # color
+    colors = {}
+    for v in G.vertices:
+        colors.setdefault(v.colornum, set()).add((v.degree_fixed, v.n_twins))
+    if len(G.vertices) != 5 or any(len(keys) > 1 for keys in colors.values()):
+        return False
+
+    # The only automorphisms permute the twins: 2! * 3! * 2! * 3! * 2!
+    G = substituted_graph()
+    return preprocessing(G)['factor'] * amount_of_automorphisms(G) == 288
+
+
 def unit_test():
     # Because this test does not show any intermediate results, the arguments are ignored.
     test_name = 'preprocessing_twins'
@@ -120,6 +152,10 @@ def unit_test():
         fail("test_remove_connected_twins: TEST FAILED")
         pass_bool = False
 
+    if not test_twins_of_other_multiplicity():
+        fail("test_twins_of_other_multiplicity: TEST FAILED")
+        pass_bool = False
+
     if pass_bool:
         passed('' + test_name + ' PASS')
 
@@ -0,0 +1,100 @@
+from input_output.sys_output import fail, passed
+from supporting_components.compact_graph import CompactGraph
+from supporting_components.result_store import ResultStore, fingerprint, certificate_hash, code_version
+from algorithms.canonical_labeling import certificate
+import os
+import tempfile
+
+"""
+This test tests that the results in the store are found again after the store is opened again, also for isomorphic
+graphs by their certificates, and only by the same version of the code.
+"""
+
+
+def test_store(path):
+    G = CompactGraph(4, [(0, 1), (1, 2), (2, 3), (3, 0)])
+    H = CompactGraph(4, [(0, 2), (2, 1), (1, 3), (3, 0)])
+    P = CompactGraph(4, [(0, 1), (1, 2), (2, 3)])
+    keys = [fingerprint(G), fingerprint(H), fingerprint(P)]
+
+    store = ResultStore(path)
+    store.add_certificate(keys[0], certificate_hash(certificate(G)))
+    store.add_certificate(keys[1], certificate_hash(certificate(H)))
+    store.add_certificate(keys[2], None, 10)
+    store.add_automorphisms(keys[0], 8, [[1, 2, 3, 0], [3, 2, 1, 0]])
+    store.add_isomorphic(keys[2], keys[0], False)
+    store.close()
+
+    store = ResultStore(path)
+    result = store.automorphisms(keys[0]) == (8, [[1, 2, 3, 0], [3, 2, 1, 0]]) and \
+        store.automorphisms(keys[1]) == (8, None) and store.automorphisms(keys[2]) is None and \
+        store.isomorphic(keys[0], keys[1]) is True and store.isomorphic(keys[0], keys[2]) is False and \
+        store.certificate(keys[2], 10) == (True, None) and store.certificate(keys[2], 100) == (False, None)
+    store.close()
+    return result
+
+
+def test_version(path):
+    G = CompactGraph(4, [(0, 1), (1, 2), (2, 3), (3, 0)])
+    H = CompactGraph(4, [(0, 2), (2, 1), (1, 3), (3, 0)])
+    keys = [fingerprint(G), fingerprint(H)]
+    version = code_version([os.path.dirname(os.path.abspath(__file__))], (True, 2))
+    if version != code_version([os.path.dirname(os.path.abspath(__file__))], (True, 2)) or \
+            version == code_version([os.path.dirname(os.path.abspath(__file__))], (False, 2)):
+        return False
+
+    store = ResultStore(path, version)
+    store.add_certificate(keys[0], certificate_hash(certificate(G)))
+    store.add_certificate(keys[1], certificate_hash(certificate(H)))
+    store.add_automorphisms(keys[0], 8)
+    store.add_isomorphic(keys[0], keys[1], True)
+    store.close()
+
+    # A store of an other version does not see the results, also not through the certificates
+    store = ResultStore(path, 'other')
+    store.add_certificate(keys[1], certificate_hash(certificate(H)))
+    result = store.certificate(keys[0]) == (False, None) and store.automorphisms(keys[1]) is None and \
+        store.isomorphic(keys[0], keys[1]) is None
+    store.close()
+
+    store = ResultStore(path, version)
+    result = result and store.automorphisms(keys[1]) == (8, None) and store.isomorphic(keys[0], keys[1]) is True
+    store.close()
+    return result
+
+
+def test_fingerprint():
+    # The fingerprint does not depend on the order of the edges, but on the numbering of the vertices
+    G = CompactGraph(3, [(0, 1), (1, 2)])
+    return fingerprint(G) == fingerprint(CompactGraph(3, [(2, 1), (1, 0)])) and \
+        fingerprint(G) != fingerprint(CompactGraph(3, [(0, 1), (0, 2)]))
+
+
+def unit_test():
+    test_name = 'result_store'
+    print('<' + test_name + '>')
+    pass_bool = True
+    with tempfile.TemporaryDirectory() as directory:
+        if not test_store(os.path.join(directory, 'results.sqlite')):
+            fail("test_store: TEST FAILED")
+            pass_bool = False
+
+        if not test_version(os.path.join(directory, 'versions.sqlite')):
+            fail("test_version: TEST FAILED")
+            pass_bool = False
+
+    if not test_fingerprint():
+        fail("test_fingerprint: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()
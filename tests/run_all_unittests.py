@@ -1,6 +1,8 @@
 from input_output.sys_output import passed, fail
 from tests import branching, decide_gi, csvwriter, color_refinement, fast_color_refinement, graph, \
-    graph_del_vertex_edge, preprocessing_twins, tree_algorithm, order_computation, automorphism_problem
+    graph_del_vertex_edge, preprocessing_twins, tree_algorithm, order_computation, automorphism_problem, compact_graph, \
+    union_find, benchmark_scaling, graph_generators, graph_io, graph_cache, graph6, \
+    canonical_labeling, result_store, components, modular_decomposition, pendant_trees
 
 """
 All unit tests will be called in sequence.
@@ -44,6 +46,30 @@ result_boolean.append(order_computation.unit_test())
 print('')
 result_boolean.append(automorphism_problem.unit_test())
 print('')
+result_boolean.append(compact_graph.unit_test())
+print('')
+result_boolean.append(union_find.unit_test())
+print('')
+result_boolean.append(benchmark_scaling.unit_test())
+print('')
+result_boolean.append(graph_generators.unit_test())
+print('')
+result_boolean.append(graph_io.unit_test())
+print('')
+result_boolean.append(graph_cache.unit_test())
+print('')
+result_boolean.append(graph6.unit_test())
+print('')
+result_boolean.append(canonical_labeling.unit_test())
+print('')
+result_boolean.append(result_store.unit_test())
+print('')
+result_boolean.append(components.unit_test())
+print('')
+result_boolean.append(modular_decomposition.unit_test())
+print('')
+result_boolean.append(pendant_trees.unit_test())
+print('')
 
 # Finally
 print('')
@@ -1,7 +1,9 @@
 from input_output.file_output import load_graph_list, create_csv_file, write_csv_line
 from input_output.sys_output import fail, passed
-from algorithms.tree_algorithm import trees_are_isomorph, trees_automorphisms
-from algorithms.preprocessing import fix_degrees
+from algorithms.tree_algorithm import is_tree, trees_are_isomorph, trees_automorphisms, tree_certificate
+from algorithms.preprocessing import fix_degrees, remove_twins
+from supporting_components.graph import Graph, Edge
+from supporting_components.graph_generators import relabel
 from time import time
 
 
@@ -10,6 +12,43 @@ To test if the tree_algorithm works finding and counting isomorphisms of trees.
 """
 
 
+def graph(n, edges):
+    G = Graph(False, n)
+    for u, v in edges:
+        G.add_edge(Edge(G.vertices[u], G.vertices[v]))
+    fix_degrees(G)
+    return G
+
+
+def test_disconnected_graph_is_not_tree():
+    # A triangle and an isolated vertex have one edge less than vertices as well
+    return is_tree(graph(4, [(0, 1), (1, 2), (2, 3)])) and not is_tree(graph(4, [(0, 1), (1, 2), (2, 0)]))
+
+
+def test_bicentral_trees():
+    # The two centers of a tree can only be swapped if the halves of the tree are isomorphic
+    symmetric = graph(4, [(0, 1), (1, 2), (2, 3)])
+    asymmetric = graph(5, [(0, 1), (1, 2), (1, 3), (2, 4)])
+
+    # After twin removal, path 0 - 1 - 2 is the edge 0 - 1 with two centers, of which 0 has a twin
+    path = graph(3, [(0, 1), (1, 2)])
+    factor = remove_twins(path)
+    return trees_automorphisms(symmetric) == 2 and trees_automorphisms(asymmetric) == 2 and \
+        factor * trees_automorphisms(path) == 2
+
+
+def test_same_degrees_and_levels():
+    # Both trees have center 0, degrees 3, 3, 2, 2, 2, 1, 1, 1, 1 and 1, 2, 3 and 3 vertices per level, but in the first
+    # tree the vertex with two leaves is in the other branch of the root than the other vertex of degree 3
+    first = (9, [(0, 1), (0, 2), (1, 3), (3, 4), (3, 5), (2, 6), (2, 7), (6, 8)])
+    second = (9, [(0, 1), (0, 2), (1, 3), (1, 4), (3, 5), (3, 6), (2, 7), (7, 8)])
+    T1, T2 = graph(*first), graph(*second)
+    T3 = graph(*relabel(second + (None,), 1)[:2])
+    return not trees_are_isomorph(T1, T2) and trees_are_isomorph(T2, T3) and \
+        tree_certificate(T1) != tree_certificate(T2) and tree_certificate(T2) == tree_certificate(T3) and \
+        trees_automorphisms(T1) == 2 and trees_automorphisms(T2) == 2
+
+
 def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=True):
     test_name = 'tree_algorithm'
     if write_csv_any:
@@ -145,6 +184,14 @@ def unit_test(write_csv_any=False, write_stdout_passed=True, write_stdout_fail=T
                 error_count += error_adder
                 total_time += (end_isomorph - start_isomorph) + (end_amount_isomorphisms - start_amount_isomorphisms)
 
+    # Graphs of which the amount of edges is misleading, trees with two centers and trees that only differ in their
+    # structure
+    for test in [test_disconnected_graph_is_not_tree, test_bicentral_trees, test_same_degrees_and_levels]:
+        total_tests += 1
+        if not test():
+            fail(test.__name__ + ': TEST FAILED')
+            error_count += 1
+
     # Determine test outcome
     test_pass_bool = False
     if error_count == 0:
@@ -0,0 +1,47 @@
+from input_output.sys_output import fail, passed
+from supporting_components.union_find import UnionFind
+
+"""
+This test tests the union-find structure that keeps track of the classes of isomorphic graphs.
+"""
+
+
+def test_initial_classes():
+    classes = UnionFind(4)
+
+    return classes.classes() == [[0], [1], [2], [3]]
+
+
+def test_union():
+    classes = UnionFind(6)
+    joined = classes.union(4, 1) and classes.union(1, 3) and classes.union(0, 5)
+    # Elements that are already in the same class are not joined again
+    joined_again = classes.union(3, 4)
+
+    return joined and not joined_again and classes.find(4) == classes.find(3) and \
+        classes.find(0) != classes.find(1) and classes.classes() == [[0, 5], [1, 3, 4], [2]]
+
+
+def unit_test():
+    test_name = 'union_find'
+    print('<' + test_name + '>')
+    pass_bool = True
+    if not test_initial_classes():
+        fail("test_initial_classes: TEST FAILED")
+        pass_bool = False
+
+    if not test_union():
+        fail("test_union: TEST FAILED")
+        pass_bool = False
+
+    if pass_bool:
+        passed('' + test_name + ' PASS')
+
+    print('</' + test_name + '>')
+
+    return pass_bool
+
+
+if __name__ == '__main__':
+    # Run the unit test if file is called
+    unit_test()